@@ -0,0 +1,38 @@
+"""Benchmarks of the embedding and rotations."""
+
+import numpy as np
+
+import tadasets
+
+from .common import SIZES, skip_if_large
+
+
+class Embed:
+    params = (SIZES, [3, 10], [20, 200, 2000], ["dense", "fast"])
+    param_names = ["n", "d", "ambient", "method"]
+
+    def setup(self, n, d, ambient, method):
+        skip_if_large(n, ambient)
+        self.data = np.random.default_rng(0).standard_normal((n, d))
+
+    def time_embed(self, n, d, ambient, method):
+        tadasets.embed(self.data, ambient=ambient, seed=0, method=method)
+
+    def peakmem_embed(self, n, d, ambient, method):
+        tadasets.embed(self.data, ambient=ambient, seed=0, method=method)
+
+
+class Rotate:
+    params = (SIZES, [1, 16])
+    param_names = ["n", "angles"]
+
+    def setup(self, n, angles):
+        skip_if_large(n * angles, 2)
+        self.data = np.random.default_rng(0).standard_normal((n, 2))
+        self.angle = 0.5 if angles == 1 else np.linspace(0, np.pi, angles)
+
+    def time_rotate_2D(self, n, angles):
+        tadasets.rotate_2D(self.data, self.angle)
+
+    def peakmem_rotate_2D(self, n, angles):
+        tadasets.rotate_2D(self.data, self.angle)
@@ -0,0 +1,34 @@
+"""Benchmarks of sampling from triangle meshes."""
+
+import numpy as np
+
+from tadasets.sample import from_mesh
+
+
+def grid_mesh(k):
+    """A wavy ``k x k`` grid with ``2 * (k - 1)**2`` triangles."""
+    x, y = np.meshgrid(np.linspace(0, 1, k), np.linspace(0, 1, k))
+    z = 0.1 * np.sin(6 * x) * np.cos(6 * y)
+    vertices = np.column_stack((x.ravel(), y.ravel(), z.ravel()))
+    idx = np.arange(k * k).reshape(k, k)
+    a, b = idx[:-1, :-1].ravel(), idx[:-1, 1:].ravel()
+    c, d = idx[1:, :-1].ravel(), idx[1:, 1:].ravel()
+    triangles = np.concatenate((np.column_stack((a, b, c)), np.column_stack((b, d, c))))
+    return vertices, triangles
+
+
+class FromMesh:
+    params = ([10**3, 2 * 10**5], [10**4, 10**6])
+    param_names = ["faces", "n"]
+
+    def setup(self, faces, n):
+        self.vertices, self.triangles = grid_mesh(int(np.sqrt(faces / 2)) + 1)
+
+    def time_from_mesh(self, faces, n):
+        from_mesh(self.vertices, self.triangles, n=n, seed=0)
+
+    def peakmem_from_mesh(self, faces, n):
+        from_mesh(self.vertices, self.triangles, n=n, seed=0)
+
+    def time_from_mesh_normals(self, faces, n):
+        from_mesh(self.vertices, self.triangles, n=n, seed=0, return_normals=True)
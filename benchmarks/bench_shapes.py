@@ -0,0 +1,86 @@
+"""Benchmarks of the shape generators."""
+
+import tadasets
+
+from .common import AMBIENTS, NOISES, SIZES, skip_if_large
+
+
+class Shapes:
+    params = (
+        [
+            "dsphere",
+            "sphere",
+            "torus",
+            "swiss_roll",
+            "infty_sign",
+            "eyeglasses",
+            "bouquet",
+            "circle_chain",
+        ],
+        SIZES,
+        AMBIENTS,
+        NOISES,
+    )
+    param_names = ["shape", "n", "ambient", "noise"]
+
+    def setup(self, shape, n, ambient, noise):
+        skip_if_large(n, ambient)
+        self.f = getattr(tadasets, shape)
+
+    def time_generate(self, shape, n, ambient, noise):
+        self.f(n=n, ambient=ambient, noise=noise, seed=0)
+
+    def peakmem_generate(self, shape, n, ambient, noise):
+        self.f(n=n, ambient=ambient, noise=noise, seed=0)
+
+
+class Uniform:
+    params = (["sphere", "torus", "infty_sign"], SIZES, [False, True])
+    param_names = ["shape", "n", "uniform"]
+
+    def setup(self, shape, n, uniform):
+        self.f = getattr(tadasets, shape)
+
+    def time_generate(self, shape, n, uniform):
+        self.f(n=n, uniform=uniform, seed=0)
+
+    def peakmem_generate(self, shape, n, uniform):
+        self.f(n=n, uniform=uniform, seed=0)
+
+
+class DSphere:
+    params = ([2, 10, 50], SIZES)
+    param_names = ["d", "n"]
+
+    def setup(self, d, n):
+        skip_if_large(n, d + 1)
+
+    def time_dsphere(self, d, n):
+        tadasets.dsphere(n=n, d=d, seed=0)
+
+    def peakmem_dsphere(self, d, n):
+        tadasets.dsphere(n=n, d=d, seed=0)
+
+
+class Stream:
+    params = ([10**6], [10**4, 10**5])
+    param_names = ["n", "chunk"]
+
+    def time_stream(self, n, chunk):
+        for _ in tadasets.stream("torus", n=n, chunk=chunk, ambient=20, seed=0):
+            pass
+
+    def peakmem_stream(self, n, chunk):
+        for _ in tadasets.stream("torus", n=n, chunk=chunk, ambient=20, seed=0):
+            pass
+
+
+class Batch:
+    params = ([100, 10**4], [10, 1000])
+    param_names = ["n", "replicates"]
+
+    def time_batch(self, n, replicates):
+        tadasets.batch("dsphere", n=n, replicates=replicates, noise=0.1, seed=0)
+
+    def peakmem_batch(self, n, replicates):
+        tadasets.batch("dsphere", n=n, replicates=replicates, noise=0.1, seed=0)
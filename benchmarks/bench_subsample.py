@@ -0,0 +1,23 @@
+"""Benchmarks of landmark selection."""
+
+import tadasets
+from tadasets.subsample import cover_radius, farthest_points
+
+
+class FarthestPoints:
+    params = ([10**4, 10**6], [100, 1000])
+    param_names = ["n", "m"]
+
+    def setup(self, n, m):
+        if n * m > 10**8:
+            raise NotImplementedError("too slow")
+        self.data = tadasets.torus(n=n, noise=0.05, ambient=10, seed=0)
+
+    def time_farthest_points(self, n, m):
+        farthest_points(self.data, m)
+
+    def peakmem_farthest_points(self, n, m):
+        farthest_points(self.data, m)
+
+    def time_cover_radius(self, n, m):
+        cover_radius(self.data, self.data[:m])
@@ -0,0 +1,14 @@
+"""Parameter grids shared by the benchmarks."""
+
+SIZES = [10**3, 10**5, 10**6]
+AMBIENTS = [None, 20, 200]
+NOISES = [None, 0.1]
+
+# Skip combinations whose output alone takes more than this many elements
+MAX_ELEMENTS = 2 * 10**7
+
+
+def skip_if_large(n, width):
+    """Raise NotImplementedError, which skips the benchmark, for huge outputs."""
+    if n * (width or 3) > MAX_ELEMENTS:
+        raise NotImplementedError("output too large")
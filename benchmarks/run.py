@@ -0,0 +1,217 @@
+"""Run the benchmarks without asv, e.g. offline or on a cluster node.
+
+The benchmark classes follow the conventions of airspeed velocity, so
+``asv run`` and ``asv continuous`` work as well when asv is installed. This
+script runs the same classes in the current environment::
+
+    python benchmarks/run.py -o head.json             # run everything
+    python benchmarks/run.py -k torus --quick         # a subset, one repeat
+    python benchmarks/run.py --compare base.json head.json
+    python benchmarks/run.py --commits master HEAD    # check out, run, compare
+
+``time_*`` methods are timed with the best of ``--repeat`` runs and
+``peakmem_*`` methods report the peak memory allocated during one run, as
+traced by ``tracemalloc``.
+"""
+
+import argparse
+import importlib
+import importlib.util
+import inspect
+import itertools
+import json
+import os
+import pkgutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _benchmarks_package():
+    """Import this directory as ``benchmarks`` without adding its parent to sys.path.
+
+    The parent is a checkout of tadasets, which would shadow the tree given
+    with ``--path``.
+    """
+    spec = importlib.util.spec_from_file_location(
+        "benchmarks",
+        os.path.join(HERE, "__init__.py"),
+        submodule_search_locations=[HERE],
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules["benchmarks"] = package
+    spec.loader.exec_module(package)
+    return package
+
+
+def discover():
+    """Yield ``(name, cls)`` for the benchmark classes of every bench module.
+
+    Modules that do not import, e.g. because they benchmark functions missing
+    from an older tadasets, are reported and skipped.
+    """
+    package = _benchmarks_package()
+    for info in pkgutil.iter_modules(package.__path__):
+        if not info.name.startswith("bench_"):
+            continue
+        try:
+            module = importlib.import_module("benchmarks." + info.name)
+        except ImportError as e:
+            print("{:<90} skipped: {}".format(info.name, e))
+            continue
+        for name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module.__name__:
+                yield "{}.{}".format(info.name, name), cls
+
+
+def cases(cls):
+    """All combinations of the parameters of ``cls``."""
+    params = getattr(cls, "params", ())
+    if params and not isinstance(params[0], (list, tuple)):
+        params = (params,)
+    return list(itertools.product(*params))
+
+
+def measure(method, args, kind, repeat):
+    if kind == "peakmem":
+        tracemalloc.start()
+        try:
+            method(*args)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        method(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(pattern=None, repeat=3):
+    results = {}
+    for name, cls in discover():
+        methods = [m for m in sorted(vars(cls)) if m.startswith(("time_", "peakmem_"))]
+        for args in cases(cls):
+            for m in methods:
+                key = "{}.{}({})".format(name, m, ", ".join(map(repr, args)))
+                if pattern and pattern not in key:
+                    continue
+                bench = cls()
+                try:
+                    if hasattr(bench, "setup"):
+                        bench.setup(*args)
+                except NotImplementedError:
+                    continue
+                kind = m.split("_")[0]
+                try:
+                    value = measure(getattr(bench, m), args, kind, repeat)
+                except Exception as e:
+                    print("{:<90} failed: {!r}".format(key, e))
+                    results[key] = {"kind": kind, "value": None}
+                    continue
+                results[key] = {"kind": kind, "value": value}
+                print("{:<90} {}".format(key, format_value(kind, value)))
+    return results
+
+
+def format_value(kind, value):
+    if value is None:
+        return "failed"
+    if kind == "peakmem":
+        return "{:.1f} MB".format(value / 2**20)
+    return "{:.4g} ms".format(value * 1e3)
+
+
+def compare(base, head, factor=1.1):
+    """Print the benchmarks of both runs side by side and return the regressions."""
+    regressions = []
+    for key in sorted(set(base) | set(head)):
+        b = base.get(key, {}).get("value")
+        h = head.get(key, {}).get("value")
+        kind = (base.get(key) or head.get(key))["kind"]
+        if b is None or h is None or b == 0:
+            ratio, mark = float("nan"), " "
+        else:
+            ratio = h / b
+            mark = "+" if ratio > factor else "-" if ratio < 1 / factor else " "
+        if mark == "+":
+            regressions.append(key)
+        print(
+            "{} {:<90} {:>12} {:>12} {:>7.2f}".format(
+                mark, key, format_value(kind, b), format_value(kind, h), ratio
+            )
+        )
+    return regressions
+
+
+def run_commit(commit, args):
+    """Run the current benchmarks against the package at ``commit``."""
+    root = subprocess.check_output(
+        ["git", "rev-parse", "--show-toplevel"], cwd=HERE, text=True
+    ).strip()
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = os.path.join(tmp, "tree")
+        subprocess.check_call(
+            ["git", "worktree", "add", "--detach", "--quiet", tree, commit], cwd=root
+        )
+        try:
+            output = os.path.join(tmp, "results.json")
+            cmd = [sys.executable, __file__, "--path", tree, "-o", output]
+            cmd += ["--repeat", str(args.repeat)]
+            if args.k:
+                cmd += ["-k", args.k]
+            subprocess.check_call(cmd)
+            with open(output) as f:
+                return json.load(f)
+        finally:
+            subprocess.check_call(
+                ["git", "worktree", "remove", "--force", tree], cwd=root
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", help="only run benchmarks whose name contains this")
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("--repeat", type=int, default=3, help="timing repeats")
+    parser.add_argument("--quick", action="store_true", help="time a single run")
+    parser.add_argument("--path", help="import tadasets from this source tree")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"))
+    parser.add_argument("--commits", nargs=2, metavar=("BASE", "HEAD"))
+    parser.add_argument("--factor", type=float, default=1.1)
+    args = parser.parse_args()
+    if args.quick:
+        args.repeat = 1
+
+    if args.compare:
+        runs = []
+        for path in args.compare:
+            with open(path) as f:
+                runs.append(json.load(f))
+        return 1 if compare(*runs, factor=args.factor) else 0
+
+    if args.commits:
+        runs = [run_commit(commit, args) for commit in args.commits]
+        print()
+        return 1 if compare(*runs, factor=args.factor) else 0
+
+    if args.path:
+        sys.path.insert(0, os.path.abspath(args.path))
+    import tadasets
+
+    print("tadasets {} from {}".format(tadasets.__version__, tadasets.__file__))
+    results = run(args.k, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
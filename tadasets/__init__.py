@@ -1,7 +1,70 @@
 # flake8: noqa
-from .shapes import *
-from .view import *
-from .dimension import *
-from .sample import *
+"""
+Great data sets for Topological Data Analysis.
+
+The submodules are imported on first use, so ``import tadasets`` stays cheap
+and matplotlib is only imported when plotting.
+"""
+
+import importlib
 
 from ._version import __version__
+
+# Public names of each submodule, the same as their __all__
+_EXPORTS = {
+    "shapes": [
+        "torus",
+        "dsphere",
+        "sphere",
+        "swiss_roll",
+        "infty_sign",
+        "eyeglasses",
+        "circular_arcs",
+        "bouquet",
+        "circle_chain",
+        "stream",
+        "batch",
+        "lazy",
+        "DSphere",
+        "Sphere",
+        "Torus",
+        "SwissRoll",
+        "InftySign",
+        "Eyeglasses",
+        "CircularArcs",
+        "Bouquet",
+        "CircleChain",
+    ],
+    "view": ["plot3d", "plot2d", "downsample"],
+    "base": ["Shape", "register_shape", "get_shape", "SHAPES", "LazyDataset"],
+    "dimension": ["embed", "random_frame"],
+    "rotate": ["rotate_2D", "givens"],
+    "sample": ["from_mesh", "MeshSampler"],
+    "surface": ["sample_parameters", "sample_surface"],
+    "curves": ["ClosedCurve", "register_curve"],
+    "caching": ["cache", "DatasetCache"],
+    "geodesic": ["geodesic_distances", "geodesic_pdist", "geodesic_knn"],
+    "subsample": ["farthest_points", "cover_radius"],
+    "io": ["read_off", "read_obj", "read_ply", "read_mesh"],
+    "noise": ["Noise", "Gaussian", "StudentT", "Outliers", "AlongNormals"],
+}
+
+_SUBMODULES = set(_EXPORTS) | {"_blocks", "_qmc"}
+_ORIGIN = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_ORIGIN)
+
+
+def __getattr__(name):
+    if name in _ORIGIN:
+        value = getattr(importlib.import_module("." + _ORIGIN[name], __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module("." + name, __name__)
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | _SUBMODULES)
@@ -0,0 +1,300 @@
+"""
+Block-wise generation shared by the shape constructors.
+
+Rows are generated in blocks of ``BLOCK_SIZE``. Every block draws its
+parameters and its noise from separate random streams derived from the seed
+and the block index, so the data does not depend on how the rows are chunked
+when they are written out, nor on how many threads write them.
+
+"""
+
+import os
+
+import numpy as np
+
+from ._qmc import LowDiscrepancy, check_sampling
+from .dimension import _apply_frame, random_frame
+from .noise import add_noise, noise_models
+
+#: Number of rows drawn from one pair of random streams.
+BLOCK_SIZE = 2**14
+
+
+def root_seed(seed):
+    """Turn ``seed`` into the SeedSequence every stream of a dataset derives from."""
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        return np.random.SeedSequence(int(seed.integers(2**63)))
+    return np.random.SeedSequence(seed)
+
+
+def _child(root, *key):
+    return np.random.SeedSequence(
+        root.entropy, spawn_key=tuple(root.spawn_key) + key, pool_size=root.pool_size
+    )
+
+
+def block_rng(root, k, n=None, sampling="random"):
+    """Generator for the parameters of block ``k``.
+
+    With ``sampling="sobol"`` or ``"halton"`` it follows a low-discrepancy
+    sequence over the rows of block ``k`` of ``n``, see
+    :class:`LowDiscrepancy`. The noise comes from :func:`noise_rngs` and is
+    always random.
+    """
+    check_sampling(sampling)
+    rng = np.random.default_rng(_child(root, 1, k, 0))
+    if sampling != "random":
+        start = k * BLOCK_SIZE
+        rows = min(BLOCK_SIZE, n - start)
+        rng = LowDiscrepancy(sampling, _child(root, 2), start, rows, rng.bit_generator)
+    return rng
+
+
+def noise_rngs(root, k, count, ambient=False):
+    """Generators for ``count`` noise models of block ``k``, one per model.
+
+    Intrinsic model ``i`` draws from the stream ``(1, k, 1, i)`` of ``root``
+    and ambient ones from ``(1, k, 2, i)``, with ``i`` left out for the
+    first model.
+    """
+    space = 2 if ambient else 1
+    return [
+        np.random.default_rng(_child(root, 1, k, space, *((i,) if i else ())))
+        for i in range(count)
+    ]
+
+
+def frame_seed(root):
+    """SeedSequence for the random rotation used by ``ambient``."""
+    return _child(root, 0)
+
+
+def n_workers(workers):
+    """Number of threads for ``workers``; None means 1 and -1 means all CPUs."""
+    if workers is None:
+        return 1
+    if workers == -1:
+        return os.cpu_count() or 1
+    assert workers >= 1, "workers must be a positive integer or -1."
+    return int(workers)
+
+
+def run_tasks(tasks, workers=None):
+    """Call the functions in ``tasks``, on a pool of ``workers`` threads.
+
+    The tasks must write to disjoint outputs. NumPy releases the GIL in the
+    heavy stages, so the blocks of a dataset are generated in parallel.
+    """
+    workers = min(n_workers(workers), len(tasks))
+    if workers <= 1:
+        for task in tasks:
+            task()
+        return
+    # Imported here to keep ``import tadasets`` cheap
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Consume the results so that exceptions are raised here
+        for _ in pool.map(lambda task: task(), tasks):
+            pass
+
+
+def check_out(out, shape, dtype=np.float64):
+    """Return ``out`` after checking its shape, or a new array of ``shape``."""
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    assert out.shape == shape, "out has shape {}, but the data has shape {}.".format(
+        out.shape, shape
+    )
+    return out
+
+
+class BlockGenerator:
+    """Generate the rows of a dataset block by block.
+
+    Inputs
+    ------
+    sampler : callable
+        ``sampler(rng, start, stop)`` returns the ``(stop - start, dim)`` points
+        for rows ``start`` to ``stop`` of one block, drawing only from ``rng``.
+        If the noise needs normals, it returns the points and their normals.
+    dim : int
+        Number of columns returned by ``sampler``.
+    n : int
+        Number of rows.
+    noise : float, Noise or list of Noise, optional
+        Noise added to the points, see :func:`tadasets.noise.noise_models`.
+        The intrinsic models are applied to the block before ``post``, the
+        ambient ones to the embedded block, in the output when possible.
+    ambient : int, optional
+        Embed the points into a space with ambient dimension equal to `ambient`.
+    seed : int, np.random.Generator or np.random.SeedSequence, optional
+        Seed for random state.
+    post : callable, optional
+        Applied to the noisy points of each block before embedding.
+    workers : int, optional
+        Number of threads generating blocks in parallel, -1 for all CPUs. The
+        data does not depend on it.
+    dtype : dtype, default=np.float64
+        Floating point type of the noise, the frame and the output.
+    sampling : {"random", "sobol", "halton"}, default="random"
+        Random parameters or a scrambled low-discrepancy sequence, see
+        :func:`block_rng`.
+    """
+
+    def __init__(
+        self,
+        sampler,
+        dim,
+        n,
+        noise=None,
+        ambient=None,
+        seed=None,
+        post=None,
+        workers=None,
+        dtype=np.float64,
+        sampling="random",
+    ):
+        self.sampler = sampler
+        self.dim = dim
+        self.n = n
+        models = noise_models(noise)
+        self.noise = [m for m in models if m.space == "intrinsic"]
+        self.ambient_noise = [m for m in models if m.space == "ambient"]
+        self.needs_normals = any(m.needs_normals for m in models)
+        self.post = post
+        self.workers = workers
+        self.dtype = np.dtype(dtype)
+        self.sampling = sampling
+        self.root = root_seed(seed)
+        self.frame = None
+        if ambient:
+            # Only frames of reproducible datasets are worth caching
+            frame_ss = frame_seed(self.root)
+            if seed is None:
+                frame_ss = np.random.default_rng(frame_ss)
+            self.frame = random_frame(dim, ambient, seed=frame_ss).astype(
+                self.dtype, copy=False
+            )
+        self.width = ambient if ambient else dim
+        self._cached = (None, None)
+        self._embedded = (None, None)
+
+    def _compute(self, k):
+        start = k * BLOCK_SIZE
+        stop = min(start + BLOCK_SIZE, self.n)
+        rng = block_rng(self.root, k, self.n, self.sampling)
+        normals = None
+        if self.needs_normals:
+            data, normals = self.sampler(rng, start, stop)
+        else:
+            data = self.sampler(rng, start, stop)
+        data = data.astype(self.dtype, copy=False)
+        rngs = noise_rngs(self.root, k, len(self.noise))
+        data = add_noise(self.noise, data, rngs, normals)
+        if self.post is not None:
+            data = self.post(data)
+        return data
+
+    def block(self, k):
+        """The points of block ``k`` before embedding."""
+        # Read once, as other threads may replace it
+        cached = self._cached
+        if cached[0] != k:
+            cached = self._cached = (k, self._compute(k))
+        return cached[1]
+
+    def _write(self, data, dst):
+        if self.frame is None:
+            dst[...] = data
+        else:
+            _apply_frame(data, self.frame, out=dst)
+
+    def _ambient_rngs(self, k):
+        return noise_rngs(self.root, k, len(self.ambient_noise), ambient=True)
+
+    def _emit(self, k, data, lo, hi, dst):
+        """Write rows ``lo`` to ``hi`` of block ``k``, whose points are ``data``."""
+        if not self.ambient_noise:
+            self._write(data[lo:hi], dst)
+            return
+        # The noise of the whole block is drawn, so that any rows of it are
+        # the same; whole blocks are noised in the output itself.
+        if lo == 0 and hi == len(data):
+            self._write(data, dst)
+            add_noise(self.ambient_noise, dst, self._ambient_rngs(k))
+            return
+        # Read once, as other threads may replace it
+        embedded = self._embedded
+        if embedded[0] != k:
+            target = np.empty((len(data), self.width), dtype=self.dtype)
+            self._write(data, target)
+            add_noise(self.ambient_noise, target, self._ambient_rngs(k))
+            embedded = self._embedded = (k, target)
+        dst[...] = embedded[1][lo:hi]
+
+    def fill(self, out, start=0):
+        """Write rows ``start`` to ``start + len(out)`` into ``out``."""
+        stop = start + len(out)
+        assert 0 <= start and stop <= self.n, "Rows out of range."
+        pieces = []
+        row = start
+        while row < stop:
+            k = row // BLOCK_SIZE
+            lo = row - k * BLOCK_SIZE
+            hi = min(stop - k * BLOCK_SIZE, BLOCK_SIZE)
+            pieces.append((k, lo, hi, out[row - start : row - start + hi - lo]))
+            row += hi - lo
+
+        if n_workers(self.workers) == 1 or len(pieces) == 1:
+            for k, lo, hi, dst in pieces:
+                self._emit(k, self.block(k), lo, hi, dst)
+            return out
+
+        def task(k, lo, hi, dst):
+            return lambda: self._emit(k, self._compute(k), lo, hi, dst)
+
+        run_tasks([task(*piece) for piece in pieces], self.workers)
+        return out
+
+    def take(self, index, out=None):
+        """Rows ``index``, integers in ``[0, n)``, computing only the blocks holding them."""
+        index = np.asarray(index, dtype=np.int64).reshape(-1)
+        assert np.all((0 <= index) & (index < self.n)), "Rows out of range."
+        out = check_out(out, (len(index), self.width), self.dtype)
+        order = np.argsort(index // BLOCK_SIZE, kind="stable")
+        ks, firsts = np.unique(index[order] // BLOCK_SIZE, return_index=True)
+        single = n_workers(self.workers) == 1 or len(ks) == 1
+
+        def task(k, rows):
+            data = self.block(k) if single else self._compute(k)
+            local = index[rows] - k * BLOCK_SIZE
+            if self.ambient_noise:
+                # The ambient noise is drawn for the whole block
+                full = np.empty((len(data), self.width), dtype=self.dtype)
+                self._emit(k, data, 0, len(data), full)
+                out[rows] = full[local]
+            else:
+                dst = np.empty((len(rows), self.width), dtype=self.dtype)
+                self._write(data[local], dst)
+                out[rows] = dst
+
+        groups = np.split(order, firsts[1:])
+        run_tasks(
+            [lambda k=k, rows=rows: task(int(k), rows) for k, rows in zip(ks, groups)],
+            1 if single else self.workers,
+        )
+        return out
+
+    def generate(self, out=None):
+        """All ``n`` rows, written into ``out`` if given."""
+        return self.fill(check_out(out, (self.n, self.width), self.dtype))
+
+    def stream(self, chunk):
+        """Yield the rows in arrays of ``chunk`` rows; the last one holds the remainder."""
+        assert chunk > 0, "chunk must be positive"
+        for start in range(0, self.n, chunk):
+            rows = min(chunk, self.n - start)
+            yield self.fill(np.empty((rows, self.width), dtype=self.dtype), start)
@@ -0,0 +1,264 @@
+"""
+Scrambled low-discrepancy sequences indexed by row.
+
+Point ``i`` of a sequence only depends on ``i`` and on the scrambling, which
+is drawn once per dataset from its seed. Each block of rows computes its own
+points, so the data does not depend on the chunking, like the random draws.
+
+"""
+
+import numpy as np
+
+#: Values of ``sampling`` accepted by the shapes.
+SAMPLINGS = ("random", "sobol", "halton")
+
+#: Number of bits of the Sobol points.
+_BITS = 32
+
+# Primitive polynomials and initial direction numbers (s, a, m_1, ..., m_s)
+# of dimensions 2 to 21 of Joe & Kuo, "Constructing Sobol sequences with
+# better two-dimensional projections" (2008), new-joe-kuo-6.21201.
+_SOBOL = [
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+]
+
+#: Largest number of dimensions of the Sobol points.
+MAX_SOBOL_DIM = len(_SOBOL) + 1
+#: Number of Sobol points, one per row.
+MAX_SOBOL_POINTS = 2**_BITS
+
+
+def check_sampling(sampling):
+    if sampling not in SAMPLINGS:
+        raise ValueError(
+            "Unknown sampling {!r}. Sampling should be one of {}.".format(
+                sampling, ", ".join(map(repr, SAMPLINGS))
+            )
+        )
+
+
+def _direction_numbers(j):
+    """The ``_BITS`` direction numbers of dimension ``j`` (from 0), as integers."""
+    v = np.zeros(_BITS, dtype=np.uint64)
+    if j == 0:
+        for b in range(_BITS):
+            v[b] = 1 << (_BITS - 1 - b)
+        return v
+    s, a, m = _SOBOL[j - 1]
+    for b in range(s):
+        v[b] = m[b] << (_BITS - 1 - b)
+    for b in range(s, _BITS):
+        x = int(v[b - s]) ^ (int(v[b - s]) >> s)
+        for k in range(1, s):
+            if (a >> (s - 1 - k)) & 1:
+                x ^= int(v[b - k])
+        v[b] = x
+    return v
+
+
+def _parity(x):
+    for shift in (32, 16, 8, 4, 2, 1):
+        x = x ^ (x >> np.uint64(shift))
+    return x & np.uint64(1)
+
+
+def _scrambled_sobol(j, rng):
+    """Direction numbers of dimension ``j`` with a random linear scramble, and a shift."""
+    v = _direction_numbers(j)
+    # Random lower triangular matrix with unit diagonal over GF(2); row i
+    # gives bit i of the result, counted from the most significant bit.
+    bits = np.tril(rng.integers(0, 2, (_BITS, _BITS), dtype=np.uint64), -1)
+    bits += np.eye(_BITS, dtype=np.uint64)
+    weights = np.uint64(1) << np.arange(_BITS - 1, -1, -1, dtype=np.uint64)
+    rows = bits @ weights
+    scrambled = _parity(rows[:, None] & v[None, :])
+    v = (scrambled * weights[:, None]).sum(0, dtype=np.uint64)
+    return v, rng.integers(0, 2**_BITS, dtype=np.uint64)
+
+
+def _primes(k):
+    """The first ``k`` primes."""
+    primes = []
+    candidate = 2
+    while len(primes) < k:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def _scrambled_halton(j, rng):
+    """Base of dimension ``j`` and random permutations of the digits at each level."""
+    base = _primes(j + 1)[j]
+    levels = int(np.ceil(53 / np.log2(base)))
+    perms = np.stack([rng.permutation(base) for _ in range(levels)])
+    scale = float(base) ** -np.arange(1, levels + 1)
+    # Value of the digits past each level when the rest of the index is 0
+    tail = np.concatenate((np.cumsum((perms[:, 0] * scale)[::-1])[::-1], [0.0]))
+    return base, perms, scale, tail
+
+
+def sobol(index, j, rng):
+    """Scrambled Sobol coordinate ``j`` of the points ``index``, in ``(0, 1)``."""
+    if len(index) and int(index.max()) >= MAX_SOBOL_POINTS:
+        raise ValueError(
+            "Sobol points have at most {} rows (2**{}), use sampling='halton'.".format(
+                MAX_SOBOL_POINTS, _BITS
+            )
+        )
+    v, shift = _scrambled_sobol(j, rng)
+    # Gray code order, as in Antonov and Saleev
+    gray = index ^ (index >> np.uint64(1))
+    x = np.full(len(index), shift, dtype=np.uint64)
+    top = int(gray.max()).bit_length() if len(gray) else 0
+    for b in range(top):
+        x ^= np.where((gray >> np.uint64(b)) & np.uint64(1), v[b], np.uint64(0))
+    return (x + 0.5) * 2.0**-_BITS
+
+
+def halton(index, j, rng):
+    """Scrambled Halton coordinate ``j`` of the points ``index``, in ``(0, 1)``."""
+    base, perms, scale, tail = _scrambled_halton(j, rng)
+    x = np.zeros(len(index))
+    index = index.copy()
+    level = 0
+    while level < len(scale) and index.any():
+        index, digit = np.divmod(index, np.uint64(base))
+        x += perms[level][digit.astype(np.intp)] * scale[level]
+        level += 1
+    x += tail[level]
+    return np.clip(x, 2.0**-53, 1 - 2.0**-53)
+
+
+def _ndtri(u):
+    """Inverse of the standard normal CDF, by P. J. Acklam's approximation."""
+    a = (-39.69683028665376, 220.9460984245205, -275.9285104469687,
+         138.3577518672690, -30.66479806614716, 2.506628277459239)  # fmt: skip
+    b = (-54.47609879822406, 161.5858368580409, -155.6989798598866,
+         66.80131188771972, -13.28068155288572)  # fmt: skip
+    c = (-7.784894002430293e-03, -0.3223964580411365, -2.400758277161838,
+         -2.549732539343734, 4.374664141464968, 2.938163982698783)  # fmt: skip
+    d = (7.784695709041462e-03, 0.3224671290700398, 2.445134137142996,
+         3.754408661907416)  # fmt: skip
+
+    def poly(coef, x):
+        y = np.zeros_like(x)
+        for k in coef:
+            y = y * x + k
+        return y
+
+    x = np.empty_like(u)
+    low = u < 0.02425
+    high = u > 1 - 0.02425
+    mid = ~(low | high)
+
+    q = u[mid] - 0.5
+    r = q * q
+    x[mid] = q * poly(a, r) / (poly(b, r) * r + 1)
+    q = np.sqrt(-2 * np.log(u[low]))
+    x[low] = poly(c, q) / (poly(d, q) * q + 1)
+    q = np.sqrt(-2 * np.log1p(-u[high]))
+    x[high] = -poly(c, q) / (poly(d, q) * q + 1)
+    return x
+
+
+class LowDiscrepancy(np.random.Generator):
+    """Generator whose ``random`` and ``standard_normal`` follow a scrambled sequence.
+
+    It stands for the parameter Generator of the rows ``start`` to
+    ``start + rows``. Every call to :meth:`random` must ask for one value, or
+    one row of values, per row, and uses the next coordinates of the
+    sequence, so shapes drawing their parameters with ``rng.random`` work
+    unchanged. The other methods draw from ``bit_generator`` as usual.
+
+    Inputs
+    ------
+    method : {"sobol", "halton"}
+        The sequence.
+    root : np.random.SeedSequence
+        Seed of the scrambling, the same for every block of the dataset.
+    start : int
+        Index of the first row.
+    rows : int
+        Number of rows.
+    bit_generator : np.random.BitGenerator
+        Source of the other random draws.
+    """
+
+    def __init__(self, method, root, start, rows, bit_generator):
+        super().__init__(bit_generator)
+        self.method = method
+        self.root = root
+        self.index = np.arange(start, start + rows, dtype=np.uint64)
+        self.dims = 0
+
+    def _scramble_rng(self, j):
+        root = self.root
+        return np.random.default_rng(
+            np.random.SeedSequence(
+                root.entropy,
+                spawn_key=tuple(root.spawn_key) + (j,),
+                pool_size=root.pool_size,
+            )
+        )
+
+    def uniforms(self, k):
+        """The next ``k`` coordinates of the points of the rows, ``(rows, k)``."""
+        j0 = self.dims
+        if self.method == "sobol" and j0 + k > MAX_SOBOL_DIM:
+            raise ValueError(
+                "Sobol points have at most {} dimensions, use sampling='halton'.".format(
+                    MAX_SOBOL_DIM
+                )
+            )
+        self.dims += k
+        point = sobol if self.method == "sobol" else halton
+        u = np.empty((len(self.index), k))
+        for j in range(k):
+            u[:, j] = point(self.index, j0 + j, self._scramble_rng(j0 + j))
+        return u
+
+    def _draw(self, size, out):
+        if out is not None:
+            size = out.shape
+        shape = (size,) if np.ndim(size) == 0 else tuple(size)
+        if size is None or shape[0] != len(self.index):
+            raise ValueError(
+                "Low-discrepancy sampling draws one point per row, so the "
+                "shape must have {} rows.".format(len(self.index))
+            )
+        k = int(np.prod(shape[1:], dtype=np.int64))
+        return self.uniforms(k).reshape(shape)
+
+    def random(self, size=None, dtype=np.float64, out=None):
+        u = self._draw(size, out)
+        if out is not None:
+            out[...] = u
+            return out
+        return u.astype(dtype, copy=False)
+
+    def standard_normal(self, size=None, dtype=np.float64, out=None):
+        x = _ndtri(self._draw(size, out))
+        if out is not None:
+            out[...] = x
+            return out
+        return x.astype(dtype, copy=False)
@@ -0,0 +1,522 @@
+"""
+Base class and registry of the shapes.
+
+"""
+
+import functools
+
+import numpy as np
+
+from ._blocks import (
+    BLOCK_SIZE,
+    BlockGenerator,
+    _child,
+    block_rng,
+    check_out,
+    frame_seed,
+    noise_rngs,
+    root_seed,
+    run_tasks,
+)
+from .caching import active_cache, seed_key
+from .dimension import _apply_frame, _thin_frame
+from .noise import add_noise, noise_models
+
+#: Number of rows evaluated at once by :meth:`Shape.batch`.
+_BATCH_ROWS = 2**18
+
+#: Registered shape classes by name.
+SHAPES = {}
+
+
+def register_shape(cls):
+    """Class decorator adding a :class:`Shape` subclass to the registry.
+
+    The class is registered under ``cls.name``, so it can be used by name in
+    :func:`tadasets.stream` and the other functions taking a shape name.
+    """
+    assert issubclass(cls, Shape) and cls.name, "Shapes need a name to be registered."
+    SHAPES[cls.name] = cls
+    return cls
+
+
+def get_shape(shape, **params):
+    """Return the shape registered as ``shape``, constructed with ``params``.
+
+    ``shape`` may also be a :class:`Shape` instance, which is returned as is.
+    """
+    if isinstance(shape, Shape):
+        assert not params, "Parameters cannot be passed with a Shape instance."
+        return shape
+    # Register the built-in shapes
+    from . import shapes  # noqa: F401
+
+    assert shape in SHAPES, "Unknown shape {!r}. Choose one of {}.".format(
+        shape, ", ".join(sorted(SHAPES))
+    )
+    return SHAPES[shape](**params)
+
+
+class Shape:
+    """Base class of the shapes.
+
+    A shape draws the intrinsic parameters of its points and evaluates them to
+    points with ``dim`` coordinates. Noise, the ambient embedding, seeding,
+    ``out`` buffers and streaming are handled by one pipeline shared by every
+    shape. The pipeline works through the rows in fixed blocks. For each block
+    it adds the noise in place and writes the embedding straight into the
+    output, so no full-size intermediate is allocated.
+
+    Subclasses set ``name`` and ``dim``, check their parameters in
+    ``__init__`` and implement :meth:`sample_params` and :meth:`evaluate`.
+    """
+
+    #: Name of the shape in the registry.
+    name = None
+    #: Number of coordinates of the points before embedding.
+    dim = None
+
+    def sample_params(self, rng, start, stop, n, dtype=np.float64):
+        """Draw the parameters of rows ``start`` to ``stop`` of ``n``.
+
+        All randomness must come from ``rng``, and the first rows should not
+        depend on ``stop``, so that any chunking gives the same data. Draws
+        should be made in ``dtype``, e.g. ``rng.random(m, dtype=dtype)``.
+        ``dtype`` is only passed when it is not float64, so shapes without
+        single precision support can leave it out.
+
+        Returns
+        -------
+        params : np.ndarray
+            A ``(stop - start, p)`` np.ndarray.
+        """
+        raise NotImplementedError
+
+    def evaluate(self, params):
+        """Map ``(m, p)`` parameters to ``(m, dim)`` points."""
+        raise NotImplementedError
+
+    def postprocess(self, data):
+        """Transform the noisy points of a block in place before embedding."""
+        return data
+
+    def intrinsic(self, params):
+        """Intrinsic coordinates of the points with ``(m, p)`` parameters.
+
+        These are what ``return_params=True`` returns and what
+        :meth:`geodesic` takes. By default the parameters themselves.
+        """
+        return params
+
+    def geodesic(self, x, y):
+        """Geodesic distances between the points with intrinsic coordinates ``x`` and ``y``.
+
+        Returns
+        -------
+        distances : np.ndarray
+            A ``(len(x), len(y))`` np.ndarray. Shapes without a closed form
+            raise NotImplementedError.
+        """
+        raise NotImplementedError(
+            "{!r} has no closed form geodesic distance.".format(self)
+        )
+
+    def normals(self, params):
+        """Unit normals at the points with ``(m, p)`` parameters, ``(m, dim)``.
+
+        Used by :class:`tadasets.noise.AlongNormals`. Only shapes of
+        codimension one have them; the others raise NotImplementedError.
+        """
+        raise NotImplementedError("{!r} has no normals.".format(self))
+
+    def sample(self, rng, start, stop, n, dtype=np.float64, normals=False):
+        """Points of rows ``start`` to ``stop`` of ``n``, before noise and embedding.
+
+        With ``normals=True``, also return the unit normals at the points.
+        """
+        params = self._sample_params(rng, start, stop, n, dtype)
+        if normals:
+            return self.evaluate(params), self.normals(params).astype(dtype, copy=False)
+        return self.evaluate(params)
+
+    def _sample_params(self, rng, start, stop, n, dtype):
+        if np.dtype(dtype) == np.float64:
+            return self.sample_params(rng, start, stop, n)
+        return self.sample_params(rng, start, stop, n, dtype=dtype)
+
+    def blocks(
+        self,
+        n,
+        noise=None,
+        ambient=None,
+        seed=None,
+        workers=None,
+        dtype=np.float64,
+        sampling="random",
+    ):
+        """The :class:`BlockGenerator` producing ``n`` points of this shape."""
+        normals = any(m.needs_normals for m in noise_models(noise))
+        return BlockGenerator(
+            functools.partial(self.sample, n=n, dtype=dtype, normals=normals),
+            self.dim,
+            n,
+            noise=noise,
+            ambient=ambient,
+            seed=seed,
+            post=self.postprocess,
+            workers=workers,
+            dtype=dtype,
+            sampling=sampling,
+        )
+
+    def generate(
+        self,
+        n=100,
+        noise=None,
+        ambient=None,
+        seed=None,
+        out=None,
+        workers=None,
+        dtype=np.float64,
+        return_params=False,
+        sampling="random",
+    ):
+        """Sample ``n`` points on the shape.
+
+        Parameters
+        ----------
+        n : int, default=100
+            Number of data points in shape.
+        noise : float, Noise or list of Noise, optional
+            Standard deviation of normally distributed noise added to data,
+            or noise models from :mod:`tadasets.noise` applied in turn.
+        ambient : int, optional
+            Embed the shape into a space with ambient dimension equal to
+            `ambient`. The shape is randomly rotated in this high dimensional space.
+        seed : int, optional
+            Seed for random state.
+        out : np.ndarray, optional
+            Array to write the data into, e.g. a ``np.memmap``. Must have the
+            shape of the returned data.
+        workers : int, optional
+            Number of threads generating the blocks of rows, -1 for all CPUs.
+            The data is the same for any number of workers.
+        dtype : dtype, default=np.float64
+            Floating point type of the data, e.g. ``np.float32``. The random
+            draws are made in this precision.
+        return_params : bool, default=False
+            If True, also return the intrinsic coordinates of the points.
+        sampling : {"random", "sobol", "halton"}, default="random"
+            Draw the parameters of the points at random or from a scrambled
+            Sobol or Halton sequence, which covers the shape more evenly. The
+            scrambling is drawn from ``seed``, and each point only depends
+            on its index, so the data can still be generated in blocks.
+
+        Returns
+        -------
+        data : np.ndarray
+            An ``(n,ambient)`` np.ndarray if ``ambient`` is specified or
+            a ``(n,dim)`` np.ndarray otherwise. While a :func:`tadasets.cache`
+            is active, datasets with a seed are a read-only ``np.memmap``.
+        params : np.ndarray, if ``return_params``
+            An ``(n, p)`` np.ndarray of the intrinsic coordinates of the
+            points, see :meth:`coordinates`.
+        """
+        reproducible = seed_key(seed) is not None
+        if return_params and not reproducible:
+            # The coordinates are drawn again from the same streams
+            seed = root_seed(seed)
+        blocks = functools.partial(
+            self.blocks,
+            n,
+            noise=noise,
+            ambient=ambient,
+            seed=seed,
+            workers=workers,
+            dtype=dtype,
+            sampling=sampling,
+        )
+        store = active_cache()
+        if store is None or not reproducible:
+            data = blocks().generate(out)
+        else:
+            key = store.key(
+                shape="{}.{}".format(type(self).__module__, type(self).__qualname__),
+                params={k: v for k, v in vars(self).items() if not k.startswith("_")},
+                n=n,
+                noise=noise,
+                ambient=ambient,
+                seed=seed_key(seed),
+                dtype=np.dtype(dtype).str,
+                sampling=sampling,
+            )
+            shape = (n, ambient if ambient else self.dim)
+            data = store.fetch(key, shape, dtype, lambda a: blocks().fill(a), out=out)
+
+        if return_params:
+            params = self.coordinates(
+                n, seed=seed, workers=workers, dtype=dtype, sampling=sampling
+            )
+            return data, params
+        return data
+
+    def coordinates(
+        self, n, seed=None, workers=None, dtype=np.float64, sampling="random"
+    ):
+        """Intrinsic coordinates of the ``n`` points :meth:`generate` returns for ``seed``.
+
+        Only the parameters are drawn again, from the same random streams as
+        the points, so this is much cheaper than generating the data. The
+        coordinates are those of the points before noise and embedding.
+
+        Returns
+        -------
+        params : np.ndarray
+            An ``(n, p)`` np.ndarray, see :meth:`intrinsic`.
+        """
+        root = root_seed(seed)
+        parts = [None] * -(-n // BLOCK_SIZE)
+
+        def task(k):
+            start = k * BLOCK_SIZE
+            stop = min(start + BLOCK_SIZE, n)
+            rng = block_rng(root, k, n, sampling)
+            parts[k] = self.intrinsic(self._sample_params(rng, start, stop, n, dtype))
+
+        run_tasks([functools.partial(task, k) for k in range(len(parts))], workers)
+        if not parts:
+            rng = block_rng(root, 0, n, sampling)
+            parts = [self.intrinsic(self._sample_params(rng, 0, 0, 1, dtype))]
+        return np.concatenate(parts).astype(dtype, copy=False)
+
+    def stream(
+        self,
+        n,
+        chunk,
+        noise=None,
+        ambient=None,
+        seed=None,
+        workers=None,
+        dtype=np.float64,
+        sampling="random",
+    ):
+        """Yield the points of :meth:`generate` in arrays of ``chunk`` rows."""
+        return self.blocks(
+            n,
+            noise=noise,
+            ambient=ambient,
+            seed=seed,
+            workers=workers,
+            dtype=dtype,
+            sampling=sampling,
+        ).stream(chunk)
+
+    def lazy(
+        self,
+        n,
+        noise=None,
+        ambient=None,
+        seed=None,
+        workers=None,
+        dtype=np.float64,
+        sampling="random",
+    ):
+        """The points of :meth:`generate` as a :class:`LazyDataset`."""
+        return LazyDataset(
+            functools.partial(
+                self.blocks,
+                noise=noise,
+                ambient=ambient,
+                # Drawn once, so that the dataset is the same at every access
+                seed=root_seed(seed),
+                workers=workers,
+                dtype=dtype,
+                sampling=sampling,
+            ),
+            n,
+        )
+
+    def batch(
+        self,
+        n,
+        replicates,
+        noise=None,
+        ambient=None,
+        seed=None,
+        out=None,
+        workers=None,
+        dtype=np.float64,
+        sampling="random",
+    ):
+        """Sample ``replicates`` independent copies of ``n`` points on the shape.
+
+        Replicate ``b`` is exactly what :meth:`generate` returns for the seed
+        ``np.random.SeedSequence(seed).spawn(replicates)[b]``, so any replicate
+        can be regenerated on its own. Only the random draws are made per
+        replicate. Evaluation, noise and embedding run once over all the
+        replicates of a block.
+
+        Parameters
+        ----------
+        n : int
+            Number of data points in each replicate.
+        replicates : int
+            Number of replicates.
+        noise, ambient, seed, workers, dtype, sampling
+            See :meth:`generate`.
+        out : np.ndarray, optional
+            Array of shape ``(replicates, n, D)`` to write the data into.
+
+        Returns
+        -------
+        data : np.ndarray
+            A ``(replicates, n, D)`` np.ndarray.
+        """
+        root = root_seed(seed)
+        roots = [_child(root, b) for b in range(replicates)]
+        width = ambient if ambient else self.dim
+        out = check_out(out, (replicates, n, width), dtype)
+
+        frames = None
+        if ambient:
+            frames = np.stack(
+                [
+                    _thin_frame(self.dim, ambient, np.random.default_rng(frame_seed(r)))
+                    for r in roots
+                ]
+            ).astype(dtype, copy=False)
+
+        models = noise_models(noise)
+        intrinsic = [m for m in models if m.space == "intrinsic"]
+        extrinsic = [m for m in models if m.space == "ambient"]
+        with_normals = any(m.needs_normals for m in models)
+
+        def task(k, g0, g1):
+            start = k * BLOCK_SIZE
+            stop = min(start + BLOCK_SIZE, n)
+            m = stop - start
+            rngs = [block_rng(roots[b], k, n, sampling) for b in range(g0, g1)]
+
+            params = np.concatenate(
+                [self._sample_params(rng, start, stop, n, dtype) for rng in rngs]
+            )
+            data = self.evaluate(params).astype(dtype, copy=False)
+            data = data.reshape(g1 - g0, m, self.dim)
+            if intrinsic:
+                normals = [None] * (g1 - g0)
+                if with_normals:
+                    normals = self.normals(params).astype(dtype, copy=False)
+                    normals = normals.reshape(data.shape)
+                for i, b in enumerate(range(g0, g1)):
+                    add_noise(
+                        intrinsic,
+                        data[i],
+                        noise_rngs(roots[b], k, len(intrinsic)),
+                        normals[i],
+                    )
+            data = self.postprocess(data.reshape(-1, self.dim))
+            data = data.reshape(g1 - g0, m, self.dim)
+
+            dst = out[g0:g1, start:stop]
+            if frames is None:
+                dst[...] = data
+            else:
+                _apply_frame(data, frames[g0:g1], out=dst)
+            for i, b in enumerate(range(g0, g1)):
+                add_noise(
+                    extrinsic, dst[i], noise_rngs(roots[b], k, len(extrinsic), True)
+                )
+
+        group = max(_BATCH_ROWS // min(max(n, 1), BLOCK_SIZE), 1)
+        run_tasks(
+            [
+                functools.partial(task, k, g0, min(g0 + group, replicates))
+                for k in range(-(-n // BLOCK_SIZE))
+                for g0 in range(0, replicates, group)
+            ],
+            workers,
+        )
+        return out
+
+    def __repr__(self):
+        params = ", ".join(
+            "{}={!r}".format(k, v)
+            for k, v in vars(self).items()
+            if not k.startswith("_")
+        )
+        return "{}({})".format(type(self).__name__, params)
+
+
+class LazyDataset:
+    """The points of a shape, computed when they are indexed.
+
+    Every block of ``BLOCK_SIZE`` rows draws from random streams derived from
+    the seed and the index of the block, so any rows can be computed without
+    the rows before them. Indexing computes only the blocks holding the
+    requested rows, e.g. ``ds[9 * 10**8 : 10**9]`` computes the last tenth of
+    ``10**9`` points, and :meth:`shard` splits the rows between workers that
+    know nothing of each other. The rows do not depend on ``n`` either, except
+    for curves with ``spacing="even"``, so :meth:`resize` keeps the first rows.
+
+    Inputs
+    ------
+    blocks : callable
+        ``blocks(n)`` returns the :class:`BlockGenerator` of ``n`` rows.
+    n : int
+        Number of rows.
+    """
+
+    ndim = 2
+
+    def __init__(self, blocks, n):
+        self._factory = blocks
+        self._blocks = blocks(n)
+
+    @property
+    def shape(self):
+        return (self._blocks.n, self._blocks.width)
+
+    @property
+    def dtype(self):
+        return self._blocks.dtype
+
+    def __len__(self):
+        return self._blocks.n
+
+    def __getitem__(self, key):
+        rows, cols = key if isinstance(key, tuple) else (key, slice(None))
+        n = len(self)
+        if isinstance(rows, (int, np.integer)):
+            assert -n <= rows < n, "Row {} out of range.".format(rows)
+            return self._blocks.take([rows % n])[0, cols]
+        if isinstance(rows, slice):
+            start, stop, step = rows.indices(n)
+            if step == 1:
+                out = np.empty((max(stop - start, 0), self.shape[1]), self.dtype)
+                return self._blocks.fill(out, start)[:, cols]
+            rows = np.arange(start, stop, step)
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        return self._blocks.take(np.where(rows < 0, rows + n, rows))[:, cols]
+
+    def __array__(self, dtype=None, copy=None):
+        return self._blocks.generate().astype(dtype or self.dtype, copy=False)
+
+    def shard(self, index, count, out=None):
+        """Rows of shard ``index`` of ``count`` contiguous shards of nearly equal size."""
+        assert 0 <= index < count, "index must be between 0 and count - 1."
+        n = len(self)
+        start, stop = index * n // count, (index + 1) * n // count
+        out = check_out(out, (stop - start, self.shape[1]), self.dtype)
+        return self._blocks.fill(out, start)
+
+    def resize(self, n):
+        """The same dataset with ``n`` rows. The rows both have are the same."""
+        return LazyDataset(self._factory, n)
+
+    def __repr__(self):
+        return "LazyDataset(shape={}, dtype={})".format(self.shape, self.dtype)
+
+
+__all__ = ["Shape", "register_shape", "get_shape", "SHAPES", "LazyDataset"]
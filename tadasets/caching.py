@@ -0,0 +1,234 @@
+"""
+Opt-in on-disk cache of generated datasets.
+
+hashlib, json and tempfile are only imported once a cache is used, so that
+importing the shapes stays cheap.
+"""
+
+import contextlib
+import os
+import threading
+
+import numpy as np
+
+from ._version import __version__
+from .noise import Noise
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+_ACTIVE = None
+_LOCK = threading.Lock()
+
+
+def cache(dir, max_bytes=None):
+    """Cache the datasets generated with a seed in the directory ``dir``.
+
+    Datasets are stored as ``.npy`` files named by a hash of the shape, its
+    parameters, ``n``, ``noise``, ``ambient``, the seed, the dtype and the
+    library version. A dataset found in the cache is returned as a read-only
+    memory map instead of being generated again. Datasets generated without
+    a seed, or with a ``np.random.Generator``, are never cached.
+
+    Several processes may share a directory: files are written to a temporary
+    name and renamed into place, and eviction holds a lock file.
+
+    The cache stays active until ``cache(None)`` is called, or until the end
+    of a ``with tadasets.cache(...):`` block.
+
+    Parameters
+    ----------
+    dir : str or None
+        Directory of the cache, created if needed. None disables caching.
+    max_bytes : int, optional
+        Evict the least recently used datasets when the cache grows beyond
+        this size.
+
+    Returns
+    -------
+    cache : DatasetCache or None
+        The active cache.
+    """
+    global _ACTIVE
+    with _LOCK:
+        previous = _ACTIVE
+        _ACTIVE = None if dir is None else DatasetCache(dir, max_bytes=max_bytes)
+        if _ACTIVE is not None:
+            _ACTIVE._previous = previous
+        return _ACTIVE
+
+
+def active_cache():
+    """The cache enabled by :func:`cache`, or None."""
+    return _ACTIVE
+
+
+def _canonical(value):
+    """A JSON-serializable description of ``value`` for hashing."""
+    import hashlib
+
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        digest = hashlib.sha256(value.view(np.uint8)).hexdigest()
+        return {"array": digest, "dtype": value.dtype.str, "shape": value.shape}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items())}
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, Noise):
+        # By parameter, as the repr of large arrays is truncated
+        return {"noise": type(value).__qualname__, "params": _canonical(vars(value))}
+    return repr(value)
+
+
+def seed_key(seed):
+    """Hashable description of a reproducible seed, or None if it is not one."""
+    if isinstance(seed, (int, np.integer)) and not isinstance(seed, bool):
+        return int(seed)
+    if isinstance(seed, np.random.SeedSequence):
+        return [_canonical(seed.entropy), list(seed.spawn_key), seed.pool_size]
+    return None
+
+
+class DatasetCache:
+    """A directory of ``.npy`` datasets with least recently used eviction.
+
+    Inputs
+    ------
+    dir : str
+        Directory of the cache, created if needed.
+    max_bytes : int, optional
+        Maximum total size of the cached files.
+    """
+
+    def __init__(self, dir, max_bytes=None):
+        self.dir = os.path.abspath(os.path.expanduser(dir))
+        self.max_bytes = max_bytes
+        self._previous = None
+        os.makedirs(self.dir, exist_ok=True)
+
+    def key(self, **fields):
+        """Hash of ``fields`` and the library version."""
+        import hashlib
+        import json
+
+        fields["version"] = __version__
+        text = json.dumps(_canonical(fields), sort_keys=True)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.dir, key + ".npy")
+
+    def load(self, key):
+        """The dataset stored under ``key`` as a read-only memory map, or None."""
+        path = self.path(key)
+        try:
+            data = np.load(path, mmap_mode="r")
+            # Mark it as recently used
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return data
+
+    def fetch(self, key, shape, dtype, fill, out=None):
+        """Load the dataset stored under ``key`` or create it with ``fill(out)``.
+
+        A new dataset is generated straight into a memory-mapped temporary
+        file, so it never has to fit in memory twice. If ``out`` is given, the
+        data is also written into it and ``out`` is returned.
+        """
+        data = self.load(key)
+        if data is None:
+            data = self._store(key, shape, dtype, fill)
+        if out is None:
+            return data
+        out[...] = data
+        return out
+
+    def _store(self, key, shape, dtype, fill):
+        import tempfile
+
+        fd, tmp = tempfile.mkstemp(dir=self.dir, prefix=".tmp-", suffix=".npy")
+        os.close(fd)
+        try:
+            array = np.lib.format.open_memmap(tmp, mode="w+", dtype=dtype, shape=shape)
+            fill(array)
+            array.flush()
+            del array
+            # Readers only ever see complete files
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            raise
+        if self.max_bytes is not None:
+            self.evict(keep=key)
+        return np.load(self.path(key), mmap_mode="r")
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with open(os.path.join(self.dir, ".lock"), "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.dir):
+            if name.endswith(".npy") and not name.startswith("."):
+                with contextlib.suppress(FileNotFoundError):
+                    stat = os.stat(os.path.join(self.dir, name))
+                    entries.append((stat.st_mtime, stat.st_size, name))
+        return sorted(entries)
+
+    @property
+    def nbytes(self):
+        """Total size of the cached datasets."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, keep=None):
+        """Remove the least recently used datasets until the cache fits ``max_bytes``."""
+        with self._locked():
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, name in entries:
+                if total <= self.max_bytes:
+                    break
+                if keep is not None and name == keep + ".npy":
+                    continue
+                # Memory maps of a removed file stay valid on POSIX; on
+                # Windows a mapped file cannot be removed and is skipped.
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(self.dir, name))
+                    total -= size
+
+    def clear(self):
+        """Remove every cached dataset."""
+        with self._locked():
+            for _, _, name in self._entries():
+                with contextlib.suppress(OSError):
+                    os.remove(os.path.join(self.dir, name))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        global _ACTIVE
+        with _LOCK:
+            _ACTIVE = self._previous
+
+    def __repr__(self):
+        return "DatasetCache({!r}, max_bytes={!r})".format(self.dir, self.max_bytes)
+
+
+__all__ = ["cache", "DatasetCache"]
@@ -0,0 +1,160 @@
+"""
+Sampling closed parametric curves evenly or uniformly by arc length.
+
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .base import Shape, register_shape
+
+# Arc length tables by curve, least recently used first.
+_TABLES = OrderedDict()
+_TABLES_LOCK = threading.Lock()
+_MAX_TABLES = 32
+
+
+class ClosedCurve(Shape):
+    """Base class of closed curves ``t -> curve(t)`` with ``t`` in ``[0, period)``.
+
+    With ``uniform=False`` the parameter ``t`` is spread evenly or at random
+    over ``[0, period)``. With ``uniform=True`` the points are spread by arc
+    length instead, so they do not cluster where the curve moves slowly. The
+    inverse of the arc length is tabulated once per curve and parameters and
+    kept in a small LRU cache, so each point costs one O(log m) lookup in a
+    table of ``TABLE_SIZE`` entries.
+
+    Subclasses set ``name`` and ``dim`` and implement :meth:`curve`. See also
+    :func:`register_curve`.
+
+    Inputs
+    ------
+    uniform : bool, default=False
+        If True, space the points by arc length rather than by parameter.
+    spacing : {"even", "random"}, default="even"
+        Whether the points are evenly spaced or drawn at random.
+    """
+
+    #: Length of the parameter interval.
+    period = 2 * np.pi
+    #: Number of intervals of the arc length table.
+    TABLE_SIZE = 2**12
+
+    def __init__(self, uniform=False, spacing="even"):
+        assert spacing in ("even", "random"), (
+            "Unknown spacing {!r}. Spacing should be 'even' or 'random'.".format(
+                spacing
+            )
+        )
+        self.uniform = uniform
+        self.spacing = spacing
+
+    def curve(self, t):
+        """Map an ``(m,)`` array of parameters to ``(m, dim)`` points."""
+        raise NotImplementedError
+
+    def arc_length_table(self):
+        """Cumulative arc length at ``TABLE_SIZE + 1`` evenly spaced parameters.
+
+        Returns
+        -------
+        t : np.ndarray
+            The parameters, from 0 to ``period``.
+        s : np.ndarray
+            The arc length from 0 to each parameter, normalized to end at 1.
+        """
+        key = (type(self), repr(self), self.TABLE_SIZE)
+        with _TABLES_LOCK:
+            if key in _TABLES:
+                _TABLES.move_to_end(key)
+                return _TABLES[key]
+
+        t = np.linspace(0, self.period, self.TABLE_SIZE + 1)
+        points = self.curve(t)
+        # Chord lengths converge quadratically to the arc length
+        s = np.concatenate(
+            ([0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1)))
+        )
+        assert s[-1] > 0, "The curve has zero length."
+        s /= s[-1]
+        t.flags.writeable = False
+        s.flags.writeable = False
+
+        with _TABLES_LOCK:
+            _TABLES[key] = (t, s)
+            while len(_TABLES) > _MAX_TABLES:
+                _TABLES.popitem(last=False)
+        return t, s
+
+    def sample_params(self, rng, start, stop, n, dtype=np.float64):
+        # Fraction of the arc length or of the period of each point
+        if self.spacing == "random":
+            u = rng.random(stop - start, dtype=dtype)
+        elif self.uniform:
+            u = np.arange(start, stop) * (1 / n)
+        else:
+            # Same values as np.linspace(0, period, n + 1)[start:stop]
+            return (np.arange(start, stop) * (self.period / n)).astype(dtype)[:, None]
+
+        if self.uniform:
+            t, s = self.arc_length_table()
+            u = np.interp(u, s, t)
+        else:
+            u *= self.period
+        return u.astype(dtype, copy=False)[:, None]
+
+    def evaluate(self, params):
+        return self.curve(params[:, 0]).astype(params.dtype, copy=False)
+
+    def normals(self, params):
+        if self.dim != 2:
+            raise NotImplementedError("Only plane curves have normals.")
+        # The tangent by a central difference, turned by a right angle
+        t = params[:, 0].astype(np.float64)
+        h = 1e-6 * self.period
+        tangent = self.curve(t + h) - self.curve(t - h)
+        tangent /= np.linalg.norm(tangent, axis=1)[:, None]
+        return np.column_stack((tangent[:, 1], -tangent[:, 0]))
+
+
+def register_curve(name, curve, dim, period=2 * np.pi):
+    """Register a closed curve given as a function of its parameter.
+
+    The curve can then be sampled by name, e.g. with :func:`tadasets.stream`,
+    :func:`tadasets.batch` or ``tadasets.get_shape(name, uniform=True)``.
+
+    Parameters
+    ----------
+    name : str
+        Name of the curve in the registry.
+    curve : callable
+        Maps an ``(m,)`` array of parameters in ``[0, period)`` to an
+        ``(m, dim)`` array of points. ``curve(period)`` should equal
+        ``curve(0)``.
+    dim : int
+        Number of coordinates of the points.
+    period : float, default=2 * np.pi
+        Length of the parameter interval.
+
+    Returns
+    -------
+    cls : type
+        The registered :class:`ClosedCurve` subclass.
+    """
+    cls = type(
+        name,
+        (ClosedCurve,),
+        {
+            "name": name,
+            "dim": dim,
+            "period": period,
+            "curve": lambda self, t: curve(t),
+            "__doc__": "The closed curve {!r}.".format(name),
+        },
+    )
+    return register_shape(cls)
+
+
+__all__ = ["ClosedCurve", "register_curve"]
@@ -3,37 +3,205 @@ Methods for embedding objects in high dimensional space.
 
 """
 
+import threading
+from collections import OrderedDict
+
 import numpy as np
 
+# Number of elements of scratch space used when applying a frame.
+_SLAB_SIZE = 2**18
+# Number of rows multiplied at once when applying a frame.
+_TILE_ROWS = 256
+
+# Frames of reproducible seeds by key, least recently used first.
+_FRAMES = OrderedDict()
+_FRAMES_LOCK = threading.Lock()
+#: Total bytes of the cached frames. Larger frames are not cached.
+MAX_FRAME_BYTES = 2**27
+
 
-def embed(data, ambient=50):
+def embed(data, ambient=50, seed=None, method="dense", dtype=np.float64):
     """Embed `data` in `ambient` dimensions, regardless of dimensionality of data.
 
+    With ``method="dense"`` the data is multiplied by a random orthonormal
+    ``(d, ambient)`` frame, which is the same as zero-padding it to ``ambient``
+    columns and applying a Haar-random rotation, without ever forming the
+    ``ambient x ambient`` rotation. This takes O(n * d * ambient) time.
+
+    With ``method="fast"`` the zero-padded data is instead rotated by the
+    structured orthogonal transform ``H D3 H D2 H D1``, where ``H`` is the
+    orthonormal discrete Hartley transform and the ``Di`` are random sign
+    flips. This is a random isometry rather than a Haar-random rotation, but
+    it takes O(n * ambient * log(ambient)) time and O(ambient) extra memory
+    beyond the output, and pairwise distances are preserved to machine
+    precision.
+
     Inputs
     ------
     data : array-like
 
     ambient : int
         Dimension of embedding space. Must be greater than dimensionality of data.
+    seed : int, np.random.Generator or np.random.SeedSequence, optional
+        Seed for random state. Frames for integer seeds are cached. By
+        default the seed is drawn from the global ``np.random`` state, so
+        ``np.random.seed`` makes the embedding reproducible.
+    method : {"dense", "fast"}, default="dense"
+        How to construct the random rotation, see above.
+    dtype : dtype, default=np.float64
+        Floating point type of the embedded data, e.g. ``np.float32``. The
+        frame is computed in double precision and rounded once.
     """
 
     n, d = data.shape
+    data = np.asarray(data, dtype=dtype)
+    if seed is None:
+        seed = np.random.default_rng(np.random.randint(2**32, size=4, dtype=np.uint64))
+    if method == "dense":
+        frame = random_frame(d, ambient, seed=seed)
+        return np.dot(data, frame.astype(dtype, copy=False))
+    if method == "fast":
+        return _structured_embed(data, ambient, np.random.default_rng(seed))
+    raise ValueError(
+        "Unknown method {!r}. Method should be 'dense' or 'fast'.".format(method)
+    )
+
+
+def random_frame(d, ambient, seed=None):
+    """A random orthonormal ``(d, ambient)`` frame.
+
+    The rows are the first ``d`` rows of a Haar-distributed rotation of
+    dimension ``ambient``. Only a thin QR decomposition of an ``(ambient, d)``
+    Gaussian matrix is computed, which takes O(ambient * d^2) time.
+
+    Inputs
+    ------
+    d : int
+        Dimensionality of the data.
+    ambient : int
+        Dimension of embedding space. Must be greater than ``d``.
+    seed : int, np.random.Generator or np.random.SeedSequence, optional
+        Seed for random state. Frames for integer seeds and SeedSequences are
+        kept in an LRU cache of at most ``MAX_FRAME_BYTES`` and returned
+        read-only.
+
+    Returns
+    -------
+    frame : np.ndarray
+        A ``(d, ambient)`` np.ndarray with orthonormal rows.
+    """
     assert ambient > d, (
         "Dimensionality of ambient space ({}) must be greater than dimensionality of data ({}).".format(
             ambient, d
         )
     )
+    if isinstance(seed, (int, np.integer)):
+        return _cached_frame(d, ambient, int(seed), None, None)
+    if isinstance(seed, np.random.SeedSequence):
+        entropy = seed.entropy
+        if isinstance(entropy, (int, np.integer)):
+            entropy = int(entropy)
+        else:
+            entropy = tuple(int(e) for e in entropy)
+        return _cached_frame(d, ambient, entropy, tuple(seed.spawn_key), seed.pool_size)
+    return _thin_frame(d, ambient, np.random.default_rng(seed))
+
+
+def _thin_frame(d, ambient, rng):
+    q, r = np.linalg.qr(rng.standard_normal((ambient, d)))
+    # Fix the signs so the frame is Haar distributed
+    q *= np.where(np.diag(r) < 0, -1.0, 1.0)
+    return np.ascontiguousarray(q.T)
+
 
-    base = np.zeros((n, ambient))
-    base[:, :d] = data
+def _cached_frame(d, ambient, entropy, spawn_key, pool_size):
+    key = (d, ambient, entropy, spawn_key, pool_size)
+    with _FRAMES_LOCK:
+        if key in _FRAMES:
+            _FRAMES.move_to_end(key)
+            return _FRAMES[key]
 
-    # construct a rotation matrix of dimension `ambient`.
-    random_rotation = np.random.random((ambient, ambient))
-    q, r = np.linalg.qr(random_rotation)
+    if spawn_key is None:
+        seed = entropy
+    else:
+        seed = np.random.SeedSequence(entropy, spawn_key=spawn_key, pool_size=pool_size)
+    frame = _thin_frame(d, ambient, np.random.default_rng(seed))
+    frame.flags.writeable = False
+    if frame.nbytes > MAX_FRAME_BYTES:
+        return frame
 
-    base = np.dot(base, q)
+    with _FRAMES_LOCK:
+        _FRAMES[key] = frame
+        total = sum(f.nbytes for f in _FRAMES.values())
+        while total > MAX_FRAME_BYTES:
+            total -= _FRAMES.popitem(last=False)[1].nbytes
+    return frame
 
-    return base
+
+def _hartley(x, out):
+    """Orthonormal discrete Hartley transform of the rows of ``x``.
+
+    The transform is its own inverse. It is computed from a real FFT using
+    ``H[k] = Re F[k] - Im F[k]`` and the conjugate symmetry of ``F``.
+    """
+    N = x.shape[1]
+    F = np.fft.rfft(x, axis=1, norm="ortho")
+    half = N // 2 + 1
+    np.subtract(F.real, F.imag, out=out[:, :half])
+    tail = F[:, 1 : (N + 1) // 2][:, ::-1]
+    np.add(tail.real, tail.imag, out=out[:, half:])
+    return out
+
+
+def _structured_embed(data, ambient, rng):
+    n, d = data.shape
+    assert ambient > d, (
+        "Dimensionality of ambient space ({}) must be greater than dimensionality of data ({}).".format(
+            ambient, d
+        )
+    )
+    signs = np.where(rng.random((3, ambient)) < 0.5, -1.0, 1.0).astype(data.dtype)
+
+    out = np.empty((n, ambient), dtype=data.dtype)
+    step = max(_SLAB_SIZE // ambient, 1)
+    x = np.zeros((min(step, n), ambient), dtype=data.dtype)
+    for start in range(0, n, step):
+        dst = out[start : start + step]
+        m = len(dst)
+        x[:m, d:] = 0
+        np.multiply(data[start : start + step], signs[0, :d], out=x[:m, :d])
+        _hartley(x[:m], out=dst)
+        dst *= signs[1]
+        _hartley(dst, out=x[:m])
+        x[:m] *= signs[2]
+        _hartley(x[:m], out=dst)
+    return out
+
+
+def _apply_frame(data, frame, out):
+    """Write ``data @ frame`` into ``out``.
+
+    The rows are multiplied in tiles of ``_TILE_ROWS`` rows, the last one
+    padded, so every row goes through a matrix product of the same shape and
+    does not depend on how rows are chunked. Only one tile of scratch space is
+    used for any ``out``, including memory-mapped arrays.
+
+    ``data`` may have a leading batch axis, with one frame per batch entry.
+    """
+    if frame.ndim == 3:
+        for x, f, dst in zip(data, frame, out):
+            _apply_frame(x, f, dst)
+        return out
+    frame = np.ascontiguousarray(frame, dtype=out.dtype)
+    rows, d = data.shape
+    x = np.zeros((_TILE_ROWS, d), dtype=out.dtype)
+    y = np.empty((_TILE_ROWS, frame.shape[1]), dtype=out.dtype)
+    for start in range(0, rows, _TILE_ROWS):
+        m = min(_TILE_ROWS, rows - start)
+        x[:m] = data[start : start + m]
+        np.matmul(x, frame, out=y)
+        out[start : start + m] = y[:m]
+    return out
 
 
-__all__ = ["embed"]
+__all__ = ["embed", "random_frame"]
@@ -0,0 +1,146 @@
+"""
+Geodesic distances computed from the intrinsic coordinates of the points.
+
+The shapes with a closed form geodesic distance, e.g. :func:`tadasets.dsphere`,
+:func:`tadasets.sphere`, the flat :func:`tadasets.torus` and
+:func:`tadasets.swiss_roll`, return the intrinsic coordinates of their points
+with ``return_params=True``. The functions here turn them into exact geodesic
+distances a block of rows at a time, so the memory used besides the output is
+bounded whatever the number of points.
+"""
+
+import functools
+
+import numpy as np
+
+from ._blocks import check_out, run_tasks
+from .base import get_shape
+
+#: Number of distances computed at once by each block.
+BLOCK_ELEMENTS = 2**22
+
+
+def _rows(n, m):
+    """Starts of the blocks of rows of an ``(n, m)`` distance matrix."""
+    step = max(BLOCK_ELEMENTS // max(m, 1), 1)
+    return range(0, n, step), step
+
+
+def geodesic_distances(shape, params, other=None, out=None, workers=None, **kwargs):
+    """Geodesic distances between the points with intrinsic coordinates ``params``.
+
+    Parameters
+    ----------
+    shape : str
+        Name of the shape, e.g. ``"dsphere"``, or a :class:`Shape`.
+    params : np.ndarray (n, p)
+        Intrinsic coordinates, as returned with ``return_params=True``.
+    other : np.ndarray (m, p), optional
+        Coordinates of a second set of points. Defaults to ``params``.
+    out : np.ndarray, optional
+        Array of shape ``(n, m)`` to write the distances into, e.g. a
+        ``np.memmap``.
+    workers : int, optional
+        Number of threads computing blocks of rows, -1 for all CPUs.
+    **kwargs
+        Shape parameters, the same as when sampling, e.g. ``r`` for
+        ``"sphere"`` or ``flat=True`` for ``"torus"``.
+
+    Returns
+    -------
+    distances : np.ndarray
+        An ``(n, m)`` np.ndarray.
+
+    Examples
+    --------
+    >>> data, params = tadasets.sphere(1000, r=2, seed=0, return_params=True)
+    >>> D = tadasets.geodesic_distances("sphere", params, r=2)
+    """
+    shape = get_shape(shape, **kwargs)
+    other = params if other is None else other
+    n, m = len(params), len(other)
+    out = check_out(out, (n, m), np.result_type(params, other, np.float32))
+    starts, step = _rows(n, m)
+
+    def task(i):
+        out[i : i + step] = shape.geodesic(params[i : i + step], other)
+
+    run_tasks([functools.partial(task, i) for i in starts], workers)
+    return out
+
+
+def geodesic_pdist(shape, params, out=None, workers=None, **kwargs):
+    """Condensed geodesic distances, in the order of ``scipy.spatial.distance.pdist``.
+
+    Only the upper triangle is computed. Takes the same arguments as
+    :func:`geodesic_distances`.
+
+    Returns
+    -------
+    distances : np.ndarray
+        An ``(n * (n - 1) / 2,)`` np.ndarray.
+    """
+    shape = get_shape(shape, **kwargs)
+    n = len(params)
+    out = check_out(out, (n * (n - 1) // 2,), np.result_type(params, np.float32))
+    # Blocks of rows holding about BLOCK_ELEMENTS distances each
+    starts = [0]
+    while starts[-1] < n:
+        i = starts[-1]
+        starts.append(min(i + max(BLOCK_ELEMENTS // max(n - i, 1), 1), n))
+
+    def offset(i):
+        return i * n - i * (i + 1) // 2
+
+    def task(i, j):
+        d = shape.geodesic(params[i:j], params[i:])
+        # Row r of the block is point i + r, keep the columns past it
+        upper = np.arange(n - i)[None, :] > np.arange(j - i)[:, None]
+        out[offset(i) : offset(j)] = d[upper]
+
+    run_tasks(
+        [functools.partial(task, i, j) for i, j in zip(starts[:-1], starts[1:])],
+        workers,
+    )
+    return out
+
+
+def geodesic_knn(shape, params, k, other=None, workers=None, **kwargs):
+    """The ``k`` geodesic nearest neighbors of each point.
+
+    Without ``other``, the neighbors are searched among ``params`` and a point
+    is not its own neighbor. Takes the same arguments as
+    :func:`geodesic_distances`.
+
+    Returns
+    -------
+    distances : np.ndarray
+        An ``(n, k)`` np.ndarray of distances, in increasing order.
+    indices : np.ndarray
+        An ``(n, k)`` np.ndarray of the indices of the neighbors.
+    """
+    shape = get_shape(shape, **kwargs)
+    exclude = other is None
+    other = params if other is None else other
+    n, m = len(params), len(other)
+    assert 0 < k <= m - exclude, "k must be between 1 and the number of points."
+    distances = np.empty((n, k), dtype=np.result_type(params, other, np.float32))
+    indices = np.empty((n, k), dtype=np.intp)
+    starts, step = _rows(n, m)
+
+    def task(i):
+        d = shape.geodesic(params[i : i + step], other)
+        rows = np.arange(len(d))[:, None]
+        if exclude:
+            d[rows[:, 0], i + rows[:, 0]] = np.inf
+        index = np.argpartition(d, k - 1, axis=1)[:, :k]
+        nearest = d[rows, index]
+        order = np.argsort(nearest, axis=1, kind="stable")
+        distances[i : i + step] = nearest[rows, order]
+        indices[i : i + step] = index[rows, order]
+
+    run_tasks([functools.partial(task, i) for i in starts], workers)
+    return distances, indices
+
+
+__all__ = ["geodesic_distances", "geodesic_pdist", "geodesic_knn"]
@@ -0,0 +1,434 @@
+"""
+Readers of triangle meshes in the OFF, OBJ and PLY formats.
+
+Each reader returns ``(vertices, triangles)``, ready for
+:func:`tadasets.from_mesh` or :class:`tadasets.MeshSampler`::
+
+    data = tadasets.from_mesh(*tadasets.read_mesh("bunny.ply"), n=10**6)
+
+ASCII files are read whole and parsed by numpy in one pass when every face is
+a triangle. Binary PLY files are memory-mapped, so their vertices and faces
+are not read until they are sampled. Faces with more than three vertices are
+split into fans of triangles.
+"""
+
+import os
+import re
+
+import numpy as np
+
+
+def _numbers(text):
+    """All the numbers of an ASCII block, parsed in one pass."""
+    if not text.strip():
+        return np.empty(0)
+    return np.fromstring(text, sep=" ")
+
+
+def _fans(faces):
+    """Triangles of the polygons ``faces``, a list of vertex index sequences."""
+    triangles = []
+    for face in faces:
+        for k in range(1, len(face) - 1):
+            triangles.append((face[0], face[k], face[k + 1]))
+    return np.array(triangles, dtype=np.int64).reshape(-1, 3)
+
+
+def _uniform_fans(polygons):
+    """Triangles of the ``(m, k)`` polygons ``polygons``, in the order of :func:`_fans`."""
+    k = polygons.shape[1]
+    if k == 3:
+        return polygons
+    fans = [polygons[:, [0, j, j + 1]] for j in range(1, k - 1)]
+    return np.stack(fans, axis=1).reshape(-1, 3)
+
+
+def _same_size(flat, m, columns=None):
+    """The ``(m, k)`` polygons of ``flat`` if all have the same size, else None.
+
+    With ``columns=None``, the faces may be followed by any number of values,
+    the same for every face.
+    """
+    if m == 0 or len(flat) % m:
+        return None
+    rows = flat.reshape(m, len(flat) // m)
+    k = int(rows[0, 0])
+    extra = rows.shape[1] - 1 - k
+    if extra < 0 or (columns is not None and extra != columns):
+        return None
+    if not np.all(rows[:, 0] == k):
+        return None
+    return rows[:, 1 : 1 + k].astype(np.int64)
+
+
+def _walk(flat, m, columns=0):
+    """The polygons of ``m`` faces in ``flat``, or None if they do not fill it."""
+    faces = []
+    i = 0
+    for _ in range(m):
+        if i >= len(flat):
+            return None
+        k = int(flat[i])
+        faces.append(flat[i + 1 : i + 1 + k].astype(np.int64))
+        i += 1 + k + columns
+    return faces if i == len(flat) else None
+
+
+def _counted_faces(flat, m, columns=0):
+    """Triangles of ``m`` faces stored as ``count i_1 ... i_count`` in ``flat``.
+
+    Each face is followed by ``columns`` more values, e.g. a color.
+    """
+    if m == 0:
+        return np.empty((0, 3), dtype=np.int64)
+    polygons = _same_size(flat, m, columns)
+    if polygons is not None:
+        return _uniform_fans(polygons)
+    # Polygons of several sizes, walked one face at a time
+    faces = _walk(flat, m, columns)
+    assert faces is not None, "The faces do not match their counts."
+    return _fans(faces)
+
+
+def _strip_comments(text):
+    if b"#" in text:
+        text = re.sub(rb"#[^\n]*", b"", text)
+    return text
+
+
+def read_off(path):
+    """Read a triangle mesh from an OFF file.
+
+    Vertex colors (``COFF``) and face colors are ignored.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+
+    Returns
+    -------
+    vertices : np.ndarray
+        An ``(N, 3)`` np.ndarray.
+    triangles : np.ndarray
+        An ``(M, 3)`` np.ndarray of vertex indices.
+    """
+    with open(path, "rb") as f:
+        text = _strip_comments(f.read())
+    header, _, body = text.lstrip().partition(b"\n")
+    words = header.split()
+    assert words and words[0].endswith(b"OFF"), "{} is not an OFF file.".format(path)
+    counts = words[1:]
+    while len(counts) < 2 and body:
+        # The counts are on the next non-empty line
+        line, _, body = body.partition(b"\n")
+        counts += line.split()
+    nv, nf = int(counts[0]), int(counts[1])
+
+    # Vertices may carry colors: count the values of the first vertex line
+    body = body.lstrip()
+    first_vertex = body.split(b"\n", 1)[0].split()
+    width = len(first_vertex) if nv else 3
+    flat = _numbers(body)
+    vertices = np.ascontiguousarray(flat[: nv * width].reshape(nv, width)[:, :3])
+    faces = flat[nv * width :]
+    if nf == 0:
+        return vertices, np.empty((0, 3), dtype=np.int64)
+
+    # Faces of one size, with or without the same number of color values
+    polygons = _same_size(faces, nf)
+    if polygons is not None:
+        return vertices, _uniform_fans(polygons)
+    # Faces of several sizes without colors
+    polygons = _walk(faces, nf)
+    if polygons is not None:
+        return vertices, _fans(polygons)
+    # Faces of several sizes with colors, which end with their line
+    lines = [line.split() for line in body.split(b"\n") if line.strip()]
+    lines = [line for line in lines if not line[0].startswith(b"#")]
+    polygons = []
+    for line in lines[nv : nv + nf]:
+        k = int(line[0])
+        polygons.append(np.array(line[1 : 1 + k], dtype=np.int64))
+    return vertices, _fans(polygons)
+
+
+def read_obj(path):
+    """Read a triangle mesh from a Wavefront OBJ file.
+
+    Only the ``v`` and ``f`` records are used. Texture and normal indices of
+    the faces are ignored, and negative indices count back from the last
+    vertex defined.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+
+    Returns
+    -------
+    vertices : np.ndarray
+        An ``(N, 3)`` np.ndarray.
+    triangles : np.ndarray
+        An ``(M, 3)`` np.ndarray of vertex indices.
+    """
+    with open(path, "rb") as f:
+        text = _strip_comments(f.read())
+
+    vertex_lines = re.findall(rb"^[ \t]*v[ \t]+([^\n]*)", text, re.M)
+    nv = len(vertex_lines)
+    flat = _numbers(b"\n".join(vertex_lines))
+    if len(flat) == 3 * nv:
+        vertices = flat.reshape(nv, 3)
+    else:
+        # Optional w or colors after x y z
+        vertices = np.array([line.split()[:3] for line in vertex_lines], dtype=float)
+    vertices = vertices.reshape(nv, 3)
+
+    face_lines = re.findall(rb"^[ \t]*f[ \t]+([^\n]*)", text, re.M)
+    # Keep the vertex index of each "v/vt/vn" corner
+    corners = re.sub(rb"/[^\s]*", b"", b"\n".join(face_lines))
+    flat = _numbers(corners)
+    if len(flat) == 3 * len(face_lines) and not np.any(flat < 0):
+        triangles = flat.reshape(-1, 3).astype(np.int64) - 1
+        return vertices, triangles
+
+    # Polygons or relative indices, walked one record at a time
+    faces = []
+    seen = 0
+    for line in re.findall(rb"^[ \t]*([vf])[ \t]+([^\n]*)", text, re.M):
+        if line[0] == b"v":
+            seen += 1
+            continue
+        face = np.fromstring(re.sub(rb"/[^\s]*", b"", line[1]), sep=" ")
+        face = face.astype(np.int64)
+        faces.append(np.where(face < 0, face + seen, face - 1))
+    return vertices, _fans(faces)
+
+
+_PLY_TYPES = {
+    b"char": "i1",
+    b"int8": "i1",
+    b"uchar": "u1",
+    b"uint8": "u1",
+    b"short": "i2",
+    b"int16": "i2",
+    b"ushort": "u2",
+    b"uint16": "u2",
+    b"int": "i4",
+    b"int32": "i4",
+    b"uint": "u4",
+    b"uint32": "u4",
+    b"float": "f4",
+    b"float32": "f4",
+    b"double": "f8",
+    b"float64": "f8",
+}
+
+
+def _ply_header(f):
+    """Format, elements ``(name, count, properties)`` and size of a PLY header."""
+    assert f.readline().strip() == b"ply", "Not a PLY file."
+    fmt = None
+    elements = []
+    while True:
+        line = f.readline()
+        assert line, "The PLY header has no end_header."
+        words = line.split()
+        if not words or words[0] in (b"comment", b"obj_info"):
+            continue
+        if words[0] == b"format":
+            fmt = words[1].decode()
+        elif words[0] == b"element":
+            elements.append((words[1].decode(), int(words[2]), []))
+        elif words[0] == b"property":
+            if words[1] == b"list":
+                # (name, item type, count type)
+                prop = (words[4].decode(), words[3], words[2])
+            else:
+                prop = (words[2].decode(), words[1], None)
+            elements[-1][2].append(prop)
+        elif words[0] == b"end_header":
+            return fmt, elements, f.tell()
+
+
+def _record_dtype(properties, order):
+    """Structured dtype of a record of scalar ``properties``, or None for lists."""
+    if any(count is not None for _, _, count in properties):
+        return None
+    return np.dtype([(name, order + _PLY_TYPES[t]) for name, t, _ in properties])
+
+
+def _triangle_dtype(properties, order):
+    """Record dtype of an element whose lists all hold three items."""
+    fields = []
+    for name, t, count in properties:
+        if count is None:
+            fields.append((name, order + _PLY_TYPES[t]))
+        else:
+            fields.append((name + "_count", order + _PLY_TYPES[count]))
+            fields.append((name, order + _PLY_TYPES[t], (3,)))
+    return np.dtype(fields)
+
+
+def _xyz(records):
+    """``(N, 3)`` view of the x, y, z fields of ``records``, without a copy if possible."""
+    from numpy.lib import recfunctions
+
+    return recfunctions.structured_to_unstructured(records[["x", "y", "z"]])
+
+
+def _read_binary_list(f, count_type, item_type, m, other):
+    """Read ``m`` list records one at a time, returning the lists."""
+    count_type, item_type = np.dtype(count_type), np.dtype(item_type)
+    faces = []
+    for _ in range(m):
+        k = int(np.frombuffer(f.read(count_type.itemsize), count_type)[0])
+        faces.append(np.frombuffer(f.read(k * item_type.itemsize), item_type))
+        f.read(other)
+    return faces
+
+
+def read_ply(path, mmap=True):
+    """Read a triangle mesh from a PLY file, ASCII or binary.
+
+    The ``x``, ``y`` and ``z`` vertex properties and the first list property
+    of the faces (``vertex_indices`` or ``vertex_index``) are used. With
+    ``mmap=True``, the vertex and face blocks of binary files with only
+    triangles are memory-mapped and returned as read-only views, without
+    copying.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file.
+    mmap : bool, default=True
+        Memory-map the binary blocks instead of reading them.
+
+    Returns
+    -------
+    vertices : np.ndarray
+        An ``(N, 3)`` np.ndarray.
+    triangles : np.ndarray
+        An ``(M, 3)`` np.ndarray of vertex indices.
+    """
+    with open(path, "rb") as f:
+        fmt, elements, offset = _ply_header(f)
+        if fmt == "ascii":
+            return _read_ascii_ply(f.read(), elements)
+    assert fmt in ("binary_little_endian", "binary_big_endian"), (
+        "Unknown PLY format {!r}.".format(fmt)
+    )
+    order = "<" if fmt == "binary_little_endian" else ">"
+    size = os.path.getsize(path)
+
+    vertices = triangles = None
+    with open(path, "rb") as f:
+        for name, count, properties in elements:
+            dtype = _record_dtype(properties, order)
+            if dtype is None:
+                dtype = _triangle_dtype(properties, order)
+                lists = [p for p in properties if p[2] is not None]
+                records = None
+                if offset + dtype.itemsize * count <= size:
+                    records = _load(path, f, dtype, offset, count, mmap)
+                if records is not None and np.all(records[lists[0][0] + "_count"] == 3):
+                    block = records[lists[0][0]]
+                    offset += dtype.itemsize * count
+                else:
+                    # Polygons, read one at a time
+                    f.seek(offset)
+                    assert len(lists) == 1 and lists[0] == properties[0], (
+                        "Only faces starting with their vertex list are supported."
+                    )
+                    other = _record_dtype(properties[1:], order)
+                    block = _fans(
+                        _read_binary_list(
+                            f,
+                            order + _PLY_TYPES[lists[0][2]],
+                            order + _PLY_TYPES[lists[0][1]],
+                            count,
+                            other.itemsize if other is not None else 0,
+                        )
+                    )
+                    offset = f.tell()
+                if name == "face":
+                    triangles = block
+                continue
+            records = _load(path, f, dtype, offset, count, mmap)
+            offset += dtype.itemsize * count
+            if name == "vertex":
+                vertices = _xyz(records)
+
+    assert vertices is not None, "{} has no vertex element.".format(path)
+    if triangles is None:
+        triangles = np.empty((0, 3), dtype=np.int64)
+    return vertices, triangles
+
+
+def _load(path, f, dtype, offset, count, mmap):
+    if mmap:
+        return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+    f.seek(offset)
+    return np.fromfile(f, dtype=dtype, count=count)
+
+
+def _read_ascii_ply(text, elements):
+    flat = _numbers(_strip_comments(text))
+    vertices = triangles = None
+    i = 0
+    for name, count, properties in elements:
+        lists = [p for p in properties if p[2] is not None]
+        if not lists:
+            width = len(properties)
+            block = flat[i : i + count * width].reshape(count, width)
+            i += count * width
+            if name == "vertex":
+                names = [p[0] for p in properties]
+                vertices = block[:, [names.index(c) for c in ("x", "y", "z")]]
+            continue
+        assert len(lists) == 1 and lists[0] == properties[0], (
+            "Only faces starting with their vertex list are supported."
+        )
+        columns = len(properties) - 1
+        # The faces are the last element in practice; otherwise walk them
+        if name == "face" and i + count * (4 + columns) == len(flat):
+            faces = _counted_faces(flat[i:], count, columns)
+            i = len(flat)
+        else:
+            polygons = []
+            for _ in range(count):
+                k = int(flat[i])
+                polygons.append(flat[i + 1 : i + 1 + k].astype(np.int64))
+                i += 1 + k + columns
+            faces = _fans(polygons)
+        if name == "face":
+            triangles = faces
+    assert vertices is not None, "The PLY file has no vertex element."
+    if triangles is None:
+        triangles = np.empty((0, 3), dtype=np.int64)
+    return np.ascontiguousarray(vertices), triangles
+
+
+_READERS = {".off": read_off, ".obj": read_obj, ".ply": read_ply}
+
+
+def read_mesh(path):
+    """Read a triangle mesh, choosing the reader by the extension of ``path``.
+
+    Returns
+    -------
+    vertices, triangles : np.ndarray
+        See :func:`read_off`.
+    """
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext not in _READERS:
+        raise ValueError(
+            "Unknown mesh format {!r}. Use one of {}.".format(
+                ext, ", ".join(sorted(_READERS))
+            )
+        )
+    return _READERS[ext](path)
+
+
+__all__ = ["read_off", "read_obj", "read_ply", "read_mesh"]
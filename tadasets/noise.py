@@ -0,0 +1,220 @@
+"""
+Noise models added to the points of the shapes.
+
+The ``noise`` argument of every shape takes a standard deviation, as before,
+or one of the models below, or a list of them applied in turn::
+
+    tadasets.torus(n, ambient=10, noise=[Gaussian(0.05), Outliers(0.01, -4, 4)])
+
+Models in the ``"intrinsic"`` space perturb the points of the shape before
+the ambient embedding, in its own coordinates. Models in the ``"ambient"``
+space perturb the embedded points, so with ``ambient`` the noise fills every
+coordinate. The noise is added block by block into the buffer of the block or
+straight into the output, from the random streams of the block, so it only
+takes memory for one block and does not depend on the chunking.
+
+Each model of a list draws from its own stream, and draws the values of a
+row after those of the rows before it, so the first rows of a dataset do not
+change when it is generated with more rows.
+"""
+
+from typing import Sequence, Union
+
+import numpy as np
+
+SPACES = ("intrinsic", "ambient")
+
+
+class Noise:
+    """Base class of the noise models.
+
+    Subclasses implement :meth:`apply`, drawing only from ``rng`` and row
+    by row, so that the noise of the first rows does not depend on the
+    number of rows.
+
+    Inputs
+    ------
+    space : {"intrinsic", "ambient"}, default="intrinsic"
+        Whether the noise is added before or after the ambient embedding.
+    """
+
+    #: True if :meth:`apply` needs the unit normals at the points.
+    needs_normals = False
+
+    def __init__(self, space="intrinsic"):
+        assert space in SPACES, "Unknown space {!r}. Space should be one of {}.".format(
+            space, ", ".join(map(repr, SPACES))
+        )
+        self.space = space
+
+    def apply(self, data, rng, normals=None):
+        """Add the noise to the ``(m, D)`` points ``data`` in place and return them."""
+        raise NotImplementedError
+
+    def __repr__(self):
+        params = ", ".join(
+            "{}={!r}".format(k, v)
+            for k, v in vars(self).items()
+            if not k.startswith("_")
+        )
+        return "{}({})".format(type(self).__name__, params)
+
+
+def _scaled(scale, dtype):
+    """``scale`` as a scalar or a per-coordinate row in ``dtype``."""
+    scale = np.asarray(scale, dtype=dtype)
+    assert scale.ndim <= 1, "scale should be a number or one number per coordinate."
+    return scale
+
+
+class Gaussian(Noise):
+    """Normally distributed noise.
+
+    Inputs
+    ------
+    scale : float or array_like (D,)
+        Standard deviation, or one standard deviation per coordinate for
+        anisotropic noise.
+    space : {"intrinsic", "ambient"}, default="intrinsic"
+        See :class:`Noise`.
+    """
+
+    def __init__(self, scale, space="intrinsic"):
+        super().__init__(space)
+        self.scale = scale
+
+    def apply(self, data, rng, normals=None):
+        scratch = rng.standard_normal(data.shape, dtype=data.dtype)
+        scratch *= _scaled(self.scale, data.dtype)
+        data += scratch
+        return data
+
+
+class StudentT(Noise):
+    """Heavy-tailed noise, Student's t distribution with ``df`` degrees of freedom.
+
+    ``df=1`` gives Cauchy noise, and large ``df`` approaches :class:`Gaussian`.
+
+    Inputs
+    ------
+    scale : float or array_like (D,)
+        Scale, or one scale per coordinate.
+    df : float, default=3
+        Degrees of freedom.
+    space : {"intrinsic", "ambient"}, default="intrinsic"
+        See :class:`Noise`.
+    """
+
+    def __init__(self, scale, df=3, space="intrinsic"):
+        assert df > 0, "df should be positive."
+        super().__init__(space)
+        self.scale = scale
+        self.df = df
+
+    def apply(self, data, rng, normals=None):
+        scratch = rng.standard_t(self.df, data.shape).astype(data.dtype, copy=False)
+        scratch *= _scaled(self.scale, data.dtype)
+        data += scratch
+        return data
+
+
+class Outliers(Noise):
+    """Replace a ``fraction`` of the points by points uniform in a box.
+
+    Each point is replaced independently with probability ``fraction``.
+
+    Inputs
+    ------
+    fraction : float
+        Probability of each point to be an outlier.
+    low, high : float or array_like (D,), default=-1, 1
+        Corners of the box, the same for every coordinate or per coordinate.
+    space : {"intrinsic", "ambient"}, default="ambient"
+        See :class:`Noise`.
+    """
+
+    def __init__(self, fraction, low=-1.0, high=1.0, space="ambient"):
+        assert 0 <= fraction <= 1, "fraction should be between 0 and 1."
+        super().__init__(space)
+        self.fraction = fraction
+        self.low = low
+        self.high = high
+
+    def apply(self, data, rng, normals=None):
+        # The points are drawn from their own stream, seeded before the
+        # coins, so that both are drawn in row order from a fixed start
+        points_rng = np.random.default_rng(rng.integers(2**63))
+        rows = np.flatnonzero(rng.random(len(data)) < self.fraction)
+        low = _scaled(self.low, np.float64)
+        points = points_rng.random((len(rows), data.shape[1]))
+        points *= _scaled(self.high, np.float64) - low
+        points += low
+        data[rows] = points
+        return data
+
+
+class AlongNormals(Noise):
+    """Noise moving each point along the normal of the shape at that point.
+
+    The points stay on the normal lines of the shape, e.g. they are spread
+    radially around a sphere. Only shapes of codimension one have normals,
+    see :meth:`tadasets.Shape.normals`.
+
+    Inputs
+    ------
+    scale : float
+        Standard deviation of the displacement, or its scale with ``df``.
+    df : float, optional
+        If given, the displacement follows Student's t distribution with
+        ``df`` degrees of freedom instead of a normal distribution.
+    """
+
+    needs_normals = True
+
+    def __init__(self, scale, df=None):
+        assert df is None or df > 0, "df should be positive."
+        super().__init__("intrinsic")
+        self.scale = scale
+        self.df = df
+
+    def apply(self, data, rng, normals=None):
+        if self.df is None:
+            t = rng.standard_normal(len(data), dtype=data.dtype)
+        else:
+            t = rng.standard_t(self.df, len(data)).astype(data.dtype, copy=False)
+        t *= self.scale
+        data += t[:, None] * normals
+        return data
+
+
+#: What the ``noise`` argument of the shapes accepts.
+NoiseLike = Union[float, Noise, Sequence[Noise]]
+
+
+def noise_models(noise):
+    """The tuple of models described by the ``noise`` argument of a shape.
+
+    None and 0 give no model and a number gives isotropic :class:`Gaussian`
+    noise in the intrinsic space.
+    """
+    if noise is None:
+        return ()
+    if isinstance(noise, Noise):
+        return (noise,)
+    if np.ndim(noise) == 0:
+        return (Gaussian(noise),) if noise else ()
+    models = tuple(noise)
+    assert all(isinstance(m, Noise) for m in models), (
+        "noise should be a number, a Noise or a list of Noise models."
+    )
+    return models
+
+
+def add_noise(models, data, rngs, normals=None):
+    """Apply ``models`` to ``data`` in place, in turn, drawing from ``rngs``."""
+    for model, rng in zip(models, rngs):
+        data = model.apply(data, rng, normals)
+    return data
+
+
+__all__ = ["Noise", "Gaussian", "StudentT", "Outliers", "AlongNormals"]
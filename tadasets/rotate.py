@@ -9,15 +9,57 @@ def get_phi(row):
     return np.arctan2(row[0], row[1])
 
 
-def rotate_2D(d, angle):
+def _plane_rotation(x, y, angle, out, i, j, mirror=False):
+    """Write the rotation of the columns ``x`` and ``y`` by ``angle`` into ``out[..., i]`` and ``out[..., j]``.
+
+    ``angle`` is a scalar or a 1-D array of ``k`` angles, in which case ``out``
+    has a leading axis of length ``k``. With ``mirror``, ``y`` is negated
+    before rotating.
+    """
+    angle = np.asarray(angle, dtype=float)
+    c = np.cos(angle)[..., None]
+    s = np.sin(angle)[..., None]
+    # out_i = a * x + b * y, out_j = e * x + f * y
+    a, b, e, f = (c, s, s, -c) if mirror else (c, -s, s, c)
+
+    # The columns of ``out`` may alias ``x`` and ``y``
+    x = x.copy()
+    np.multiply(a, x, out=out[..., i])
+    out[..., i] += b * y
+    np.multiply(f, y, out=out[..., j])
+    out[..., j] += e * x
+    return out
+
+
+def _prepare_out(data, angle, out):
+    angle = np.asarray(angle, dtype=float)
+    assert angle.ndim <= 1, "angle should be a scalar or a 1-D array of angles."
+    shape = angle.shape + data.shape
+    if out is None:
+        # Floating point input keeps its precision, integers become float64
+        out = np.empty(shape, dtype=np.result_type(data.dtype, np.float32))
+    assert out.shape == shape, "out has shape {}, but the data has shape {}.".format(
+        out.shape, shape
+    )
+    if out is not data:
+        out[...] = data
+    return out
+
+
+def rotate_2D(d, angle, out=None):
     """Rotate a 2-dimensional figure.
 
+    For backwards compatibility, the figure is mirrored in the x-axis before it
+    is rotated by ``angle``, as in earlier releases. The result is a single
+    broadcasted matrix product, so ``out=d`` rotates in place.
+
     Parameters
     ============
 
     d: the 2-dimensional data to rotate
-    angle: the angle (in radians) to rotate the data around 0
-    centered_around_zero: Boolean specifying whether the data is centered around zero.
+    angle: the angle (in radians) to rotate the data around 0, or a 1-D array of
+        ``k`` angles to get a ``(k, n, 2)`` array of rotated copies
+    out: optional array of the shape of the result to write into
     """
     try:
         assert d.shape[1] == 2
@@ -26,11 +68,38 @@ def rotate_2D(d, angle):
             "Error: data has {} dimensions, but should only be 2. ".format(d.shape[1])
         )
 
-    rot = angle - np.pi / 2
-    phis = np.apply_along_axis(get_phi, 1, d)
-    phi_new = phis + rot
-    r = np.sqrt(d[:, 0] ** 2 + d[:, 1] ** 2)
+    out = _prepare_out(d, angle, out)
+    return _plane_rotation(d[:, 0], d[:, 1], angle, out, 0, 1, mirror=True)
+
+
+def givens(data, angle, i=0, j=1, out=None):
+    """Rotate data in the plane spanned by coordinates ``i`` and ``j``.
+
+    Coordinate ``i`` is rotated towards coordinate ``j``, other coordinates are
+    left unchanged.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        An ``(n, D)`` array of points.
+    angle : float or array-like
+        Angle in radians, or a 1-D array of ``k`` angles to get a ``(k, n, D)``
+        array of rotated copies.
+    i, j : int, default=0, 1
+        The two coordinates spanning the plane of rotation.
+    out : np.ndarray, optional
+        Array of the shape of the result to write into. ``out=data`` rotates
+        in place.
+
+    Returns
+    -------
+    data : np.ndarray
+        An ``(n, D)`` or ``(k, n, D)`` np.ndarray.
+    """
+    assert data.ndim == 2, "data should be an (n, D) array."
+    assert i != j, "i and j should be different coordinates."
+    out = _prepare_out(data, angle, out)
+    return _plane_rotation(data[:, i], data[:, j], angle, out, i, j)
+
 
-    x = r * np.cos(phi_new)
-    y = r * np.sin(phi_new)
-    return np.concatenate((x.reshape(-1, 1), y.reshape(-1, 1)), axis=1)
+__all__ = ["rotate_2D", "givens"]
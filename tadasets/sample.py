@@ -3,14 +3,318 @@ Methods for constructing point clouds from meshes.
 
 """
 
+import functools
+
 import numpy as np
 
+from ._blocks import BLOCK_SIZE, _child, check_out, root_seed, run_tasks
+
+
+def _alias_table(weights):
+    """Build a Walker alias table for sampling indices proportionally to ``weights``.
+
+    The table is built without Python loops: larges are consumed in order and
+    each small is aliased to the large whose cumulative surplus covers the
+    start of its cumulative deficit.
 
-def from_mesh(vertices, triangles, n=1000):
+    Returns
+    -------
+    prob : np.ndarray (m,)
+        Probability of keeping the drawn column.
+    alias : np.ndarray (m,)
+        Index to use when the drawn column is rejected.
+    """
+    m = len(weights)
+    q = weights * (m / np.sum(weights))
+    prob = np.ones(m)
+    alias = np.arange(m)
+
+    small = np.flatnonzero(q < 1)
+    large = np.flatnonzero(q >= 1)
+    if len(small) == 0 or len(large) == 0:
+        return prob, alias
+
+    deficit = 1 - q[small]
+    D = np.cumsum(deficit)
+    E = np.cumsum(q[large] - 1)
+
+    # Each small is covered by the large that is active when its deficit starts
+    j = np.searchsorted(E, D - deficit, side="right")
+    np.minimum(j, len(large) - 1, out=j)
+    prob[small] = q[small]
+    alias[small] = large[j]
+
+    # A large overshoots by the part of the straddling deficit beyond its
+    # surplus; the overshoot is covered by the next large.
+    k = np.searchsorted(D, E[:-1], side="right")
+    np.minimum(k, len(small) - 1, out=k)
+    straddle = D[k] - deficit[k] < E[:-1]
+    over = np.where(straddle, D[k] - E[:-1], 0)
+    prob[large[:-1]] = np.clip(1 - over, 0, 1)
+    alias[large[:-1]] = large[1:]
+
+    return prob, alias
+
+
+class MeshSampler:
+    """Prepared sampler drawing points uniformly by area on a triangle mesh.
+
+    Face areas, the corners of each face and an alias table over the faces
+    are computed once, so each draw costs O(1) per point regardless of the
+    number of faces. Points are drawn in blocks of ``BLOCK_SIZE`` rows, each
+    with its own random stream derived from the seed, so blocks can be sampled
+    by several threads.
+
+    Inputs
+    -------
+    vertices : ndarray (N, 3)
+        Array of points in 3D
+    triangles : ndarray (M, 3)
+        Array of triangles connecting points, pointing to vertex indices
+    """
+
+    #: Number of points computed at a time by :meth:`sample`, small enough
+    #: for the temporaries of a chunk to stay in cache.
+    CHUNK_SIZE = 4096
+
+    def __init__(self, vertices, triangles):
+        vertices = np.asarray(vertices)
+        triangles = np.asarray(triangles)
+        assert vertices.shape[1] == 3
+        assert triangles.shape[1] == 3
+
+        # Compute cross product of all face triangles and use to compute
+        # areas (very similar to code used to compute vertex normals)
+        P0 = vertices[triangles[:, 0], :]
+        FNormals = np.cross(
+            vertices[triangles[:, 1], :] - P0, vertices[triangles[:, 2], :] - P0
+        )
+        FAreas = np.sqrt(np.sum(FNormals**2, 1)).flatten()
+
+        # Get rid of zero area faces
+        faces = np.flatnonzero(FAreas > 0)
+        assert len(faces) > 0, "Mesh has no triangles with positive area."
+
+        self.faces = faces
+        self.areas = 0.5 * FAreas[faces]
+        self.vertices = vertices
+        self.triangles = triangles[faces]
+        # The three corners of each face side by side, so a point reads
+        # one contiguous record of its face
+        self.corners = np.ascontiguousarray(
+            vertices[self.triangles], dtype=np.result_type(vertices, np.float64)
+        )
+        self._face_normals = FNormals[faces]
+
+        self.prob, self.alias = _alias_table(self.areas)
+        self._cast = {}
+
+    @functools.cached_property
+    def normals(self):
+        """Unit vertex normals, the sum of the normals of the faces around each vertex.
+
+        The normals of the faces are weighted by their area.
+        """
+        VNormals = np.zeros((len(self.vertices), 3))
+        for k in range(3):
+            np.add.at(VNormals, self.triangles[:, k], self._face_normals)
+        norms = np.sqrt(np.sum(VNormals**2, 1))
+        VNormals /= np.where(norms > 0, norms, 1)[:, None]
+        return VNormals
+
+    def _geometry(self, dtype, normals=False):
+        """Corners, or normals at the corners, of the faces in ``dtype``, cast once."""
+        dtype = np.dtype(dtype)
+        key = (dtype, normals)
+        if key not in self._cast:
+            if normals:
+                corners = self.normals[self.triangles]
+            else:
+                corners = self.corners
+            self._cast[key] = corners.astype(dtype, copy=False)
+        return self._cast[key]
+
+    def _draw(self, n, rng, dtype=np.float64):
+        """Draw face indices (into the positive-area faces) and barycentric coordinates.
+
+        The uniforms are always drawn in double precision, since single
+        precision cannot resolve the faces of large meshes. A point ``(u, v)``
+        of the unit square beyond the diagonal is folded back onto the
+        triangle ``u + v <= 1``, so each uniform pair gives one point. The
+        barycentric coordinates are returned in ``dtype``.
+        """
+        U = rng.random((n, 3))
+
+        # One uniform picks both the alias column and the coin flip
+        x = U[:, 0] * len(self.prob)
+        col = x.astype(np.int64)
+        np.minimum(col, len(self.prob) - 1, out=col)
+        x -= col
+        tidx = np.where(x < self.prob[col], col, self.alias[col])
+
+        # Fold the square onto the triangle, one contiguous row per coordinate
+        bary = U.T.copy()
+        w, u, v = bary
+        np.add(u, v, out=w)
+        fold = w > 1
+        np.subtract(1, u, out=u, where=fold)
+        np.subtract(1, v, out=v, where=fold)
+        # 1 - u - v, which is w - 1 when folded
+        np.subtract(1, w, out=w)
+        np.abs(w, out=w)
+        return tidx, bary.astype(dtype, copy=False).T
+
+    def _interpolate(self, tidx, bary, dtype, out=None, normals=False):
+        # One gather of the three corners of each face
+        corners = np.take(self._geometry(dtype, normals), tidx, axis=0)
+        return np.einsum("ij,ijk->ik", bary, corners, out=out)
+
+    def sample(
+        self,
+        n,
+        seed=None,
+        return_faces=False,
+        return_barycentric=False,
+        out=None,
+        workers=None,
+        dtype=np.float64,
+        return_normals=False,
+    ):
+        """Sample ``n`` points by area on the mesh.
+
+        Points are computed in chunks of ``CHUNK_SIZE`` and written straight
+        into ``out``, so the temporaries stay small for any ``n`` and the
+        memory is the output arrays alone.
+
+        Inputs
+        ------
+        n : int
+            Number of points to sample
+        seed : int or np.random.Generator, optional
+            Seed for random state. Pass a Generator to draw many batches
+            from a single stream.
+        return_faces : bool, default=False
+            If True, also return the index into ``triangles`` of the face
+            each point was sampled from.
+        return_barycentric : bool, default=False
+            If True, also return the ``(n, 3)`` barycentric coordinates of each
+            point with respect to the vertices of its face.
+        out : ndarray (n, 3), optional
+            Array to write the points into, e.g. a ``np.memmap``.
+        workers : int, optional
+            Number of threads sampling blocks of points, -1 for all CPUs. The
+            points are the same for any number of workers.
+        dtype : dtype, default=np.float64
+            Floating point type of the points, barycentric coordinates and
+            normals.
+        return_normals : bool, default=False
+            If True, also return the ``(n, 3)`` unit normals at the points,
+            interpolated from the :attr:`normals` of the vertices of their face.
+
+        Returns
+        -------
+        data : NDArray (n, 3) array of sampled points
+        faces : NDArray (n,) array of face indices, if ``return_faces``
+        barycentric : NDArray (n, 3) array, if ``return_barycentric``
+        normals : NDArray (n, 3) array, if ``return_normals``
+        """
+        root = root_seed(seed)
+        out = check_out(out, (n, 3), dtype)
+        faces = np.empty(n, dtype=np.int64) if return_faces else None
+        barycentric = np.empty((n, 3), dtype=dtype) if return_barycentric else None
+        normals = np.empty((n, 3), dtype=dtype) if return_normals else None
+        if return_normals:
+            # Computed once here rather than by every thread
+            self._geometry(dtype, normals=True)
+
+        def task(k):
+            rng = np.random.default_rng(_child(root, 1, k, 0))
+            stop = min((k + 1) * BLOCK_SIZE, n)
+            for start in range(k * BLOCK_SIZE, stop, self.CHUNK_SIZE):
+                end = min(start + self.CHUNK_SIZE, stop)
+                tidx, bary = self._draw(end - start, rng, dtype)
+                self._interpolate(tidx, bary, dtype, out[start:end])
+                if return_faces:
+                    faces[start:end] = self.faces[tidx]
+                if return_barycentric:
+                    barycentric[start:end] = bary
+                if return_normals:
+                    N = self._interpolate(tidx, bary, dtype, normals[start:end], True)
+                    norms = np.sqrt(np.einsum("ij,ij->i", N, N))
+                    N /= np.where(norms > 0, norms, 1)[:, None]
+
+        run_tasks(
+            [functools.partial(task, k) for k in range(-(-n // BLOCK_SIZE))], workers
+        )
+
+        if not (return_faces or return_barycentric or return_normals):
+            return out
+
+        result = (out,)
+        if return_faces:
+            result += (faces,)
+        if return_barycentric:
+            result += (barycentric,)
+        if return_normals:
+            result += (normals,)
+        return result
+
+    def iter_samples(
+        self,
+        chunk,
+        n=None,
+        seed=None,
+        return_faces=False,
+        return_barycentric=False,
+        return_normals=False,
+    ):
+        """Yield batches of ``chunk`` points sampled by area on the mesh.
+
+        Inputs
+        ------
+        chunk : int
+            Number of points in each batch.
+        n : int, optional
+            Total number of points. The last batch holds the remainder. If None,
+            batches are generated indefinitely.
+        seed : int or np.random.Generator, optional
+            Seed for random state.
+        return_faces, return_barycentric, return_normals : bool, default=False
+            See :meth:`sample`.
+        """
+        assert chunk > 0, "chunk must be positive"
+        rng = np.random.default_rng(seed)
+        remaining = n
+        while remaining is None or remaining > 0:
+            m = chunk if remaining is None else min(chunk, remaining)
+            yield self.sample(
+                m,
+                seed=rng,
+                return_faces=return_faces,
+                return_barycentric=return_barycentric,
+                return_normals=return_normals,
+            )
+            if remaining is not None:
+                remaining -= m
+
+
+def from_mesh(
+    vertices,
+    triangles,
+    n=1000,
+    seed=None,
+    out=None,
+    workers=None,
+    dtype=np.float64,
+    return_faces=False,
+    return_normals=False,
+):
     """
     Randomly sample points by area on a triangle mesh.  This function is
     extremely fast by using broadcasting/numpy operations in lieu of loops
 
+    Use :class:`MeshSampler` directly when drawing repeatedly from the same mesh.
+
     Inputs
     -------
     vertices : ndarray (N, 3)
@@ -19,109 +323,37 @@ def from_mesh(vertices, triangles, n=1000):
         Array of triangles connecting points, pointing to vertex indices
     n : int
         Number of points to sample
+    seed : int or np.random.Generator, optional
+        Seed for random state.
+    out : ndarray (n, 3), optional
+        Array to write the points into, e.g. a ``np.memmap``.
+    workers : int, optional
+        Number of threads sampling blocks of points, -1 for all CPUs.
+    dtype : dtype, default=np.float64
+        Floating point type of the points, e.g. ``np.float32``.
+    return_faces : bool, default=False
+        If True, also return the index into ``triangles`` of the face each
+        point was sampled from.
+    return_normals : bool, default=False
+        If True, also return the unit normals at the points, interpolated
+        from the area-weighted normals of the vertices.
 
     Returns
     -------
     data : NDArray (n, 3) array of sampled points
+    faces : NDArray (n,) array of face indices, if ``return_faces``
+    normals : NDArray (n, 3) array of unit normals, if ``return_normals``
 
     """
-
-    assert vertices.shape[1] == 3
-    assert triangles.shape[1] == 3
-
-    # Step 1: Compute cross product of all face triangles and use to compute
-    # areas (very similar to code used to compute vertex normals)
-
-    # Vectors spanning two triangle edges
-    P0 = vertices[triangles[:, 0], :]
-    P1 = vertices[triangles[:, 1], :]
-    P2 = vertices[triangles[:, 2], :]
-    V1 = P1 - P0
-    V2 = P2 - P0
-    FNormals = np.cross(V1, V2)
-    # import pdb; pdb.set_trace()
-    FAreas = np.sqrt(np.sum(FNormals**2, 1)).flatten()
-
-    # Get rid of zero area faces and update points
-    triangles = triangles[FAreas > 0, :]
-    FNormals = FNormals[FAreas > 0, :]
-    FAreas = FAreas[FAreas > 0]
-    P0 = vertices[triangles[:, 0], :]
-    P1 = vertices[triangles[:, 1], :]
-    P2 = vertices[triangles[:, 2], :]
-
-    # Compute normals
-    NTris = triangles.shape[0]
-    FNormals = FNormals / FAreas[:, None]
-    FAreas = 0.5 * FAreas
-    FNormals = FNormals
-    # VNormals = np.zeros_like(vertices)
-    VAreas = np.zeros(vertices.shape[0])
-    for k in range(3):
-        # VNormals[triangles[:, k], :] += FAreas[:, None] * FNormals
-        VAreas[triangles[:, k]] += FAreas
-
-    # Normalize normals
-    VAreas[VAreas == 0] = 1
-    # VNormals = VNormals / VAreas[:, None]
-
-    # Step 2: Randomly sample points based on areas
-    FAreas = FAreas / np.sum(FAreas)
-    AreasC = np.cumsum(FAreas)
-    samples = np.sort(np.random.rand(n))
-
-    # Figure out how many samples there are for each face
-    FSamples = np.zeros(NTris, np.int64)
-    fidx = 0
-    for s in samples:
-        while s > AreasC[fidx]:
-            fidx += 1
-        FSamples[fidx] += 1
-
-    # Now initialize an array that stores the triangle sample indices
-    tidx = np.zeros(n, dtype=np.int64)
-    idx = 0
-    for i in range(len(FSamples)):
-        tidx[idx : idx + FSamples[i]] = i
-        idx += FSamples[i]
-    # N = np.zeros((n, 3))  # Allocate space for normals
-    idx = 0
-
-    # Vector used to determine if points need to be flipped across parallelogram
-    V3 = P2 - P1
-    V3 = V3 / np.sqrt(np.sum(V3**2, 1))[:, None]  # Normalize
-
-    # Randomly sample points on each face
-    # Generate random points uniformly in parallelogram
-    u = np.random.rand(n, 1)
-    v = np.random.rand(n, 1)
-    Ps = u * V1[tidx, :] + P0[tidx, :]
-    Ps += v * V2[tidx, :]
-
-    # Flip over points which are on the other side of the triangle
-    dP = Ps - P1[tidx, :]
-    proj = np.sum(dP * V3[tidx, :], 1)
-    dPPar = V3[tidx, :] * proj[:, None]  # Parallel project onto edge
-    dPPerp = dP - dPPar
-    Qs = Ps - dPPerp
-    dP0QSqr = np.sum((Qs - P0[tidx, :]) ** 2, 1)
-    dP0PSqr = np.sum((Ps - P0[tidx, :]) ** 2, 1)
-    idxreg = np.arange(n, dtype=np.int64)
-    idxflip = idxreg[dP0QSqr < dP0PSqr]
-    u[idxflip, :] = 1 - u[idxflip, :]
-    v[idxflip, :] = 1 - v[idxflip, :]
-    Ps[idxflip, :] = (
-        P0[tidx[idxflip], :]
-        + u[idxflip, :] * V1[tidx[idxflip], :]
-        + v[idxflip, :] * V2[tidx[idxflip], :]
+    return MeshSampler(vertices, triangles).sample(
+        n,
+        seed=seed,
+        out=out,
+        workers=workers,
+        dtype=dtype,
+        return_faces=return_faces,
+        return_normals=return_normals,
     )
 
-    # # Step 3: Compute normals of sampled points by barycentric interpolation
-    # Ns = u * VNormals[triangles[tidx, 1], :]
-    # Ns += v * VNormals[triangles[tidx, 2], :]
-    # Ns += (1 - u - v) * VNormals[triangles[tidx, 0], :]
-
-    return Ps
-
 
-__all__ = ["from_mesh"]
+__all__ = ["from_mesh", "MeshSampler"]
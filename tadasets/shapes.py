@@ -1,25 +1,51 @@
 import numpy as np
-from .dimension import embed
+import numpy.typing as npt
+from ._qmc import LowDiscrepancy
+from .base import LazyDataset, Shape, get_shape, register_shape
+from .curves import ClosedCurve
+from .noise import NoiseLike
 from .rotate import rotate_2D
-from typing import Optional
-
-__all__ = ["torus", "dsphere", "sphere", "swiss_roll", "infty_sign", "eyeglasses"]
-
-
-# TODO: Make a base class that controls `ambient` and `noise`.
-# class Shape:
-# def __init__(self):
-# pass
+from .surface import sample_parameters
+from typing import Iterator, Optional, Tuple, Union
+
+__all__ = [
+    "torus",
+    "dsphere",
+    "sphere",
+    "swiss_roll",
+    "infty_sign",
+    "eyeglasses",
+    "circular_arcs",
+    "bouquet",
+    "circle_chain",
+    "stream",
+    "batch",
+    "lazy",
+    "DSphere",
+    "Sphere",
+    "Torus",
+    "SwissRoll",
+    "InftySign",
+    "Eyeglasses",
+    "CircularArcs",
+    "Bouquet",
+    "CircleChain",
+]
 
 
 def dsphere(
     n: int = 100,
     d: int = 2,
     r: float = 1,
-    noise: Optional[float] = None,
+    noise: Optional[NoiseLike] = None,
     ambient: Optional[int] = None,
     seed: Optional[int] = None,
-) -> np.ndarray:
+    out: Optional[np.ndarray] = None,
+    workers: Optional[int] = None,
+    dtype: npt.DTypeLike = np.float64,
+    return_params: bool = False,
+    sampling: str = "random",
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
     """
     Sample ``n`` data points on a ``d``-sphere.
 
@@ -31,43 +57,63 @@ def dsphere(
         Intrinsic dimension of ``d``-sphere.
     r : float, default=1
         Radius of sphere.
-    noise : float, optional
-        Standard deviation of normally distributed noise added to data.
+    noise : float, Noise or list of Noise, optional
+        Standard deviation of normally distributed noise added to data,
+        or noise models from :mod:`tadasets.noise` applied in turn.
     ambient : int, optional
         Embed the sphere into a space with ambient dimension equal to `ambient`. The sphere is randomly rotated in this high dimensional space.
     seed : int, optional
         Seed for random state.
+    out : np.ndarray, optional
+        Array to write the data into, e.g. a ``np.memmap``. Must have the shape
+        of the returned data.
+    workers : int, optional
+        Number of threads generating the data, -1 for all CPUs. The data is the
+        same for any number of workers.
+    dtype : dtype, default=np.float64
+        Floating point type of the data, e.g. ``np.float32``. The random draws
+        are made in this precision.
+    return_params : bool, default=False
+        If True, also return the points on the unit sphere, the coordinates
+        taken by :func:`tadasets.geodesic_distances`.
+    sampling : {"random", "sobol", "halton"}, default="random"
+        Draw the parameters at random or from a scrambled Sobol or Halton
+        sequence, which covers the shape more evenly with fewer points.
 
     Returns
     -------
     data : np.ndarray
         An ``(n,ambient)`` np.ndarray if ``ambient`` is specifed or
         a ``(n,d+1)`` np.ndarray otherwise.
+    params : np.ndarray, if ``return_params``
+        The intrinsic coordinates, an ``(n,d+1)`` np.ndarray.
     """
-    rng = np.random.default_rng(seed)
-    data = rng.standard_normal((n, d + 1))
-
-    # Normalize points to the sphere
-    data = r * data / np.sqrt(np.sum(data**2, 1)[:, None])
-
-    if noise:
-        data += noise * rng.standard_normal(data.shape)
-
-    if ambient:
-        assert ambient > d, "Must embed in higher dimensions"
-        data = embed(data, ambient)
-
-    return data
+    return DSphere(d=d, r=r).generate(
+        n,
+        noise=noise,
+        ambient=ambient,
+        seed=seed,
+        out=out,
+        workers=workers,
+        dtype=dtype,
+        return_params=return_params,
+        sampling=sampling,
+    )
 
 
 def sphere(
     n: int = 100,
     r: float = 1.0,
-    noise: Optional[float] = None,
+    noise: Optional[NoiseLike] = None,
     ambient: Optional[int] = None,
     seed: Optional[int] = None,
     uniform: bool = False,
-) -> np.ndarray:
+    out: Optional[np.ndarray] = None,
+    workers: Optional[int] = None,
+    dtype: npt.DTypeLike = np.float64,
+    return_params: bool = False,
+    sampling: str = "random",
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
     """
         Sample ``n`` data points on a sphere.
 
@@ -77,59 +123,75 @@ def sphere(
         Number of data points in shape.
     r : float, default=1
         Radius of sphere.
-    noise : float, optional
-        Standard deviation of normally distributed noise added to data.
+    noise : float, Noise or list of Noise, optional
+        Standard deviation of normally distributed noise added to data,
+        or noise models from :mod:`tadasets.noise` applied in turn.
     ambient : int, optional
         Embed the sphere into a space with ambient dimension equal to `ambient`. The sphere is randomly rotated in this high dimensional space.
     seed : int, optional
         Seed for random state.
     uniform : bool, default=False
         If True, sample points uniformly on the sphere. If False, sample points by choosing spherical coordinates uniformly.
+    out : np.ndarray, optional
+        Array to write the data into, e.g. a ``np.memmap``. Must have the shape
+        of the returned data.
+    workers : int, optional
+        Number of threads generating the data, -1 for all CPUs. The data is the
+        same for any number of workers.
+    dtype : dtype, default=np.float64
+        Floating point type of the data, e.g. ``np.float32``. The random draws
+        are made in this precision.
+    return_params : bool, default=False
+        If True, also return the points on the unit sphere, see
+        :func:`tadasets.geodesic_distances`.
+    sampling : {"random", "sobol", "halton"}, default="random"
+        Draw the parameters at random or from a scrambled Sobol or Halton
+        sequence, which covers the shape more evenly with fewer points.
 
     Returns
     -------
     data : np.ndarray
         An ``(n,3)`` np.ndarray.
+    params : np.ndarray, if ``return_params``
+        The intrinsic coordinates, an ``(n,3)`` np.ndarray.
     """
 
-    rng = np.random.default_rng(seed)
-
-    if uniform:
-        data = rng.standard_normal((n, 3))
-        data = r * data / np.sqrt(np.sum(data**2, 1)[:, None])
-
-    else:
-        theta = rng.random(n) * 2.0 * np.pi
-        phi = rng.random(n) * np.pi
-        rad = np.ones((n,)) * r
-
-        data = np.zeros((n, 3))
-
-        data[:, 0] = rad * np.cos(theta) * np.cos(phi)
-        data[:, 1] = rad * np.cos(theta) * np.sin(phi)
-        data[:, 2] = rad * np.sin(theta)
-
-    if noise:
-        data += noise * rng.standard_normal(data.shape)
-
-    if ambient:
-        data = embed(data, ambient)
-
-    return data
+    return Sphere(r=r, uniform=uniform).generate(
+        n,
+        noise=noise,
+        ambient=ambient,
+        seed=seed,
+        out=out,
+        workers=workers,
+        dtype=dtype,
+        return_params=return_params,
+        sampling=sampling,
+    )
 
 
 def torus(
     n: int = 100,
     c: float = 2.0,
     a: float = 1.0,
-    noise: Optional[float] = None,
+    noise: Optional[NoiseLike] = None,
     ambient: Optional[int] = None,
     seed: Optional[int] = None,
     uniform: bool = False,
-) -> np.ndarray:
+    out: Optional[np.ndarray] = None,
+    workers: Optional[int] = None,
+    dtype: npt.DTypeLike = np.float64,
+    return_params: bool = False,
+    flat: bool = False,
+    sampling: str = "random",
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
     """
     Sample ``n`` data points on a torus.
 
+    With ``flat=True`` the torus is the flat (Clifford) torus
+    ``(c cos(phi), c sin(phi), a cos(theta), a sin(theta))`` in 4 dimensions.
+    It is the product of two circles, so its geodesic distances are known in
+    closed form, while those of the torus in 3 dimensions are not.
+
     Parameters
     -----------
     n : int, default=100
@@ -138,66 +200,68 @@ def torus(
         Distance from center to center of tube.
     a : float, default=1.0
         Radius of tube.
-    noise: float, optional
-        Standard deviation of normally distributed noise added to data.
+    noise: float, Noise or list of Noise, optional
+        Standard deviation of normally distributed noise added to data,
+        or noise models from :mod:`tadasets.noise` applied in turn.
     ambient : int, optional
         Embed the torus into a space with ambient dimension equal to `ambient`. The torus is randomly rotated in this high dimensional space.
     seed : int, optional
         Seed for random state.
     uniform : bool, default=False
         If True, sample points uniformly on the torus. If False, sample points by choosing angles uniformly.
+        Both are the same on the flat torus.
+    out : np.ndarray, optional
+        Array to write the data into, e.g. a ``np.memmap``. Must have the shape
+        of the returned data.
+    workers : int, optional
+        Number of threads generating the data, -1 for all CPUs. The data is the
+        same for any number of workers.
+    dtype : dtype, default=np.float64
+        Floating point type of the data, e.g. ``np.float32``. The random draws
+        are made in this precision.
+    return_params : bool, default=False
+        If True, also return the angles ``(theta, phi)`` of the points
+        around the tube and around the center, see
+        :func:`tadasets.geodesic_distances`.
+    flat : bool, default=False
+        If True, sample the flat torus in 4 dimensions, see above.
+    sampling : {"random", "sobol", "halton"}, default="random"
+        Draw the parameters at random or from a scrambled Sobol or Halton
+        sequence, which covers the shape more evenly with fewer points.
 
     Returns
     -------
     data : np.ndarray
-        An ``(n,3)`` np.ndarray.
+        An ``(n,3)`` np.ndarray, or ``(n,4)`` if ``flat``.
+    params : np.ndarray, if ``return_params``
+        The intrinsic coordinates, an ``(n,2)`` np.ndarray.
     """
 
-    assert a <= c, "That's not a torus"
-
-    rng = np.random.default_rng(seed)
-    if uniform:
-        samples = []
-        while len(samples) < n:
-            u = np.random.uniform(0, 2 * np.pi)
-            v = np.random.uniform(0, 2 * np.pi)
-            x = (c + a * np.cos(v)) * np.cos(u)
-            y = (c + a * np.cos(v)) * np.sin(u)
-            z = a * np.sin(v)
-
-            # REJECTION SAMPLING TO ENSURE UNIFORMITY
-            # The map from u,v to x,y,z is not area-preserving, so we use rejection sampling to ensure uniformity
-            jacobian = a * (c + a * np.cos(v))
-            acceptance_prob = jacobian / (a * (c + a))
-            if np.random.uniform(0, 1) < acceptance_prob:
-                samples.append((x, y, z))
-        data = np.array(samples)
-
-    else:
-        theta = rng.random(n) * 2.0 * np.pi
-        phi = rng.random(n) * 2.0 * np.pi
-
-        data = np.zeros((n, 3))
-        data[:, 0] = (c + a * np.cos(theta)) * np.cos(phi)
-        data[:, 1] = (c + a * np.cos(theta)) * np.sin(phi)
-        data[:, 2] = a * np.sin(theta)
-
-    if noise:
-        data += noise * rng.standard_normal(data.shape)
-
-    if ambient:
-        data = embed(data, ambient)
-
-    return data
+    return Torus(c=c, a=a, uniform=uniform, flat=flat).generate(
+        n,
+        noise=noise,
+        ambient=ambient,
+        seed=seed,
+        out=out,
+        workers=workers,
+        dtype=dtype,
+        return_params=return_params,
+        sampling=sampling,
+    )
 
 
 def swiss_roll(
     n: int = 100,
     r: float = 10.0,
-    noise: Optional[float] = None,
+    noise: Optional[NoiseLike] = None,
     ambient: Optional[int] = None,
     seed: Optional[int] = None,
-) -> np.ndarray:
+    out: Optional[np.ndarray] = None,
+    workers: Optional[int] = None,
+    dtype: npt.DTypeLike = np.float64,
+    return_params: bool = False,
+    sampling: str = "random",
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
     """
     Sample `n` data points from a Swiss roll.
 
@@ -207,12 +271,28 @@ def swiss_roll(
         Number of data points in shape.
     r : float, default=10.0
         Length of roll.
-    noise: float, optional
-        Standard deviation of normally distributed noise added to data.
+    noise: float, Noise or list of Noise, optional
+        Standard deviation of normally distributed noise added to data,
+        or noise models from :mod:`tadasets.noise` applied in turn.
     ambient : int, optional
         Embed the swiss roll into a space with ambient dimension equal to `ambient`. The swiss roll is randomly rotated in this high dimensional space.
     seed : int, optional
         Seed for random state.
+    out : np.ndarray, optional
+        Array to write the data into, e.g. a ``np.memmap``. Must have the shape
+        of the returned data.
+    workers : int, optional
+        Number of threads generating the data, -1 for all CPUs. The data is the
+        same for any number of workers.
+    dtype : dtype, default=np.float64
+        Floating point type of the data, e.g. ``np.float32``. The random draws
+        are made in this precision.
+    return_params : bool, default=False
+        If True, also return the parameters ``(phi, psi)`` of the points
+        along and across the roll, see :func:`tadasets.geodesic_distances`.
+    sampling : {"random", "sobol", "halton"}, default="random"
+        Draw the parameters at random or from a scrambled Sobol or Halton
+        sequence, which covers the shape more evenly with fewer points.
 
     References
     ----------
@@ -222,31 +302,35 @@ def swiss_roll(
     -------
     data : np.ndarray
         An ``(n,3)`` np.ndarray.
+    params : np.ndarray, if ``return_params``
+        The intrinsic coordinates, an ``(n,2)`` np.ndarray.
     """
 
-    rng = np.random.default_rng(seed)
-    phi = (rng.random(n) * 3 + 1.5) * np.pi
-    psi = rng.random(n) * r
-
-    data = np.zeros((n, 3))
-    data[:, 0] = phi * np.cos(phi)
-    data[:, 1] = phi * np.sin(phi)
-    data[:, 2] = psi
-
-    if noise:
-        data += noise * rng.standard_normal(data.shape)
-
-    if ambient:
-        data = embed(data, ambient)
-
-    return data
+    return SwissRoll(r=r).generate(
+        n,
+        noise=noise,
+        ambient=ambient,
+        seed=seed,
+        out=out,
+        workers=workers,
+        dtype=dtype,
+        return_params=return_params,
+        sampling=sampling,
+    )
 
 
 def infty_sign(
     n: int = 100,
-    noise: Optional[float] = None,
+    noise: Optional[NoiseLike] = None,
     angle: Optional[float] = None,
     seed: Optional[int] = None,
+    ambient: Optional[int] = None,
+    uniform: bool = False,
+    spacing: str = "even",
+    out: Optional[np.ndarray] = None,
+    workers: Optional[int] = None,
+    dtype: npt.DTypeLike = np.float64,
+    sampling: str = "random",
 ) -> np.ndarray:
     """
     Construct a figure 8 or infinity sign with ``n`` points and noise level with ``noise`` standard deviation.
@@ -256,35 +340,51 @@ def infty_sign(
 
     n: int, default=100
         Number of data points in shape.
-    noise: float, optional
-        Standard deviation of normally distributed noise added to data.
+    noise: float, Noise or list of Noise, optional
+        Standard deviation of normally distributed noise added to data,
+        or noise models from :mod:`tadasets.noise` applied in turn.
     angle: float, optional
         Angle in radians to rotate the infinity sign.
     seed : int, optional
         Seed for random state.
+    ambient : int, optional
+        Embed the infinity sign into a space with ambient dimension equal to `ambient`.
+        The infinity sign is randomly rotated in this high dimensional space.
+    uniform : bool, default=False
+        If True, space the points by arc length. If False, space them by the
+        parameter ``t`` of ``(cos(t), sin(2t))``, so they are denser near the
+        crossing.
+    spacing : {"even", "random"}, default="even"
+        Whether the points are evenly spaced or drawn at random.
+    out : np.ndarray, optional
+        Array to write the data into, e.g. a ``np.memmap``. Must have the shape
+        of the returned data.
+    workers : int, optional
+        Number of threads generating the data, -1 for all CPUs. The data is the
+        same for any number of workers.
+    dtype : dtype, default=np.float64
+        Floating point type of the data, e.g. ``np.float32``. The random draws
+        are made in this precision.
+    sampling : {"random", "sobol", "halton"}, default="random"
+        Draw the parameters at random or from a scrambled Sobol or Halton
+        sequence, which covers the shape more evenly with fewer points.
 
     Returns
     -------
     data : np.ndarray
-        An ``(n,2)`` np.ndarray.
+        An ``(n,ambient)`` np.ndarray if ``ambient`` is specified or
+        an ``(n,2)`` np.ndarray otherwise.
     """
-    rng = np.random.default_rng(seed)
-    t = np.linspace(0, 2 * np.pi, n + 1)[0:n]
-    X = np.zeros((n, 2))
-    X[:, 0] = np.cos(t)
-    X[:, 1] = np.sin(2 * t)
-
-    if noise:
-        X += noise * rng.standard_normal((n, 2))
-    if angle is not None:
-        assert angle >= -np.pi and angle <= 2 * np.pi, (
-            "Angle {angle} not in range. Angle should be in the range {min_angle} <= angle <= {max_angle}".format(
-                angle=angle, min_angle="-pi", max_angle="2*pi"
-            )
-        )
-
-        X = rotate_2D(X, angle=angle)
-    return X
+    return InftySign(angle=angle, uniform=uniform, spacing=spacing).generate(
+        n,
+        noise=noise,
+        ambient=ambient,
+        seed=seed,
+        out=out,
+        workers=workers,
+        dtype=dtype,
+        sampling=sampling,
+    )
 
 
 def eyeglasses(
@@ -292,9 +392,13 @@ def eyeglasses(
     r1: float = 1.0,
     r2: Optional[float] = None,
     neck_size: Optional[float] = None,
-    noise: Optional[float] = None,
+    noise: Optional[NoiseLike] = None,
     ambient: Optional[int] = None,
     seed: Optional[int] = None,
+    out: Optional[np.ndarray] = None,
+    workers: Optional[int] = None,
+    dtype: npt.DTypeLike = np.float64,
+    sampling: str = "random",
 ) -> np.ndarray:
     """Sample ``n`` points on an eyeglasses shape.
 
@@ -308,13 +412,220 @@ def eyeglasses(
         The radius of the right half. If None, it is equal to `r1`.
     neck_size : float, optional
         The width of the neck.
-    noise : float, optional
-        Standard deviation of normally distributed noise added to data.
+    noise : float, Noise or list of Noise, optional
+        Standard deviation of normally distributed noise added to data,
+        or noise models from :mod:`tadasets.noise` applied in turn.
     ambient : int, optional
         Embed the eyeglasses shape into a space with ambient dimension equal to `ambient`.
         The eyeglasses shape is randomly rotated in this high dimensional space.
     seed : int, optional
         Seed for random state.
+    out : np.ndarray, optional
+        Array to write the data into, e.g. a ``np.memmap``. Must have the shape
+        of the returned data.
+    workers : int, optional
+        Number of threads generating the data, -1 for all CPUs. The data is the
+        same for any number of workers.
+    dtype : dtype, default=np.float64
+        Floating point type of the data, e.g. ``np.float32``. The random draws
+        are made in this precision.
+    sampling : {"random", "sobol", "halton"}, default="random"
+        Draw the parameters at random or from a scrambled Sobol or Halton
+        sequence, which covers the shape more evenly with fewer points.
+
+    Returns
+    -------
+    data : np.ndarray
+        An ``(n,ambient)`` np.ndarray if ``ambient`` is specified or
+        an ``(n,2)`` np.ndarray otherwise.
+    """
+    return Eyeglasses(r1=r1, r2=r2, neck_size=neck_size).generate(
+        n,
+        noise=noise,
+        ambient=ambient,
+        seed=seed,
+        out=out,
+        workers=workers,
+        dtype=dtype,
+        sampling=sampling,
+    )
+
+
+def circular_arcs(
+    n: int,
+    centers: np.ndarray,
+    radii: np.ndarray,
+    angles: np.ndarray,
+    noise: Optional[NoiseLike] = None,
+    ambient: Optional[int] = None,
+    seed: Optional[int] = None,
+    out: Optional[np.ndarray] = None,
+    workers: Optional[int] = None,
+    dtype: npt.DTypeLike = np.float64,
+    sampling: str = "random",
+) -> np.ndarray:
+    """Sample ``n`` points uniformly by arc length on a union of circular arcs.
+
+    Parameters
+    ----------
+    n : int
+        Number of points in shape.
+    centers : array-like (k, 2)
+        Centers of the circles the arcs lie on.
+    radii : array-like (k,)
+        Radii of the circles.
+    angles : array-like (k, 2)
+        Start and end angle in radians of each arc, counterclockwise. Use
+        ``(0, 2 * np.pi)`` for a full circle.
+    noise : float, Noise or list of Noise, optional
+        Standard deviation of normally distributed noise added to data,
+        or noise models from :mod:`tadasets.noise` applied in turn.
+    ambient : int, optional
+        Embed the shape into a space with ambient dimension equal to `ambient`.
+        The shape is randomly rotated in this high dimensional space.
+    seed : int, optional
+        Seed for random state.
+    out : np.ndarray, optional
+        Array to write the data into, e.g. a ``np.memmap``. Must have the shape
+        of the returned data.
+    workers : int, optional
+        Number of threads generating the data, -1 for all CPUs. The data is the
+        same for any number of workers.
+    dtype : dtype, default=np.float64
+        Floating point type of the data, e.g. ``np.float32``. The random draws
+        are made in this precision.
+    sampling : {"random", "sobol", "halton"}, default="random"
+        Draw the parameters at random or from a scrambled Sobol or Halton
+        sequence, which covers the shape more evenly with fewer points.
+
+    Returns
+    -------
+    data : np.ndarray
+        An ``(n,ambient)`` np.ndarray if ``ambient`` is specified or
+        an ``(n,2)`` np.ndarray otherwise.
+    """
+    return CircularArcs(centers, radii, angles).generate(
+        n,
+        noise=noise,
+        ambient=ambient,
+        seed=seed,
+        out=out,
+        workers=workers,
+        dtype=dtype,
+        sampling=sampling,
+    )
+
+
+def bouquet(
+    n: int = 100,
+    k: int = 3,
+    r: float = 1.0,
+    noise: Optional[NoiseLike] = None,
+    ambient: Optional[int] = None,
+    seed: Optional[int] = None,
+    out: Optional[np.ndarray] = None,
+    workers: Optional[int] = None,
+    dtype: npt.DTypeLike = np.float64,
+    sampling: str = "random",
+) -> np.ndarray:
+    """Sample ``n`` points on a bouquet of ``k`` circles.
+
+    The circles all touch at the origin and nowhere else, so the shape is a
+    wedge of ``k`` circles with ``k`` independent 1-cycles. They alternate
+    between the left and the right of the origin, with radii ``r``, ``r``,
+    ``2r``, ``2r``, ...
+
+    Parameters
+    ----------
+    n : int, default=100
+        Number of points in shape.
+    k : int, default=3
+        Number of circles.
+    r : float, default=1.0
+        Radius of the smallest circles.
+    noise : float, Noise or list of Noise, optional
+        Standard deviation of normally distributed noise added to data,
+        or noise models from :mod:`tadasets.noise` applied in turn.
+    ambient : int, optional
+        Embed the bouquet into a space with ambient dimension equal to `ambient`.
+        The bouquet is randomly rotated in this high dimensional space.
+    seed : int, optional
+        Seed for random state.
+    out : np.ndarray, optional
+        Array to write the data into, e.g. a ``np.memmap``. Must have the shape
+        of the returned data.
+    workers : int, optional
+        Number of threads generating the data, -1 for all CPUs. The data is the
+        same for any number of workers.
+    dtype : dtype, default=np.float64
+        Floating point type of the data, e.g. ``np.float32``. The random draws
+        are made in this precision.
+    sampling : {"random", "sobol", "halton"}, default="random"
+        Draw the parameters at random or from a scrambled Sobol or Halton
+        sequence, which covers the shape more evenly with fewer points.
+
+    Returns
+    -------
+    data : np.ndarray
+        An ``(n,ambient)`` np.ndarray if ``ambient`` is specified or
+        an ``(n,2)`` np.ndarray otherwise.
+    """
+    return Bouquet(k=k, r=r).generate(
+        n,
+        noise=noise,
+        ambient=ambient,
+        seed=seed,
+        out=out,
+        workers=workers,
+        dtype=dtype,
+        sampling=sampling,
+    )
+
+
+def circle_chain(
+    n: int = 100,
+    k: int = 3,
+    r: float = 1.0,
+    noise: Optional[NoiseLike] = None,
+    ambient: Optional[int] = None,
+    seed: Optional[int] = None,
+    out: Optional[np.ndarray] = None,
+    workers: Optional[int] = None,
+    dtype: npt.DTypeLike = np.float64,
+    sampling: str = "random",
+) -> np.ndarray:
+    """Sample ``n`` points on a chain of ``k`` circles along the x-axis.
+
+    Consecutive circles of radius ``r`` touch at one point.
+
+    Parameters
+    ----------
+    n : int, default=100
+        Number of points in shape.
+    k : int, default=3
+        Number of circles.
+    r : float, default=1.0
+        Radius of the circles.
+    noise : float, Noise or list of Noise, optional
+        Standard deviation of normally distributed noise added to data,
+        or noise models from :mod:`tadasets.noise` applied in turn.
+    ambient : int, optional
+        Embed the chain into a space with ambient dimension equal to `ambient`.
+        The chain is randomly rotated in this high dimensional space.
+    seed : int, optional
+        Seed for random state.
+    out : np.ndarray, optional
+        Array to write the data into, e.g. a ``np.memmap``. Must have the shape
+        of the returned data.
+    workers : int, optional
+        Number of threads generating the data, -1 for all CPUs. The data is the
+        same for any number of workers.
+    dtype : dtype, default=np.float64
+        Floating point type of the data, e.g. ``np.float32``. The random draws
+        are made in this precision.
+    sampling : {"random", "sobol", "halton"}, default="random"
+        Draw the parameters at random or from a scrambled Sobol or Halton
+        sequence, which covers the shape more evenly with fewer points.
 
     Returns
     -------
@@ -322,70 +633,638 @@ def eyeglasses(
         An ``(n,ambient)`` np.ndarray if ``ambient`` is specified or
         an ``(n,2)`` np.ndarray otherwise.
     """
-    rng = np.random.default_rng(seed)
-
-    if r2 is None:
-        r2 = r1
-    if neck_size is None:
-        neck_size = min(r1, r2)
-
-    assert neck_size < 2 * min(r1, r2), "Neck should be smaller than 2*min(r1,r2)."
-    half_neck = neck_size / 2
-
-    r_neck = min(r1, r2)
-
-    x_left = ((r_neck + r1) ** 2 - (r_neck + half_neck) ** 2) ** (
-        1 / 2
-    ) - r1  # x distance from left circle to neck
-    x_right = ((r_neck + r2) ** 2 - (r_neck + half_neck) ** 2) ** (1 / 2) - r2
-
-    alpha_1 = np.arcsin((r_neck + half_neck) / (r1 + r_neck))
-    alpha_2 = np.arcsin((r_neck + half_neck) / (r2 + r_neck))
-
-    centers = {
-        "l": [-r1 - x_left, 0],
-        "r": [x_right + r2, 0],
-        "t": [0, half_neck + r_neck],
-        "b": [0, -half_neck - r_neck],
-    }
-
-    radii = {"l": r1, "r": r2, "t": r_neck, "b": r_neck}
-
-    angle_ranges = {
-        "l": [alpha_1, 2 * np.pi - alpha_1],
-        "r": [-np.pi + alpha_2, np.pi - alpha_2],
-        "t": [np.pi + alpha_1, 2 * np.pi - alpha_2],
-        "b": [alpha_2, np.pi - alpha_1],
-    }
-
-    # compute how many points each circle will contain.
-    arc_lens = {
-        x: (angle_ranges[x][1] - angle_ranges[x][0]) * radii[x]
-        for x in ["l", "r", "t", "b"]
-    }
-    total_arc_len = sum(arc_lens.values())
-    probabilities = {x: arc_lens[x] / total_arc_len for x in ["l", "r", "t", "b"]}
-    positions = np.random.choice(
-        ["l", "r", "t", "b"], p=list(probabilities.values()), size=n
+    return CircleChain(k=k, r=r).generate(
+        n,
+        noise=noise,
+        ambient=ambient,
+        seed=seed,
+        out=out,
+        workers=workers,
+        dtype=dtype,
+        sampling=sampling,
     )
-    positions, counts = np.unique(positions, return_counts=True)
-    counts = {x: c for x, c in zip(positions, counts)}
-
-    data = []
-    for x in ["l", "r", "t", "b"]:
-        angles = rng.uniform(angle_ranges[x][0], angle_ranges[x][1], counts[x])
-        points = (
-            np.vstack((radii[x] * np.cos(angles), radii[x] * np.sin(angles))).T
-            + centers[x]
+
+
+def stream(
+    shape: Union[str, Shape],
+    n: int,
+    chunk: int,
+    noise: Optional[NoiseLike] = None,
+    ambient: Optional[int] = None,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    dtype: npt.DTypeLike = np.float64,
+    sampling: str = "random",
+    **params,
+) -> Iterator[np.ndarray]:
+    """
+    Yield the ``n`` points of a shape in arrays of ``chunk`` rows.
+
+    Only one chunk and one block of intrinsic points are held in memory at a
+    time. Concatenating the chunks gives exactly the array returned by the
+    shape function with the same arguments and seed.
+
+    Parameters
+    ----------
+    shape : str
+        Name of a registered shape, e.g. ``"torus"``, or a :class:`Shape`.
+    n : int
+        Number of data points in shape.
+    chunk : int
+        Number of rows in each yielded array. The last array holds the remainder.
+    noise : float, Noise or list of Noise, optional
+        Standard deviation of normally distributed noise added to data,
+        or noise models from :mod:`tadasets.noise` applied in turn.
+    ambient : int, optional
+        Embed the shape into a space with ambient dimension equal to `ambient`.
+    seed : int, optional
+        Seed for random state.
+    workers : int, optional
+        Number of threads generating each chunk, -1 for all CPUs.
+    dtype : dtype, default=np.float64
+        Floating point type of the data.
+    sampling : {"random", "sobol", "halton"}, default="random"
+        Draw the parameters at random or from a scrambled Sobol or Halton
+        sequence, which covers the shape more evenly with fewer points.
+    **params
+        Shape parameters, e.g. ``c`` and ``a`` for ``"torus"``.
+
+    Yields
+    ------
+    data : np.ndarray
+        A ``(chunk, D)`` np.ndarray.
+    """
+    blocks = get_shape(shape, **params).blocks(
+        n,
+        noise=noise,
+        ambient=ambient,
+        seed=seed,
+        workers=workers,
+        dtype=dtype,
+        sampling=sampling,
+    )
+    yield from blocks.stream(chunk)
+
+
+def batch(
+    shape: Union[str, Shape],
+    n: int,
+    replicates: int,
+    noise: Optional[NoiseLike] = None,
+    ambient: Optional[int] = None,
+    seed: Optional[int] = None,
+    out: Optional[np.ndarray] = None,
+    workers: Optional[int] = None,
+    dtype: npt.DTypeLike = np.float64,
+    sampling: str = "random",
+    **params,
+) -> np.ndarray:
+    """
+    Sample ``replicates`` independent copies of a shape in one pass.
+
+    The replicates use the streams ``np.random.SeedSequence(seed).spawn(replicates)``,
+    so replicate ``b`` can be regenerated on its own by passing the ``b``-th
+    spawned SeedSequence as ``seed`` to the shape function.
+
+    Parameters
+    ----------
+    shape : str
+        Name of a registered shape, e.g. ``"dsphere"``, or a :class:`Shape`.
+    n : int
+        Number of data points in each replicate.
+    replicates : int
+        Number of replicates.
+    noise : float, Noise or list of Noise, optional
+        Standard deviation of normally distributed noise added to data,
+        or noise models from :mod:`tadasets.noise` applied in turn.
+    ambient : int, optional
+        Embed the shape into a space with ambient dimension equal to `ambient`.
+    seed : int, optional
+        Seed for random state.
+    out : np.ndarray, optional
+        Array of shape ``(replicates, n, D)`` to write the data into.
+    workers : int, optional
+        Number of threads generating the data, -1 for all CPUs.
+    dtype : dtype, default=np.float64
+        Floating point type of the data.
+    sampling : {"random", "sobol", "halton"}, default="random"
+        Draw the parameters at random or from a scrambled Sobol or Halton
+        sequence, which covers the shape more evenly with fewer points.
+    **params
+        Shape parameters, e.g. ``d`` for ``"dsphere"``.
+
+    Returns
+    -------
+    data : np.ndarray
+        A ``(replicates, n, D)`` np.ndarray.
+    """
+    return get_shape(shape, **params).batch(
+        n,
+        replicates,
+        noise=noise,
+        ambient=ambient,
+        seed=seed,
+        out=out,
+        workers=workers,
+        dtype=dtype,
+        sampling=sampling,
+    )
+
+
+def lazy(
+    shape: Union[str, Shape],
+    n: int,
+    noise: Optional[NoiseLike] = None,
+    ambient: Optional[int] = None,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    dtype: npt.DTypeLike = np.float64,
+    sampling: str = "random",
+    **params,
+) -> LazyDataset:
+    """
+    The ``n`` points of a shape, computed only when they are indexed.
+
+    Slicing gives the same rows as the shape function with the same arguments
+    and seed, but only computes the blocks of rows that hold them, so shards
+    of a large dataset can be generated independently::
+
+        ds = tadasets.lazy("torus", n=10**9, ambient=50, seed=0)
+        shard = ds[9 * 10**8 :]  # or ds.shard(9, 10)
+
+    The first rows do not depend on ``n``: ``ds.resize(2 * n)[:n]`` equals
+    ``ds[:]``, except for curves with ``spacing="even"``.
+
+    Parameters
+    ----------
+    shape : str
+        Name of a registered shape, e.g. ``"torus"``, or a :class:`Shape`.
+    n : int
+        Number of data points in shape.
+    noise, ambient, seed, workers, dtype, sampling
+        See :func:`stream`.
+    **params
+        Shape parameters, e.g. ``c`` and ``a`` for ``"torus"``.
+
+    Returns
+    -------
+    data : LazyDataset
+        An ``(n, D)`` dataset supporting slices, integer and boolean arrays
+        of rows, ``np.asarray`` and :meth:`LazyDataset.shard`.
+    """
+    return get_shape(shape, **params).lazy(
+        n,
+        noise=noise,
+        ambient=ambient,
+        seed=seed,
+        workers=workers,
+        dtype=dtype,
+        sampling=sampling,
+    )
+
+
+def _great_circle(x, y, r):
+    """Distances on the sphere of radius ``r`` between unit vectors ``x`` and ``y``."""
+    cos = x @ y.T
+    np.clip(cos, -1, 1, out=cos)
+    cos = np.arccos(cos, out=cos)
+    cos *= r
+    return cos
+
+
+def _periodic(x, y, period=2 * np.pi):
+    """Distances between the angles ``x`` and ``y`` on a circle."""
+    d = np.abs(x[:, None] - y[None, :])
+    np.remainder(d, period, out=d)
+    return np.minimum(d, period - d, out=d)
+
+
+@register_shape
+class DSphere(Shape):
+    """A ``d``-sphere of radius ``r``, see :func:`dsphere`."""
+
+    name = "dsphere"
+
+    def __init__(self, d=2, r=1):
+        self.d = d
+        self.r = r
+
+    @property
+    def dim(self):
+        return self.d + 1
+
+    def sample_params(self, rng, start, stop, n, dtype=np.float64):
+        return rng.standard_normal((stop - start, self.d + 1), dtype=dtype)
+
+    def evaluate(self, params):
+        # Normalize points to the sphere
+        return params * (self.r / np.sqrt(np.sum(params**2, 1))[:, None])
+
+    def intrinsic(self, params):
+        # The points on the unit sphere
+        return params / np.sqrt(np.sum(params**2, 1))[:, None]
+
+    def normals(self, params):
+        return self.intrinsic(params)
+
+    def geodesic(self, x, y):
+        return _great_circle(x, y, self.r)
+
+
+@register_shape
+class Sphere(Shape):
+    """A sphere of radius ``r``, see :func:`sphere`."""
+
+    name = "sphere"
+    dim = 3
+
+    def __init__(self, r=1.0, uniform=False):
+        self.r = r
+        self.uniform = uniform
+
+    def sample_params(self, rng, start, stop, n, dtype=np.float64):
+        if self.uniform:
+            # (phi, z) -> (sqrt(1 - z^2) cos(phi), sqrt(1 - z^2) sin(phi), z) is
+            # area-preserving (Archimedes), so no rejection is needed.
+            return sample_parameters(
+                stop - start, [(0, 2 * np.pi), (-1, 1)], seed=rng, dtype=dtype
+            )
+
+        params = rng.random((stop - start, 2), dtype=dtype)
+        params[:, 0] *= 2.0 * np.pi
+        params[:, 1] *= np.pi
+        return params
+
+    def evaluate(self, params):
+        data = np.zeros((len(params), 3), dtype=params.dtype)
+
+        if self.uniform:
+            phi, z = params[:, 0], params[:, 1]
+            rho = self.r * np.sqrt(1 - z**2)
+
+            data[:, 0] = rho * np.cos(phi)
+            data[:, 1] = rho * np.sin(phi)
+            data[:, 2] = self.r * z
+
+        else:
+            theta, phi = params[:, 0], params[:, 1]
+
+            data[:, 0] = self.r * np.cos(theta) * np.cos(phi)
+            data[:, 1] = self.r * np.cos(theta) * np.sin(phi)
+            data[:, 2] = self.r * np.sin(theta)
+
+        return data
+
+    def intrinsic(self, params):
+        # The points on the unit sphere, the same for both parametrizations
+        return self.evaluate(params) / self.r
+
+    def normals(self, params):
+        return self.intrinsic(params)
+
+    def geodesic(self, x, y):
+        return _great_circle(x, y, self.r)
+
+
+@register_shape
+class Torus(Shape):
+    """A torus with tube radius ``a`` at distance ``c`` from the center, see :func:`torus`."""
+
+    name = "torus"
+
+    def __init__(self, c=2.0, a=1.0, uniform=False, flat=False):
+        assert a <= c, "That's not a torus"
+        self.c = c
+        self.a = a
+        self.uniform = uniform
+        self.flat = flat
+
+    @property
+    def dim(self):
+        return 4 if self.flat else 3
+
+    def area_element(self, params):
+        return self.a * (self.c + self.a * np.cos(params[:, 0]))
+
+    def tube_angle(self, u):
+        """Invert the distribution of ``theta`` of uniform points at ``u``.
+
+        The density of ``theta`` is proportional to ``c + a cos(theta)``, so
+        ``(c theta + a sin(theta)) / (2 pi c) = u`` is solved by Newton's
+        method, falling back to bisection when a step leaves the bracket.
+        """
+        c, a = self.c, self.a
+        target = 2 * np.pi * c * u
+        lo, hi = np.zeros_like(u), np.full_like(u, 2 * np.pi)
+        theta = 2 * np.pi * u
+        for _ in range(100):
+            f = c * theta + a * np.sin(theta) - target
+            if np.all(np.abs(f) <= 1e-12 * c):
+                break
+            lo = np.where(f < 0, theta, lo)
+            hi = np.where(f > 0, theta, hi)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                step = theta - f / (c + a * np.cos(theta))
+            theta = np.where((step > lo) & (step < hi), step, (lo + hi) / 2)
+        return theta
+
+    def sample_params(self, rng, start, stop, n, dtype=np.float64):
+        if self.uniform and not self.flat and isinstance(rng, LowDiscrepancy):
+            # Rejection would break the sequence, so theta is mapped through
+            # the inverse of its distribution instead.
+            u = rng.random((stop - start, 2))
+            u[:, 0] = self.tube_angle(u[:, 0])
+            u[:, 1] *= 2 * np.pi
+            return u.astype(dtype, copy=False)
+        if self.uniform and not self.flat:
+            # The map from (theta, phi) to (x, y, z) is not area-preserving, so
+            # angles are rejection sampled against the area element.
+            return sample_parameters(
+                stop - start,
+                [(0, 2 * np.pi), (0, 2 * np.pi)],
+                area_element=self.area_element,
+                max_area_element=self.a * (self.c + self.a),
+                seed=rng,
+                dtype=dtype,
+            )
+        return 2.0 * np.pi * rng.random((stop - start, 2), dtype=dtype)
+
+    def evaluate(self, params):
+        c, a = self.c, self.a
+        theta, phi = params[:, 0], params[:, 1]
+
+        data = np.zeros((len(params), self.dim), dtype=params.dtype)
+        if self.flat:
+            data[:, 0] = c * np.cos(phi)
+            data[:, 1] = c * np.sin(phi)
+            data[:, 2] = a * np.cos(theta)
+            data[:, 3] = a * np.sin(theta)
+            return data
+
+        data[:, 0] = (c + a * np.cos(theta)) * np.cos(phi)
+        data[:, 1] = (c + a * np.cos(theta)) * np.sin(phi)
+        data[:, 2] = a * np.sin(theta)
+        return data
+
+    def normals(self, params):
+        if self.flat:
+            raise NotImplementedError("The flat torus has codimension 2, no normals.")
+        # The direction from the center of the tube
+        theta, phi = params[:, 0], params[:, 1]
+        data = np.zeros((len(params), 3), dtype=params.dtype)
+        data[:, 0] = np.cos(theta) * np.cos(phi)
+        data[:, 1] = np.cos(theta) * np.sin(phi)
+        data[:, 2] = np.sin(theta)
+        return data
+
+    def geodesic(self, x, y):
+        if not self.flat:
+            raise NotImplementedError(
+                "The geodesic distances of the torus in 3 dimensions have no "
+                "closed form. Use flat=True for the flat torus."
+            )
+        # The flat torus is the product of circles of radii a and c
+        d = _periodic(x[:, 0], y[:, 0])
+        d *= self.a
+        d **= 2
+        e = _periodic(x[:, 1], y[:, 1])
+        e *= self.c
+        d += e**2
+        return np.sqrt(d, out=d)
+
+
+@register_shape
+class SwissRoll(Shape):
+    """A Swiss roll of length ``r``, see :func:`swiss_roll`."""
+
+    name = "swiss_roll"
+    dim = 3
+
+    def __init__(self, r=10.0):
+        self.r = r
+
+    def sample_params(self, rng, start, stop, n, dtype=np.float64):
+        params = rng.random((stop - start, 2), dtype=dtype)
+        params[:, 0] = (params[:, 0] * 3 + 1.5) * np.pi
+        params[:, 1] *= self.r
+        return params
+
+    def evaluate(self, params):
+        phi, psi = params[:, 0], params[:, 1]
+
+        data = np.zeros((len(params), 3), dtype=params.dtype)
+        data[:, 0] = phi * np.cos(phi)
+        data[:, 1] = phi * np.sin(phi)
+        data[:, 2] = psi
+        return data
+
+    def normals(self, params):
+        phi = params[:, 0]
+        # The tangent (cos(phi) - phi sin(phi), sin(phi) + phi cos(phi)),
+        # turned by a right angle
+        data = np.zeros((len(params), 3), dtype=params.dtype)
+        data[:, 0] = np.sin(phi) + phi * np.cos(phi)
+        data[:, 1] = phi * np.sin(phi) - np.cos(phi)
+        data[:, :2] /= np.sqrt(1 + phi**2)[:, None]
+        return data
+
+    @staticmethod
+    def arc_length(phi):
+        """Length of the spiral ``(phi cos(phi), phi sin(phi))`` from 0 to ``phi``."""
+        root = np.sqrt(1 + phi**2)
+        return (phi * root + np.arcsinh(phi)) / 2
+
+    def geodesic(self, x, y):
+        # The roll is a rolled-up rectangle, so unrolling it by arc length
+        # turns geodesics into straight lines.
+        d = self.arc_length(x[:, 0])[:, None] - self.arc_length(y[:, 0])[None, :]
+        d **= 2
+        d += (x[:, 1][:, None] - y[:, 1][None, :]) ** 2
+        return np.sqrt(d, out=d)
+
+
+@register_shape
+class InftySign(ClosedCurve):
+    """A figure 8 ``(cos(t), sin(2t))``, see :func:`infty_sign`."""
+
+    name = "infty_sign"
+    dim = 2
+
+    def __init__(self, angle=None, uniform=False, spacing="even"):
+        if angle is not None:
+            assert angle >= -np.pi and angle <= 2 * np.pi, (
+                "Angle {angle} not in range. Angle should be in the range {min_angle} <= angle <= {max_angle}".format(
+                    angle=angle, min_angle="-pi", max_angle="2*pi"
+                )
+            )
+        super().__init__(uniform=uniform, spacing=spacing)
+        self.angle = angle
+
+    def curve(self, t):
+        X = np.zeros((len(t), 2), dtype=t.dtype)
+        X[:, 0] = np.cos(t)
+        X[:, 1] = np.sin(2 * t)
+        return X
+
+    def postprocess(self, data):
+        if self.angle is not None:
+            rotate_2D(data, self.angle, out=data)
+        return data
+
+
+@register_shape
+class CircularArcs(Shape):
+    """A union of circular arcs, see :func:`circular_arcs`.
+
+    The parameters of a point are the index of its arc and its angle on that
+    arc. One uniform per point is mapped through the cumulative arc lengths,
+    so points are uniform by length along the whole shape and the first rows
+    do not depend on ``n``. Subclasses build their arcs in ``__init__`` and
+    pass them to :meth:`_set_arcs`.
+    """
+
+    name = "circular_arcs"
+    dim = 2
+
+    def __init__(self, centers, radii, angles):
+        self.centers = centers
+        self.radii = radii
+        self.angles = angles
+        self._set_arcs(centers, radii, angles)
+
+    def _set_arcs(self, centers, radii, angles):
+        centers = np.asarray(centers, dtype=float)
+        radii = np.asarray(radii, dtype=float)
+        angles = np.asarray(angles, dtype=float)
+        k = len(radii)
+        assert centers.shape == (k, 2), "centers should have shape (k, 2)."
+        assert angles.shape == (k, 2), "angles should have shape (k, 2)."
+        assert np.all(radii > 0), "Radii should be positive."
+        assert np.all(angles[:, 1] >= angles[:, 0]), "Arcs should go counterclockwise."
+
+        lengths = (angles[:, 1] - angles[:, 0]) * radii
+        assert lengths.sum() > 0, "The arcs have zero total length."
+        self._centers = centers
+        self._radii = radii
+        self._starts = angles[:, 0]
+        # Arc i covers [_offsets[i], _offsets[i + 1]) of the normalized length
+        self._offsets = np.concatenate(([0], np.cumsum(lengths))) / lengths.sum()
+        # Angle per unit of normalized length on each arc
+        self._scales = lengths.sum() / radii
+
+    def sample_params(self, rng, start, stop, n, dtype=np.float64):
+        s = rng.random(stop - start, dtype=dtype)
+        arcs = np.searchsorted(self._offsets, s, side="right") - 1
+        np.clip(arcs, 0, len(self._radii) - 1, out=arcs)
+        # Map the position along the arc to an angle
+        s -= self._offsets[arcs]
+        s *= self._scales[arcs]
+        s += self._starts[arcs]
+        return np.column_stack((arcs.astype(dtype), s))
+
+    def evaluate(self, params):
+        arcs = params[:, 0].astype(np.int64)
+        angles = params[:, 1]
+        radii = self._radii[arcs]
+
+        data = self._centers[arcs].astype(params.dtype)
+        data[:, 0] += radii * np.cos(angles)
+        data[:, 1] += radii * np.sin(angles)
+        return data
+
+    def normals(self, params):
+        angles = params[:, 1]
+        return np.column_stack((np.cos(angles), np.sin(angles)))
+
+
+@register_shape
+class Eyeglasses(CircularArcs):
+    """Two circles joined by a neck of width ``neck_size``, see :func:`eyeglasses`.
+
+    The shape is made of four circular arcs: the left and right circles and
+    the top and bottom of the neck.
+    """
+
+    name = "eyeglasses"
+    dim = 2
+
+    def __init__(self, r1=1.0, r2=None, neck_size=None):
+        if r2 is None:
+            r2 = r1
+        if neck_size is None:
+            neck_size = min(r1, r2)
+
+        assert neck_size < 2 * min(r1, r2), "Neck should be smaller than 2*min(r1,r2)."
+        self.r1 = r1
+        self.r2 = r2
+        self.neck_size = neck_size
+
+        half_neck = neck_size / 2
+
+        r_neck = min(r1, r2)
+
+        x_left = ((r_neck + r1) ** 2 - (r_neck + half_neck) ** 2) ** (
+            1 / 2
+        ) - r1  # x distance from left circle to neck
+        x_right = ((r_neck + r2) ** 2 - (r_neck + half_neck) ** 2) ** (1 / 2) - r2
+
+        alpha_1 = np.arcsin((r_neck + half_neck) / (r1 + r_neck))
+        alpha_2 = np.arcsin((r_neck + half_neck) / (r2 + r_neck))
+
+        # left, right, top and bottom arcs
+        centers = np.array(
+            [
+                [-r1 - x_left, 0],
+                [x_right + r2, 0],
+                [0, half_neck + r_neck],
+                [0, -half_neck - r_neck],
+            ]
+        )
+        radii = np.array([r1, r2, r_neck, r_neck])
+        angles = np.array(
+            [
+                [alpha_1, 2 * np.pi - alpha_1],
+                [-np.pi + alpha_2, np.pi - alpha_2],
+                [np.pi + alpha_1, 2 * np.pi - alpha_2],
+                [alpha_2, np.pi - alpha_1],
+            ]
         )
-        data.append(points)
 
-    data = np.concatenate(data)
+        self._set_arcs(centers, radii, angles)
+
+
+@register_shape
+class Bouquet(CircularArcs):
+    """``k`` circles touching at the origin, see :func:`bouquet`."""
+
+    name = "bouquet"
+    dim = 2
+
+    def __init__(self, k=3, r=1.0):
+        assert k >= 1, "A bouquet needs at least one circle."
+        self.k = k
+        self.r = r
+
+        # Circles on the same side are nested and tangent at the origin
+        radii = r * (np.arange(k) // 2 + 1)
+        sides = np.where(np.arange(k) % 2 == 0, 1.0, -1.0)
+        centers = np.column_stack((sides * radii, np.zeros(k)))
+        angles = np.tile([0, 2 * np.pi], (k, 1))
+        self._set_arcs(centers, radii, angles)
+
+
+@register_shape
+class CircleChain(CircularArcs):
+    """``k`` circles of radius ``r`` in a row, see :func:`circle_chain`."""
 
-    if noise:
-        data += noise * rng.standard_normal((n, 2))
+    name = "circle_chain"
+    dim = 2
 
-    if ambient:
-        data = embed(data, ambient)
+    def __init__(self, k=3, r=1.0):
+        assert k >= 1, "A chain needs at least one circle."
+        self.k = k
+        self.r = r
 
-    return data
+        centers = np.column_stack((2 * r * np.arange(k), np.zeros(k)))
+        angles = np.tile([0, 2 * np.pi], (k, 1))
+        self._set_arcs(centers, np.full(k, float(r)), angles)
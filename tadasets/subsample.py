@@ -0,0 +1,177 @@
+"""
+Landmarks of large point clouds by greedy farthest-point sampling.
+
+The data is read in chunks of rows, so it can be a ``np.memmap`` written by
+the shape functions with ``out=`` and larger than memory. Only a few arrays of
+``n`` floats are kept besides it.
+"""
+
+import contextlib
+
+import numpy as np
+
+from ._blocks import n_workers
+
+#: Number of values of the data read at once by each chunk.
+CHUNK_ELEMENTS = 2**20
+#: Number of distances computed at once by :func:`cover_radius`.
+BLOCK_ELEMENTS = 2**22
+
+
+def _chunks(n, rows):
+    return [(i, min(i + rows, n)) for i in range(0, n, rows)]
+
+
+@contextlib.contextmanager
+def _runner(workers):
+    """A function calling a list of tasks, on a pool of threads kept open."""
+    workers = n_workers(workers)
+    if workers == 1:
+        yield lambda tasks: [task() for task in tasks]
+        return
+    # Imported here to keep ``import tadasets`` cheap
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        yield lambda tasks: list(pool.map(lambda task: task(), tasks))
+
+
+def farthest_points(data, m, start=0, workers=None, return_radii=False):
+    """Select ``m`` landmarks of ``data`` by greedy farthest-point sampling.
+
+    Starting from row ``start``, each landmark is the point farthest from the
+    landmarks already selected. The distance of every point to its nearest
+    landmark is kept in a buffer and updated with the new landmark, one
+    chunk of rows at a time, so the cost is ``O(n m D)`` time and ``O(n)``
+    memory besides ``data``. The distances are computed in double precision.
+
+    Parameters
+    ----------
+    data : np.ndarray (n, D)
+        Points, e.g. a ``np.memmap``.
+    m : int
+        Number of landmarks.
+    start : int, default=0
+        Index of the first landmark.
+    workers : int, optional
+        Number of threads updating chunks of rows, -1 for all CPUs. The
+        landmarks do not depend on it.
+    return_radii : bool, default=False
+        If True, also return the cover radius after each landmark.
+
+    Returns
+    -------
+    index : np.ndarray (m,)
+        Indices of the landmarks, in the order they were selected.
+    radii : np.ndarray (m,), if ``return_radii``
+        ``radii[i]`` is the largest distance of a point to the first ``i + 1``
+        landmarks, so ``radii[-1]`` is the cover radius of all of them.
+    """
+    n, D = data.shape
+    assert 0 < m <= n, "m must be between 1 and the number of points."
+    chunks = _chunks(n, max(CHUNK_ELEMENTS // max(D, 1), 1))
+
+    # Distances are computed as |c|^2 - 2 c.x + |x|^2 about the mean to keep
+    # the cancellation small.
+    mean = np.zeros(D)
+    for i, j in chunks:
+        mean += np.sum(data[i:j], axis=0, dtype=np.float64)
+    mean /= n
+    sq = np.empty(n)
+    nearest = np.full(n, np.inf)
+    best = [None] * len(chunks)
+
+    def norms(i, j):
+        c = data[i:j] - mean
+        sq[i:j] = np.einsum("ij,ij->i", c, c)
+
+    def update(t, i, j, x, shift, xx):
+        d = data[i:j] @ x
+        d -= shift
+        d *= -2
+        d += sq[i:j]
+        d += xx
+        seg = nearest[i:j]
+        np.minimum(seg, d, out=seg)
+        k = np.argmax(seg)
+        best[t] = (seg[k], i + k)
+
+    index = np.empty(m, dtype=np.intp)
+    radii = np.empty(m)
+    with _runner(workers) as run:
+        run([lambda i=i, j=j: norms(i, j) for i, j in chunks])
+        far = start
+        for s in range(m):
+            index[s] = far
+            x = np.asarray(data[far], dtype=np.float64) - mean
+            shift, xx = mean @ x, x @ x
+            nearest[far] = 0
+            run(
+                [
+                    lambda t=t, i=i, j=j: update(t, i, j, x, shift, xx)
+                    for t, (i, j) in enumerate(chunks)
+                ]
+            )
+            # The first chunk holding the largest distance, as np.argmax would
+            d2, far = max(best, key=lambda b: b[0])
+            radii[s] = np.sqrt(max(d2, 0))
+
+    if return_radii:
+        return index, radii
+    return index
+
+
+def cover_radius(data, landmarks, workers=None, return_nearest=False):
+    """Largest distance of a point of ``data`` to its nearest landmark.
+
+    Every ball of this radius around the landmarks together covers ``data``.
+
+    Parameters
+    ----------
+    data : np.ndarray (n, D)
+        Points, e.g. a ``np.memmap``.
+    landmarks : np.ndarray (m, D)
+        Landmark points, e.g. ``data[farthest_points(data, m)]``.
+    workers : int, optional
+        Number of threads processing chunks of rows, -1 for all CPUs.
+    return_nearest : bool, default=False
+        If True, also return the index of the nearest landmark of each point.
+
+    Returns
+    -------
+    radius : float
+    nearest : np.ndarray (n,), if ``return_nearest``
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float64)
+    n, D = data.shape
+    m = len(landmarks)
+    assert m > 0, "At least one landmark is needed."
+    rows = max(min(CHUNK_ELEMENTS // max(D, 1), BLOCK_ELEMENTS // m), 1)
+    chunks = _chunks(n, rows)
+
+    mean = landmarks.mean(0)
+    centered = landmarks - mean
+    lsq = np.einsum("ij,ij->i", centered, centered)
+    nearest = np.empty(n, dtype=np.intp) if return_nearest else None
+    radii = [None] * len(chunks)
+
+    def task(t, i, j):
+        c = data[i:j] - mean
+        d = c @ centered.T
+        d *= -2
+        d += lsq
+        d += np.einsum("ij,ij->i", c, c)[:, None]
+        k = np.argmin(d, axis=1)
+        radii[t] = np.max(d[np.arange(len(d)), k], initial=0)
+        if nearest is not None:
+            nearest[i:j] = k
+
+    with _runner(workers) as run:
+        run([lambda t=t, i=i, j=j: task(t, i, j) for t, (i, j) in enumerate(chunks)])
+    radius = float(np.sqrt(max(radii, default=0.0)))
+    if return_nearest:
+        return radius, nearest
+    return radius
+
+
+__all__ = ["farthest_points", "cover_radius"]
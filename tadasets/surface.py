@@ -0,0 +1,125 @@
+"""
+Methods for sampling points uniformly by area on parametric surfaces.
+
+"""
+
+import numpy as np
+
+
+def sample_parameters(
+    n,
+    bounds,
+    area_element=None,
+    max_area_element=None,
+    seed=None,
+    batch_size=None,
+    dtype=np.float64,
+):
+    """Sample ``n`` parameter vectors so that their image is uniform by area.
+
+    Candidates are drawn uniformly from the box ``bounds`` in vectorized
+    batches and accepted with probability ``area_element / max_area_element``.
+    Accepted candidates are returned in the order they were drawn, so the
+    first ``m`` of ``n`` samples do not depend on ``n``.
+
+    Inputs
+    ------
+    n : int
+        Number of parameter vectors to sample.
+    bounds : array-like (k, 2)
+        Lower and upper bound of each of the ``k`` parameters.
+    area_element : callable, optional
+        Maps an ``(m, k)`` array of parameters to the ``(m,)`` area element
+        (the square root of the Gram determinant of the Jacobian) of the
+        parametrization. If None, the parametrization is assumed to be
+        area-preserving and every candidate is accepted.
+    max_area_element : float, optional
+        Upper bound of ``area_element`` over ``bounds``. Required when
+        ``area_element`` is given.
+    seed : int or np.random.Generator, optional
+        Seed for random state. A Generator is used as is.
+    batch_size : int, optional
+        Maximum number of candidates drawn per batch. Defaults to ``4 * n``.
+    dtype : dtype, default=np.float64
+        Floating point type of the candidates, ``np.float32`` or ``np.float64``.
+
+    Returns
+    -------
+    params : np.ndarray
+        An ``(n, k)`` np.ndarray of parameters.
+    """
+    rng = np.random.default_rng(seed)
+    bounds = np.asarray(bounds, dtype=dtype)
+    assert bounds.ndim == 2 and bounds.shape[1] == 2, "bounds should have shape (k, 2)"
+    low = bounds[:, 0]
+    width = bounds[:, 1] - low
+    k = len(bounds)
+
+    if area_element is None:
+        return low + width * rng.random((n, k), dtype=dtype)
+
+    assert max_area_element is not None and max_area_element > 0, (
+        "max_area_element must be a positive bound of area_element"
+    )
+    batch_size = batch_size if batch_size else max(4 * n, 1)
+
+    params = np.empty((n, k), dtype=dtype)
+    filled = 0
+    rate = 1.0
+    while filled < n:
+        need = n - filled
+        # Oversample by the running acceptance rate so that one or two batches
+        # usually suffice. The last column decides acceptance.
+        m = min(int(need / rate * 1.1) + 16, batch_size)
+        candidates = rng.random((m, k + 1), dtype=dtype)
+        p = candidates[:, :k]
+        p *= width
+        p += low
+        accept = candidates[:, k] * max_area_element < area_element(p)
+        p = p[accept][:need]
+        params[filled : filled + len(p)] = p
+        filled += len(p)
+        rate = max(np.count_nonzero(accept) / m, 1e-3)
+
+    return params
+
+
+def sample_surface(
+    n,
+    embedding,
+    bounds,
+    area_element=None,
+    max_area_element=None,
+    seed=None,
+    batch_size=None,
+    dtype=np.float64,
+):
+    """Sample ``n`` points uniformly by area on a parametric surface.
+
+    Inputs
+    ------
+    n : int
+        Number of points to sample.
+    embedding : callable
+        Maps an ``(n, k)`` array of parameters to an ``(n, D)`` array of points.
+    bounds, area_element, max_area_element, seed, batch_size, dtype
+        See :func:`sample_parameters`.
+
+    Returns
+    -------
+    data : np.ndarray
+        An ``(n, D)`` np.ndarray of points.
+    """
+    params = sample_parameters(
+        n,
+        bounds,
+        area_element=area_element,
+        max_area_element=max_area_element,
+        seed=seed,
+        batch_size=batch_size,
+        dtype=dtype,
+    )
+    return embedding(params)
+
+
+__all__ = ["sample_parameters", "sample_surface"]
@@ -1,14 +1,205 @@
-import matplotlib.pyplot as plt
+"""
+Plotting point clouds, downsampled for large data.
+
+matplotlib is imported when plotting, so :func:`downsample` can be used
+without it.
+"""
+
+import numpy as np
 
 # from mpl_toolkits.mplot3d import Axes3D
 
 
-def plot3d(data, fig=None, ax=None, **params):
+#: The voxel grid is fitted on at most this many times ``max_points`` rows.
+_OVERSAMPLING = 16
+
+
+def _voxel_keys(data, k, lo, hi):
+    """Index of the cell of each row in a ``k``-per-axis grid over the box ``[lo, hi]``.
+
+    The index is the linear index of the cell if the grid has fewer than
+    ``2**63`` cells, and otherwise the rank of the cell among the occupied
+    ones. Both sort the cells in the same order.
+    """
+    D = data.shape[1]
+    linear = D * np.log2(max(k, 1)) < 63
+    keys = np.zeros(len(data), dtype=np.int64)
+    cells = None if linear else np.empty((len(data), D), dtype=np.int64)
+    # One column at a time to keep the temporaries small
+    for j in range(D):
+        scale = k / (hi[j] - lo[j]) if hi[j] > lo[j] else 0.0
+        cell = ((data[:, j] - lo[j]) * scale).astype(np.int64)
+        np.clip(cell, 0, k - 1, out=cell)
+        if linear:
+            keys *= k
+            keys += cell
+        else:
+            cells[:, j] = cell
+    if linear:
+        return keys
+    return np.unique(cells, axis=0, return_inverse=True)[1].reshape(-1)
+
+
+def _strata(n, m, rng):
+    """One row drawn uniformly from each of ``m`` consecutive strata of ``n`` rows."""
+    if n <= m:
+        return np.arange(n)
+    return ((np.arange(m) + rng.random(m)) * (n / m)).astype(np.int64)
+
+
+def downsample(data, max_points, method="voxel", seed=None, return_counts=False):
+    """Select at most ``max_points`` rows of ``data`` that cover it evenly.
+
+    With ``method="voxel"`` the bounding box is divided into a grid whose
+    resolution is refined until about ``max_points`` cells are occupied, and
+    one point of each occupied cell is kept. Dense regions are thinned and
+    sparse ones kept, so the shape stays visible. With ``method="random"``
+    the rows are split into ``max_points`` consecutive strata and one random
+    row is kept from each.
+
+    For large ``data`` the grid is fitted on a stratified random subset of
+    ``16 * max_points`` rows, so the cost is one pass over ``data`` plus a
+    sort of the subset.
+
+    Inputs
+    ------
+    data : np.ndarray (n, D)
+        Points to downsample.
+    max_points : int
+        Maximum number of points to keep.
+    method : {"voxel", "random"}, default="voxel"
+        How to select the points, see above.
+    seed : int, optional
+        Seed for random state.
+    return_counts : bool, default=False
+        If True, also return for each kept point the estimated number of
+        points of ``data`` in its grid cell, e.g. to shade by density.
+
+    Returns
+    -------
+    index : np.ndarray (m,)
+        Indices of the kept rows, in increasing order.
+    counts : np.ndarray (m,), if ``return_counts``
+    """
+    if method not in ("voxel", "random"):
+        raise ValueError(
+            "Unknown method {!r}. Method should be 'voxel' or 'random'.".format(method)
+        )
+    n, D = data.shape
+    rng = np.random.default_rng(seed)
+    lo, hi = data.min(0), data.max(0)
+    pool = _strata(n, _OVERSAMPLING * max_points, rng)
+    sub = data[pool]
+    weight = n / len(pool)
+    k = max(int(np.ceil(max_points ** (1 / D))), 1)
+
+    if method == "random":
+        index = _strata(n, max_points, rng)
+        if not return_counts:
+            return index
+        # Ranks of occupied cells are only comparable within one call
+        keys = _voxel_keys(np.concatenate([sub, data[index]]), k, lo, hi)
+        cells, counts = np.unique(keys[: len(sub)], return_counts=True)
+        pos = np.searchsorted(cells, keys[len(sub) :])
+        return index, counts[np.minimum(pos, len(cells) - 1)] * weight
+
+    for _ in range(4):
+        keys = _voxel_keys(sub, k, lo, hi)
+        _, first, counts = np.unique(keys, return_index=True, return_counts=True)
+        if len(first) >= max_points / 2 or len(first) == len(sub):
+            break
+        # Data on a curve or surface occupies far fewer cells than the grid
+        # has. Refine by the dimension suggested by the current occupancy.
+        dim = min(max(np.log(len(first)) / np.log(max(k, 2)), 1.0), D)
+        k = min(int(np.ceil(k * (max_points / len(first)) ** (1 / dim))), 2**62)
+
+    if len(first) > max_points:
+        keep = np.sort(rng.choice(len(first), size=max_points, replace=False))
+        first, counts = first[keep], counts[keep]
+    order = np.argsort(first)
+    index = pool[first[order]]
+    if return_counts:
+        return index, counts[order] * weight
+    return index
+
+
+def _prepare(data, max_points, method, density, seed, params):
+    """Downsample ``data`` and color it by density if asked."""
+    if max_points is None and not density:
+        return data
+    if max_points is None:
+        max_points = len(data)
+    index, counts = downsample(data, max_points, method, seed=seed, return_counts=True)
+    if density and "c" not in params:
+        params["c"] = np.log1p(counts)
+        params.setdefault("cmap", "viridis")
+    return data[index]
+
+
+def plot3d(
+    data,
+    fig=None,
+    ax=None,
+    max_points=None,
+    method="voxel",
+    density=False,
+    seed=None,
+    **params,
+):
+    """Scatter plot of 3-D points.
+
+    Inputs
+    ------
+    data : np.ndarray (n, 3)
+        Points to plot.
+    fig, ax : optional
+        Figure and 3-D axes to plot in. Created if not given.
+    max_points : int, optional
+        Plot at most this many points, selected with :func:`downsample`.
+        About 10**5 keeps plotting fast for any ``n``.
+    method : {"voxel", "random"}, default="voxel"
+        How to select the points, see :func:`downsample`.
+    density : bool, default=False
+        If True, color the points by the log of the number of points of
+        ``data`` around them.
+    seed : int, optional
+        Seed for random state of the downsampling.
+    **params
+        Passed to ``ax.scatter``.
+    """
+    import matplotlib.pyplot as plt
+
     fig = fig if fig else plt.figure()
 
     ax = ax if ax else fig.add_subplot(111, projection="3d")
+    data = _prepare(data, max_points, method, density, seed, params)
     ax.scatter(data[:, 0], data[:, 1], data[:, 2], **params)
     return ax
 
 
-__all__ = ["plot3d"]
+def plot2d(
+    data,
+    fig=None,
+    ax=None,
+    max_points=None,
+    method="voxel",
+    density=False,
+    seed=None,
+    **params,
+):
+    """Scatter plot of 2-D points, e.g. of :func:`tadasets.infty_sign`.
+
+    Takes the same arguments as :func:`plot3d`.
+    """
+    import matplotlib.pyplot as plt
+
+    fig = fig if fig else plt.figure()
+
+    ax = ax if ax else fig.add_subplot(111)
+    data = _prepare(data, max_points, method, density, seed, params)
+    ax.scatter(data[:, 0], data[:, 1], **params)
+    ax.set_aspect("equal")
+    return ax
+
+
+__all__ = ["plot3d", "plot2d", "downsample"]
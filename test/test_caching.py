@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pytest
+
+import tadasets
+
+
+@pytest.fixture
+def store(tmp_path):
+    with tadasets.cache(str(tmp_path)) as store:
+        yield store
+    assert tadasets.caching.active_cache() is None
+
+
+def files(store):
+    return [f for f in os.listdir(store.dir) if f.endswith(".npy")]
+
+
+class TestCache:
+    def test_hit(self, store, monkeypatch):
+        first = tadasets.torus(n=500, ambient=5, noise=0.1, seed=1)
+        assert isinstance(first, np.memmap)
+        assert len(files(store)) == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError("regenerated a cached dataset")
+
+        monkeypatch.setattr(tadasets.Torus, "evaluate", fail)
+        second = tadasets.torus(n=500, ambient=5, noise=0.1, seed=1)
+        np.testing.assert_array_equal(first, second)
+        assert not second.flags.writeable
+
+    def test_matches_uncached(self, store):
+        cached = tadasets.eyeglasses(n=300, r1=1, r2=2, seed=2, dtype=np.float32)
+        tadasets.cache(None)
+        plain = tadasets.eyeglasses(n=300, r1=1, r2=2, seed=2, dtype=np.float32)
+        np.testing.assert_array_equal(cached, plain)
+        assert cached.dtype == np.float32
+
+    def test_keys(self, store):
+        tadasets.torus(n=100, seed=1)
+        tadasets.torus(n=100, seed=2)
+        tadasets.torus(n=100, seed=1, c=3)
+        tadasets.torus(n=100, seed=1, workers=2)
+        tadasets.torus(n=100, seed=np.random.SeedSequence(1))
+        assert len(files(store)) == 4
+
+    def test_noise_keys(self, store):
+        scale = np.full(2000, 0.1)
+        tadasets.torus(
+            n=100, ambient=2000, seed=1, noise=tadasets.Gaussian(scale, "ambient")
+        )
+        scale[1000] = 0.2
+        tadasets.torus(
+            n=100, ambient=2000, seed=1, noise=tadasets.Gaussian(scale, "ambient")
+        )
+        assert len(files(store)) == 2
+
+    def test_no_seed(self, store):
+        tadasets.sphere(n=100)
+        tadasets.sphere(n=100, seed=np.random.default_rng(0))
+        assert files(store) == []
+
+    def test_out(self, store):
+        out = np.empty((100, 3))
+        assert tadasets.swiss_roll(n=100, seed=3, out=out) is out
+        np.testing.assert_array_equal(out, tadasets.swiss_roll(n=100, seed=3))
+
+    def test_eviction(self, tmp_path):
+        with tadasets.cache(str(tmp_path), max_bytes=20000) as store:
+            for seed in range(4):
+                tadasets.dsphere(n=1000, d=1, seed=seed)
+            assert store.nbytes <= 20000
+            assert len(files(store)) == 1
+            store.clear()
+            assert files(store) == []
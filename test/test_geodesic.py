@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+from scipy.spatial.distance import pdist, squareform
+
+import tadasets
+import tadasets.geodesic
+
+
+def chord_to_arc(data, r):
+    chord = squareform(pdist(data))
+    return 2 * r * np.arcsin(np.minimum(chord / (2 * r), 1))
+
+
+class TestParams:
+    @pytest.mark.parametrize(
+        "fn, kwargs",
+        [
+            (tadasets.dsphere, {"d": 3}),
+            (tadasets.sphere, {"uniform": True}),
+            (tadasets.sphere, {}),
+            (tadasets.torus, {"uniform": True}),
+            (tadasets.torus, {"flat": True}),
+            (tadasets.swiss_roll, {}),
+        ],
+    )
+    def test_same_data(self, fn, kwargs):
+        data, params = fn(n=300, seed=4, noise=0.1, return_params=True, **kwargs)
+        np.testing.assert_array_equal(data, fn(n=300, seed=4, noise=0.1, **kwargs))
+        assert len(params) == 300
+
+    def test_coordinates(self):
+        shape = tadasets.SwissRoll(r=5)
+        data, params = shape.generate(40000, seed=1, return_params=True)
+        np.testing.assert_allclose(shape.evaluate(params), data)
+        np.testing.assert_array_equal(shape.coordinates(40000, seed=1), params)
+
+    def test_unseeded(self):
+        data, params = tadasets.sphere(n=200, r=2, uniform=True, return_params=True)
+        np.testing.assert_allclose(2 * params, data)
+
+    def test_dsphere_unit(self):
+        data, params = tadasets.dsphere(n=100, d=4, r=3, seed=0, return_params=True)
+        np.testing.assert_allclose(data, 3 * params)
+
+    def test_flat_torus(self):
+        data = tadasets.torus(n=200, c=3, a=1, flat=True, seed=0)
+        assert data.shape == (200, 4)
+        np.testing.assert_allclose(np.linalg.norm(data[:, :2], axis=1), 3)
+        np.testing.assert_allclose(np.linalg.norm(data[:, 2:], axis=1), 1)
+
+
+class TestGeodesic:
+    @pytest.mark.parametrize("uniform", [False, True])
+    def test_sphere(self, uniform):
+        data, params = tadasets.sphere(
+            n=300, r=2, uniform=uniform, seed=1, return_params=True
+        )
+        D = tadasets.geodesic_distances("sphere", params, r=2, uniform=uniform)
+        np.testing.assert_allclose(D, chord_to_arc(data, 2), atol=1e-6)
+
+    def test_dsphere(self):
+        data, params = tadasets.dsphere(n=300, d=5, r=0.5, seed=1, return_params=True)
+        D = tadasets.geodesic_distances("dsphere", params, d=5, r=0.5)
+        np.testing.assert_allclose(D, chord_to_arc(data, 0.5), atol=1e-6)
+
+    def test_flat_torus(self):
+        params = np.array([[0.1, 0.2], [2 * np.pi - 0.1, 0.2], [0.1, np.pi]])
+        D = tadasets.geodesic_distances("torus", params, c=3, a=1, flat=True)
+        assert D[0, 1] == pytest.approx(0.2)
+        assert D[0, 2] == pytest.approx(3 * (np.pi - 0.2))
+
+    def test_swiss_roll(self):
+        params = np.array([[5.0, 1.0], [5.0, 4.0], [8.0, 1.0]])
+        D = tadasets.geodesic_distances("swiss_roll", params)
+        assert D[0, 1] == pytest.approx(3)
+        # Length of the spiral between phi = 5 and phi = 8
+        phi = np.linspace(5, 8, 100001)
+        spiral = np.stack([phi * np.cos(phi), phi * np.sin(phi)], axis=1)
+        length = np.linalg.norm(np.diff(spiral, axis=0), axis=1).sum()
+        assert D[0, 2] == pytest.approx(length)
+
+    def test_torus_3d(self):
+        params = np.zeros((2, 2))
+        with pytest.raises(NotImplementedError):
+            tadasets.geodesic_distances("torus", params)
+
+    def test_blocks(self, monkeypatch):
+        _, params = tadasets.swiss_roll(n=201, seed=2, return_params=True)
+        _, other = tadasets.swiss_roll(n=50, seed=3, return_params=True)
+        full = tadasets.geodesic_distances("swiss_roll", params, other)
+        monkeypatch.setattr(tadasets.geodesic, "BLOCK_ELEMENTS", 333)
+        out = np.empty((201, 50))
+        blocked = tadasets.geodesic_distances(
+            "swiss_roll", params, other, out=out, workers=3
+        )
+        assert blocked is out
+        np.testing.assert_array_equal(blocked, full)
+
+    def test_pdist(self, monkeypatch):
+        _, params = tadasets.torus(n=157, flat=True, seed=2, return_params=True)
+        D = tadasets.geodesic_distances("torus", params, flat=True)
+        monkeypatch.setattr(tadasets.geodesic, "BLOCK_ELEMENTS", 500)
+        condensed = tadasets.geodesic_pdist("torus", params, flat=True, workers=2)
+        np.testing.assert_allclose(squareform(condensed, checks=False), D)
+
+    def test_knn(self, monkeypatch):
+        _, params = tadasets.dsphere(n=300, d=2, seed=5, return_params=True)
+        D = tadasets.geodesic_distances("dsphere", params)
+        np.fill_diagonal(D, np.inf)
+        monkeypatch.setattr(tadasets.geodesic, "BLOCK_ELEMENTS", 1000)
+        distances, indices = tadasets.geodesic_knn("dsphere", params, 4)
+        np.testing.assert_allclose(distances, np.sort(D, axis=1)[:, :4])
+        np.testing.assert_allclose(np.take_along_axis(D, indices, 1), distances)
+        assert not np.any(indices == np.arange(300)[:, None])
+
+    def test_knn_other(self):
+        _, params = tadasets.sphere(n=100, seed=5, return_params=True)
+        distances, indices = tadasets.geodesic_knn("sphere", params[:10], 1, params)
+        np.testing.assert_array_equal(indices[:, 0], np.arange(10))
+        np.testing.assert_allclose(distances, 0, atol=1e-6)
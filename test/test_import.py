@@ -0,0 +1,45 @@
+import importlib
+import subprocess
+import sys
+
+import tadasets
+
+
+def run(code):
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def cumulative(importtime, module):
+    """Cumulative import time in microseconds of a top-level import."""
+    for line in importtime.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].rstrip() == " " + module:
+            return int(parts[1])
+    raise AssertionError("{} was not imported".format(module))
+
+
+class TestLazyImport:
+    def test_no_matplotlib(self):
+        run(
+            "import sys, tadasets; tadasets.torus(n=10, ambient=4, seed=0); "
+            "assert 'matplotlib' not in sys.modules"
+        )
+
+    def test_import_time(self):
+        # Importing the shapes after numpy should cost less than numpy itself
+        log = run("import numpy; import tadasets.shapes").stderr
+        assert "matplotlib" not in log
+        assert cumulative(log, "tadasets.shapes") < cumulative(log, "numpy")
+
+    def test_exports(self):
+        for module, names in tadasets._EXPORTS.items():
+            submodule = importlib.import_module("tadasets." + module)
+            assert sorted(names) == sorted(submodule.__all__)
+            for name in names:
+                assert getattr(tadasets, name) is getattr(submodule, name)
+        assert "plot3d" in dir(tadasets)
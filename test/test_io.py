@@ -0,0 +1,158 @@
+import numpy as np
+import pytest
+
+import tadasets
+
+VERTICES = np.array(
+    [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0.5, 0.5, 1.0]], dtype=float
+)
+# A pyramid: the square base as a quad and four triangles
+QUAD = [0, 3, 2, 1]
+TRIANGLES = [[0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]]
+FANNED = np.array(TRIANGLES + [[0, 3, 2], [0, 2, 1]])
+
+
+def write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def ply_header(fmt, nf, list_types="uchar int", face_extra=""):
+    return (
+        "ply\nformat {} 1.0\ncomment made by hand\n"
+        "element vertex {}\nproperty float x\nproperty float y\nproperty float z\n"
+        "property uchar red\n"
+        "element face {}\nproperty list {} vertex_indices\n{}end_header\n"
+    ).format(fmt, len(VERTICES), nf, list_types, face_extra)
+
+
+def binary_ply(path, order, faces, face_extra=False):
+    header = ply_header(
+        "binary_little_endian" if order == "<" else "binary_big_endian",
+        len(faces),
+        face_extra="property float quality\n" if face_extra else "",
+    )
+    vertex = np.dtype([("xyz", order + "f4", (3,)), ("red", "u1")])
+    records = np.zeros(len(VERTICES), dtype=vertex)
+    records["xyz"] = VERTICES
+    body = records.tobytes()
+    for face in faces:
+        body += np.uint8(len(face)).tobytes()
+        body += np.asarray(face, dtype=order + "i4").tobytes()
+        if face_extra:
+            body += np.asarray(0.5, dtype=order + "f4").tobytes()
+    path.write_bytes(header.encode() + body)
+    return str(path)
+
+
+class TestOFF:
+    def test_triangles(self, tmp_path):
+        lines = ["OFF", "# a comment", "5 4 0"]
+        lines += ["{} {} {}".format(*v) for v in VERTICES]
+        lines += ["3 {} {} {}".format(*t) for t in TRIANGLES]
+        vertices, triangles = tadasets.read_off(
+            write(tmp_path / "a.off", "\n".join(lines))
+        )
+        np.testing.assert_array_equal(vertices, VERTICES)
+        np.testing.assert_array_equal(triangles, TRIANGLES)
+
+    def test_polygons_colors(self, tmp_path):
+        lines = ["COFF 5 5 0"]
+        lines += ["{} {} {} 255 0 0 255".format(*v) for v in VERTICES]
+        lines += ["3 {} {} {}".format(*t) for t in TRIANGLES]
+        lines += ["4 {} {} {} {}".format(*QUAD)]
+        path = write(tmp_path / "b.off", "\n".join(lines) + "\n")
+        vertices, triangles = tadasets.read_mesh(path)
+        np.testing.assert_array_equal(vertices, VERTICES)
+        np.testing.assert_array_equal(triangles, FANNED)
+
+    def test_quads(self, tmp_path):
+        quads = [[0, 1, 2, 3], [0, 1, 4, 2], [1, 2, 3, 4]]
+        lines = ["OFF", "5 3 0"]
+        lines += ["{} {} {}".format(*v) for v in VERTICES]
+        lines += ["4 {} {} {} {}".format(*q) for q in quads]
+        vertices, triangles = tadasets.read_off(
+            write(tmp_path / "c.off", "\n".join(lines))
+        )
+        fanned = [[q[0], q[j], q[j + 1]] for q in quads for j in (1, 2)]
+        np.testing.assert_array_equal(triangles, fanned)
+
+    @pytest.mark.parametrize("color", ["", " 0.5 0.5 0.5"])
+    def test_mixed(self, tmp_path, color):
+        lines = ["OFF", "5 3 0"]
+        lines += ["{} {} {}".format(*v) for v in VERTICES]
+        lines += ["4 {} {} {} {}".format(*QUAD) + color]
+        lines += ["3 {} {} {}".format(*t) + color for t in TRIANGLES[:2]]
+        vertices, triangles = tadasets.read_off(
+            write(tmp_path / "d.off", "\n".join(lines))
+        )
+        np.testing.assert_array_equal(
+            triangles, np.concatenate([FANNED[4:], TRIANGLES[:2]])
+        )
+
+
+class TestOBJ:
+    def test_triangles(self, tmp_path):
+        lines = ["# pyramid", "o pyramid"]
+        lines += ["v {} {} {}".format(*v) for v in VERTICES]
+        lines += ["vn 0 0 1", "vt 0 0"]
+        lines += ["f {}/1/1 {}/1/1 {}/1/1".format(*(np.add(t, 1))) for t in TRIANGLES]
+        vertices, triangles = tadasets.read_obj(
+            write(tmp_path / "a.obj", "\n".join(lines))
+        )
+        np.testing.assert_array_equal(vertices, VERTICES)
+        np.testing.assert_array_equal(triangles, TRIANGLES)
+
+    def test_polygons_relative(self, tmp_path):
+        lines = ["v {} {} {} 1.0".format(*v) for v in VERTICES]
+        lines += ["f {} {} {}".format(*(np.add(t, 1))) for t in TRIANGLES]
+        # Negative indices count back from the last vertex
+        lines += ["f {} {} {} {}".format(*(np.subtract(QUAD, 5)))]
+        vertices, triangles = tadasets.read_mesh(
+            write(tmp_path / "b.obj", "\n".join(lines))
+        )
+        np.testing.assert_array_equal(vertices, VERTICES)
+        np.testing.assert_array_equal(triangles, FANNED)
+
+
+class TestPLY:
+    def test_ascii(self, tmp_path):
+        lines = [ply_header("ascii", 5).rstrip("\n")]
+        lines += ["{} {} {} 7".format(*v) for v in VERTICES]
+        lines += ["3 {} {} {}".format(*t) for t in TRIANGLES]
+        lines += ["4 {} {} {} {}".format(*QUAD)]
+        vertices, triangles = tadasets.read_ply(
+            write(tmp_path / "a.ply", "\n".join(lines))
+        )
+        np.testing.assert_array_equal(vertices, VERTICES)
+        np.testing.assert_array_equal(triangles, FANNED)
+
+    @pytest.mark.parametrize("order", ["<", ">"])
+    def test_binary_mmap(self, tmp_path, order):
+        path = binary_ply(tmp_path / "a.ply", order, TRIANGLES, face_extra=True)
+        vertices, triangles = tadasets.read_ply(path)
+        np.testing.assert_array_equal(vertices, VERTICES)
+        np.testing.assert_array_equal(triangles, TRIANGLES)
+        # Views into the file, not copies, when the byte order is native
+        if np.dtype(order + "f4").isnative:
+            assert not vertices.flags.writeable
+            assert not triangles.flags.writeable
+        copied = tadasets.read_ply(path, mmap=False)
+        np.testing.assert_array_equal(copied[1], TRIANGLES)
+
+    def test_binary_polygons(self, tmp_path):
+        path = binary_ply(tmp_path / "b.ply", "<", TRIANGLES + [QUAD])
+        vertices, triangles = tadasets.read_mesh(path)
+        np.testing.assert_array_equal(vertices, VERTICES)
+        np.testing.assert_array_equal(triangles, FANNED)
+
+    def test_from_mesh(self, tmp_path):
+        path = binary_ply(tmp_path / "c.ply", "<", TRIANGLES + [QUAD])
+        data = tadasets.from_mesh(*tadasets.read_mesh(path), n=1000, seed=0)
+        assert data.shape == (1000, 3)
+        assert np.all((data >= -1e-6) & (data <= 1 + 1e-6))
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        tadasets.read_mesh(str(tmp_path / "mesh.stl"))
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+import tadasets
+from tadasets import Gaussian, Outliers, StudentT
+
+BLOCK = tadasets._blocks.BLOCK_SIZE
+N = 2 * BLOCK + 300
+
+
+@pytest.mark.parametrize(
+    "shape, params",
+    [
+        ("torus", dict(uniform=True, noise=0.1, ambient=6)),
+        ("dsphere", dict(d=3, noise=[StudentT(0.1), Outliers(0.1, space="ambient")])),
+        ("swiss_roll", dict(noise=Gaussian(0.1, "ambient"), ambient=5)),
+        ("infty_sign", dict(spacing="random", angle=0.5)),
+        ("sphere", dict(sampling="sobol", noise=0.05)),
+        ("dsphere", dict(d=30, ambient=100)),
+    ],
+)
+class TestLazy:
+    def test_slices(self, shape, params):
+        data = getattr(tadasets, shape)(n=N, seed=0, **params)
+        ds = tadasets.lazy(shape, N, seed=0, **params)
+        assert ds.shape == data.shape and len(ds) == N
+        np.testing.assert_array_equal(np.asarray(ds), data)
+        np.testing.assert_array_equal(
+            ds[BLOCK - 5 : BLOCK + 7], data[BLOCK - 5 : BLOCK + 7]
+        )
+        np.testing.assert_array_equal(ds[-3], data[-3])
+        np.testing.assert_array_equal(ds[5:-5:997, 1], data[5:-5:997, 1])
+        rows = [N - 1, 3, BLOCK, 3]
+        np.testing.assert_array_equal(ds[rows], data[rows])
+
+    def test_prefix(self, shape, params):
+        ds = tadasets.lazy(shape, BLOCK + 50, seed=1, **params)
+        larger = ds.resize(N)
+        np.testing.assert_array_equal(larger[: len(ds)], ds[:])
+
+
+class TestShards:
+    def test_shards(self):
+        kwargs = dict(n=N, noise=0.1, ambient=4, seed=2)
+        ds = tadasets.lazy("torus", workers=2, **kwargs)
+        shards = [ds.shard(i, 7) for i in range(7)]
+        np.testing.assert_array_equal(np.concatenate(shards), tadasets.torus(**kwargs))
+
+    def test_unseeded(self):
+        ds = tadasets.lazy("sphere", 100)
+        np.testing.assert_array_equal(ds[:10], ds.resize(200)[:10])
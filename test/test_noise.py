@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+import tadasets
+from tadasets import AlongNormals, Gaussian, Outliers, StudentT
+
+BLOCK = tadasets._blocks.BLOCK_SIZE
+
+
+class TestModels:
+    def test_float(self):
+        np.testing.assert_array_equal(
+            tadasets.torus(n=500, noise=0.1, ambient=5, seed=0),
+            tadasets.torus(n=500, noise=Gaussian(0.1), ambient=5, seed=0),
+        )
+
+    def test_anisotropic(self):
+        clean = tadasets.swiss_roll(n=20000, seed=1)
+        noisy = tadasets.swiss_roll(n=20000, noise=Gaussian([0, 0.1, 1]), seed=1)
+        np.testing.assert_allclose((noisy - clean).std(0), [0, 0.1, 1], rtol=0.05)
+
+    def test_heavy_tailed(self):
+        clean = tadasets.sphere(n=20000, seed=2)
+        noisy = tadasets.sphere(n=20000, noise=StudentT(0.1, df=1), seed=2)
+        error = np.abs(noisy - clean)
+        # Cauchy noise has a median of its scale and a very long tail
+        assert np.median(error) == pytest.approx(0.1, rel=0.1)
+        assert error.max() > 100
+
+    def test_outliers(self):
+        clean = tadasets.torus(n=20000, ambient=5, seed=3)
+        noisy = tadasets.torus(
+            n=20000, ambient=5, noise=Outliers(0.1, low=-4, high=4), seed=3
+        )
+        moved = np.any(noisy != clean, axis=1)
+        assert moved.mean() == pytest.approx(0.1, abs=0.01)
+        assert np.all(np.abs(noisy[moved]) <= 4)
+
+    def test_along_normals(self):
+        clean = tadasets.sphere(n=1000, r=2, seed=4)
+        noisy = tadasets.sphere(n=1000, r=2, noise=AlongNormals(0.1), seed=4)
+        radii = np.linalg.norm(noisy, axis=1)
+        assert radii.std() == pytest.approx(0.1, rel=0.15)
+        np.testing.assert_allclose(noisy / radii[:, None], clean / 2, atol=1e-12)
+
+    def test_no_normals(self):
+        with pytest.raises(NotImplementedError):
+            tadasets.torus(n=10, flat=True, noise=AlongNormals(0.1))
+
+
+class TestSpace:
+    def test_ambient(self):
+        kwargs = dict(n=2000, ambient=8, seed=5)
+        clean = tadasets.torus(**kwargs)
+        _, s, _ = np.linalg.svd(tadasets.torus(noise=0.1, **kwargs) - clean)
+        assert s[3] < 1e-8
+        noisy = tadasets.torus(noise=Gaussian(0.1, space="ambient"), **kwargs)
+        np.testing.assert_allclose((noisy - clean).std(0), 0.1, rtol=0.1)
+
+    def test_compose(self):
+        noise = [AlongNormals(0.05), Gaussian(0.01, "ambient"), Outliers(0.01, -3, 3)]
+        kwargs = dict(n=3 * BLOCK + 5, ambient=6, seed=6, noise=noise)
+        data = tadasets.torus(**kwargs)
+        np.testing.assert_array_equal(tadasets.torus(workers=3, **kwargs), data)
+        chunks = tadasets.stream("torus", chunk=5000, **kwargs)
+        np.testing.assert_array_equal(np.concatenate(list(chunks)), data)
+
+    def test_batch(self):
+        noise = [StudentT(0.1, df=4), Outliers(0.05, space="ambient")]
+        data = tadasets.batch(
+            "sphere", n=BLOCK + 10, replicates=3, noise=noise, ambient=4, seed=7
+        )
+        seeds = np.random.SeedSequence(7).spawn(3)
+        for b in range(3):
+            np.testing.assert_array_equal(
+                data[b],
+                tadasets.sphere(n=BLOCK + 10, noise=noise, ambient=4, seed=seeds[b]),
+            )
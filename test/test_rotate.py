@@ -1,4 +1,4 @@
-from tadasets.rotate import rotate_2D
+from tadasets.rotate import givens, rotate_2D
 import numpy as np
 import pytest
 
@@ -7,3 +7,51 @@ def test_rotate_2D():
     with pytest.raises(ValueError) as ve:
         rotate_2D(np.array([[1, 2, 3], [4, 5, 6]]), 0)
         assert ve is not None
+
+
+def _rotate_polar(d, angle):
+    # The original implementation through polar coordinates
+    phis = np.arctan2(d[:, 0], d[:, 1]) + angle - np.pi / 2
+    r = np.sqrt(d[:, 0] ** 2 + d[:, 1] ** 2)
+    return np.column_stack((r * np.cos(phis), r * np.sin(phis)))
+
+
+def test_rotate_2D_polar():
+    d = np.random.default_rng(0).standard_normal((100, 2))
+    np.testing.assert_allclose(rotate_2D(d, 0.7), _rotate_polar(d, 0.7), atol=1e-12)
+
+
+def test_rotate_2D_batch():
+    d = np.random.default_rng(1).standard_normal((50, 2))
+    angles = np.linspace(0, np.pi, 5)
+    rotated = rotate_2D(d, angles)
+    assert rotated.shape == (5, 50, 2)
+    for k, angle in enumerate(angles):
+        np.testing.assert_allclose(rotated[k], rotate_2D(d, angle))
+
+
+def test_rotate_2D_in_place():
+    d = np.random.default_rng(2).standard_normal((50, 2))
+    expected = rotate_2D(d, 1.3)
+    assert rotate_2D(d, 1.3, out=d) is d
+    np.testing.assert_array_equal(d, expected)
+
+
+def test_dtype():
+    d = np.random.default_rng(4).standard_normal((30, 2))
+    rotated = rotate_2D(d.astype(np.float32), [0.2, 0.9])
+    assert rotated.dtype == np.float32
+    np.testing.assert_allclose(rotated, rotate_2D(d, [0.2, 0.9]), atol=1e-6)
+    assert givens(np.ones((3, 2), dtype=int), 0.5).dtype == np.float64
+
+
+def test_givens():
+    d = np.random.default_rng(3).standard_normal((40, 5))
+    rotated = givens(d, np.pi / 2, i=1, j=3)
+    np.testing.assert_allclose(rotated[:, 3], d[:, 1], atol=1e-12)
+    np.testing.assert_allclose(rotated[:, 1], -d[:, 3], atol=1e-12)
+    np.testing.assert_array_equal(rotated[:, [0, 2, 4]], d[:, [0, 2, 4]])
+    np.testing.assert_allclose(
+        np.linalg.norm(givens(d, [0.1, 2.0]), axis=2),
+        np.tile(np.linalg.norm(d, axis=1), (2, 1)),
+    )
@@ -1,7 +1,7 @@
 import numpy as np
 
 
-from tadasets.sample import from_mesh
+from tadasets.sample import MeshSampler, _alias_table, from_mesh
 
 
 class TestMeshSampler:
@@ -33,3 +33,149 @@ class TestMeshSampler:
 
         assert np.all(points[:, 0] + points[:, 1] <= 1)
         assert len(points) == 100
+
+    def test_seed(self):
+        vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0]])
+
+        tris = np.array([[0, 1, 2], [1, 2, 3]])
+
+        p1 = from_mesh(vertices, tris, n=100, seed=5)
+        p2 = from_mesh(vertices, tris, n=100, seed=5)
+
+        np.testing.assert_array_equal(p1, p2)
+
+    def test_area_weighting(self):
+        # The second triangle has six times the area of the first.
+        vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [3, 0, 0], [0, 3, 0]])
+
+        tris = np.array([[0, 1, 2], [1, 3, 4]])
+
+        points = from_mesh(vertices, tris, n=20000, seed=0)
+        small = np.mean(points[:, 0] + points[:, 1] <= 1)
+
+        assert abs(small - 1 / 7) < 0.01
+
+    def test_zero_area_face(self):
+        vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [2, 0, 0]])
+
+        tris = np.array([[0, 1, 3], [0, 1, 2]])
+
+        points = from_mesh(vertices, tris, n=100)
+
+        assert np.all(points[:, 0] + points[:, 1] <= 1)
+
+
+class TestAliasTable:
+    def test_reconstruct(self):
+        rng = np.random.default_rng(0)
+        weights = rng.random(1000) ** 4
+        weights[:3] = [50, 0, 1e-9]
+        prob, alias = _alias_table(weights)
+
+        mass = prob.copy()
+        np.add.at(mass, alias, 1 - prob)
+        np.testing.assert_allclose(
+            mass / len(weights), weights / weights.sum(), atol=1e-12
+        )
+
+    def test_uniform(self):
+        prob, alias = _alias_table(np.ones(10))
+        np.testing.assert_array_equal(prob, 1)
+
+
+class TestPreparedMeshSampler:
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0]])
+    tris = np.array([[0, 1, 2], [1, 2, 3]])
+
+    def test_sample(self):
+        sampler = MeshSampler(self.vertices, self.tris)
+        rng = np.random.default_rng(0)
+        p1 = sampler.sample(100, rng)
+        p2 = sampler.sample(100, rng)
+        assert p1.shape == p2.shape == (100, 3)
+        assert not np.array_equal(p1, p2)
+
+    def test_faces_barycentric(self):
+        sampler = MeshSampler(self.vertices, self.tris)
+        points, faces, bary = sampler.sample(
+            500, seed=1, return_faces=True, return_barycentric=True
+        )
+        assert np.all(bary >= 0)
+        np.testing.assert_allclose(bary.sum(1), 1)
+        corners = self.vertices[self.tris[faces]]
+        np.testing.assert_allclose(np.einsum("ij,ijk->ik", bary, corners), points)
+
+    def test_iter_samples(self):
+        sampler = MeshSampler(self.vertices, self.tris)
+        chunks = list(sampler.iter_samples(30, n=100, seed=2))
+        assert [len(c) for c in chunks] == [30, 30, 30, 10]
+
+    def test_out(self):
+        sampler = MeshSampler(self.vertices, self.tris)
+        sampler.CHUNK_SIZE = 64
+        out = np.empty((500, 3))
+        points, faces = sampler.sample(500, seed=4, return_faces=True, out=out)
+        assert points is out
+        assert faces.shape == (500,)
+        np.testing.assert_array_equal(
+            out, from_mesh(self.vertices, self.tris, n=500, seed=4)
+        )
+
+    def test_workers(self):
+        sampler = MeshSampler(self.vertices, self.tris)
+        n = 2 * sampler.CHUNK_SIZE + 7
+        p1, f1 = sampler.sample(n, seed=6, return_faces=True)
+        p2, f2 = sampler.sample(n, seed=6, return_faces=True, workers=3)
+        np.testing.assert_array_equal(p1, p2)
+        np.testing.assert_array_equal(f1, f2)
+
+    def test_float32(self):
+        points = from_mesh(self.vertices, self.tris, n=200, seed=7, dtype=np.float32)
+        assert points.dtype == np.float32
+        np.testing.assert_allclose(
+            points, from_mesh(self.vertices, self.tris, n=200, seed=7), atol=1e-6
+        )
+
+    def test_from_mesh_equivalence(self):
+        sampler = MeshSampler(self.vertices, self.tris)
+        np.testing.assert_array_equal(
+            sampler.sample(50, seed=3),
+            from_mesh(self.vertices, self.tris, n=50, seed=3),
+        )
+
+    def test_normals(self):
+        # A pyramid without its base: the normals interpolate between the
+        # faces and point outwards
+        vertices = np.array(
+            [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0.5, 0.5, 1.0]]
+        )
+        tris = np.array([[0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]])
+        sampler = MeshSampler(vertices, tris)
+        np.testing.assert_allclose(sampler.normals[4], [0, 0, 1])
+        points, faces, bary, normals = sampler.sample(
+            1000,
+            seed=8,
+            return_faces=True,
+            return_barycentric=True,
+            return_normals=True,
+        )
+        np.testing.assert_allclose(np.linalg.norm(normals, axis=1), 1)
+        expected = np.einsum("ij,ijk->ik", bary, sampler.normals[tris[faces]])
+        expected /= np.linalg.norm(expected, axis=1)[:, None]
+        np.testing.assert_allclose(normals, expected, atol=1e-12)
+        assert np.all(np.einsum("ij,ij->i", normals, points - [0.5, 0.5, 0.3]) > 0)
+
+    def test_from_mesh_normals(self):
+        points, faces, normals = from_mesh(
+            self.vertices,
+            self.tris,
+            n=100,
+            seed=9,
+            return_faces=True,
+            return_normals=True,
+        )
+        np.testing.assert_array_equal(
+            points, from_mesh(self.vertices, self.tris, n=100, seed=9)
+        )
+        assert set(faces) <= {0, 1}
+        np.testing.assert_allclose(np.abs(normals), [[0, 0, 1]] * 100)
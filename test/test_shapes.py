@@ -32,6 +32,68 @@ class TestEmbedding:
 
         np.testing.assert_almost_equal(dists_emb, dists)
 
+    def test_seed(self):
+        d = np.random.random((100, 3))
+        np.testing.assert_array_equal(
+            tadasets.embed(d, 10, seed=1), tadasets.embed(d, 10, seed=1)
+        )
+        assert not np.array_equal(
+            tadasets.embed(d, 10, seed=1), tadasets.embed(d, 10, seed=2)
+        )
+
+    @pytest.mark.parametrize("method", ["dense", "fast"])
+    def test_global_seed(self, method):
+        d = np.random.random((100, 3))
+        np.random.seed(3)
+        first = tadasets.embed(d, 10, method=method)
+        np.random.seed(3)
+        np.testing.assert_array_equal(tadasets.embed(d, 10, method=method), first)
+
+    @pytest.mark.parametrize("ambient", [4, 10, 257])
+    def test_fast(self, ambient):
+        d = np.random.random((100, 3))
+        d_emb = tadasets.embed(d, ambient, seed=0, method="fast")
+        assert d_emb.shape == (100, ambient)
+        np.testing.assert_allclose(pdist(d_emb), pdist(d), rtol=1e-12)
+        np.testing.assert_array_equal(
+            d_emb, tadasets.embed(d, ambient, seed=0, method="fast")
+        )
+
+    def test_method(self):
+        with pytest.raises(ValueError):
+            tadasets.embed(np.random.random((10, 3)), 10, method="hadamard")
+
+    def test_frame(self):
+        frame = tadasets.random_frame(3, 30000, seed=0)
+        assert frame.shape == (3, 30000)
+        np.testing.assert_allclose(frame @ frame.T, np.eye(3), atol=1e-12)
+
+    def test_frame_cache(self):
+        frame = tadasets.random_frame(3, 20, seed=5)
+        assert tadasets.random_frame(3, 20, seed=5) is frame
+        assert not frame.flags.writeable
+        rng = np.random.default_rng(5)
+        assert tadasets.random_frame(3, 20, seed=rng) is not frame
+
+    def test_frame_cache_bytes(self, monkeypatch):
+        monkeypatch.setattr(tadasets.dimension, "MAX_FRAME_BYTES", 3 * 8 * 1000)
+        first = tadasets.random_frame(3, 1000, seed=6)
+        assert tadasets.random_frame(3, 1000, seed=6) is first
+        # The next frame evicts the first; larger ones are not kept at all
+        assert tadasets.random_frame(3, 1000, seed=7) is not first
+        assert tadasets.random_frame(3, 1000, seed=6) is not first
+        large = tadasets.random_frame(3, 2000, seed=6)
+        assert tadasets.random_frame(3, 2000, seed=6) is not large
+        np.testing.assert_array_equal(tadasets.random_frame(3, 2000, seed=6), large)
+
+    def test_numpy_integer_seeds(self):
+        a = tadasets.torus(10, ambient=5, seed=np.random.default_rng(3))
+        b = tadasets.torus(10, ambient=5, seed=np.random.default_rng(3))
+        np.testing.assert_array_equal(a, b)
+        x = tadasets.embed(np.eye(3), 6, seed=np.random.SeedSequence(np.int64(1)))
+        y = tadasets.embed(np.eye(3), 6, seed=np.random.SeedSequence(1))
+        np.testing.assert_array_equal(x, y)
+
 
 class TestSphere:
     def test_n(self):
@@ -142,6 +204,12 @@ class TestTorus:
         assert mean_count > 95 and mean_count < 105
         assert std_count < 25
 
+    def test_uniform_seed(self):
+        t1 = tadasets.torus(n=500, uniform=True, seed=7)
+        t2 = tadasets.torus(n=500, uniform=True, seed=7)
+        assert t1.shape == (500, 3)
+        np.testing.assert_array_equal(t1, t2)
+
 
 class TestSwissRoll:
     def test_n(self):
@@ -172,6 +240,41 @@ class TestInfty:
         t = tadasets.infty_sign(n=345, angle=2)
         assert t.shape[0] == 345
 
+    def test_even(self):
+        t = np.linspace(0, 2 * np.pi, 101)[:100]
+        np.testing.assert_array_equal(
+            tadasets.infty_sign(n=100), np.column_stack((np.cos(t), np.sin(2 * t)))
+        )
+
+    def test_uniform(self):
+        t = tadasets.infty_sign(n=1000, uniform=True)
+        steps = np.linalg.norm(np.diff(t, axis=0), axis=1)
+        assert steps.std() / steps.mean() < 1e-3
+
+    def test_uniform_random(self):
+        t = tadasets.infty_sign(n=20000, uniform=True, spacing="random", seed=0)
+        # The four lobes between the crossing and the x extremes have equal length
+        counts = np.histogram2d(t[:, 0], t[:, 1], bins=2)[0]
+        np.testing.assert_allclose(counts / len(t), 0.25, atol=0.01)
+
+
+class TestClosedCurve:
+    def test_register_curve(self):
+        def ellipse(t):
+            return np.column_stack((3 * np.cos(t), np.sin(t)))
+
+        tadasets.register_curve("test_ellipse", ellipse, dim=2)
+        try:
+            shape = tadasets.get_shape("test_ellipse", uniform=True)
+            t = shape.generate(n=500)
+            steps = np.linalg.norm(np.diff(t, axis=0), axis=1)
+            assert steps.std() / steps.mean() < 1e-3
+            assert shape.arc_length_table() is shape.arc_length_table()
+            chunks = tadasets.stream("test_ellipse", n=500, chunk=123, uniform=True)
+            np.testing.assert_array_equal(np.concatenate(list(chunks)), t)
+        finally:
+            del tadasets.SHAPES["test_ellipse"]
+
 
 class TestEyeglasses:
     def test_n(self):
@@ -199,3 +302,324 @@ class TestEyeglasses:
     def test_ambient(self):
         s = tadasets.eyeglasses(n=200, r1=1, r2=2, neck_size=0.8, ambient=15)
         assert s.shape == (200, 15)
+
+
+class TestCircularArcs:
+    def test_small_n(self):
+        for n in [1, 2, 3]:
+            assert tadasets.eyeglasses(n=n, seed=0).shape == (n, 2)
+
+    def test_arc_length(self):
+        centers = [[0, 0], [5, 0]]
+        t = tadasets.circular_arcs(
+            20000, centers, radii=[1, 3], angles=[[0, np.pi], [0, 2 * np.pi]], seed=1
+        )
+        on_first = np.mean(t[:, 0] < 2)
+        assert np.abs(on_first - 1 / 7) < 0.01
+        assert np.all(t[t[:, 0] < 2, 1] >= -1e-12)
+
+    def test_prefix(self):
+        np.testing.assert_array_equal(
+            tadasets.circle_chain(n=100, seed=2),
+            tadasets.circle_chain(n=300, seed=2)[:100],
+        )
+
+    def test_circle_chain(self):
+        t = tadasets.circle_chain(n=3000, k=4, r=0.5, seed=3)
+        centers = np.column_stack((np.arange(4), np.zeros(4)))
+        dists = np.linalg.norm(t[:, None] - centers, axis=2).min(1)
+        np.testing.assert_allclose(dists, 0.5)
+        assert t[:, 0].max() > 3.4
+
+    def test_bouquet(self):
+        t = tadasets.bouquet(n=4000, k=4, r=1, seed=4)
+        radii = np.array([1, 1, 2, 2])
+        centers = np.column_stack((radii * [1, -1, 1, -1], np.zeros(4)))
+        dists = np.abs(np.linalg.norm(t[:, None] - centers, axis=2) - radii).min(1)
+        assert np.all(dists < 1e-12)
+        assert np.isclose(t[:, 0].min(), -4) and np.isclose(t[:, 0].max(), 4)
+
+
+class TestStream:
+    @pytest.mark.parametrize(
+        "shape, params",
+        [
+            ("dsphere", dict(d=3, noise=0.1, ambient=7)),
+            ("sphere", dict(uniform=True, noise=0.1)),
+            ("sphere", dict(ambient=5)),
+            ("torus", dict(uniform=True, ambient=5)),
+            ("torus", dict(noise=0.1)),
+            ("swiss_roll", dict(noise=0.1, ambient=4)),
+            ("infty_sign", dict(noise=0.1, angle=1.0)),
+            ("eyeglasses", dict(r1=1, r2=2, neck_size=0.8, noise=0.1)),
+        ],
+    )
+    def test_bit_identical(self, shape, params):
+        n = 2 * tadasets._blocks.BLOCK_SIZE + 123
+        data = getattr(tadasets, shape)(n=n, seed=11, **params)
+        chunks = list(tadasets.stream(shape, n=n, chunk=7001, seed=11, **params))
+
+        assert [len(c) for c in chunks[:-1]] == [7001] * (len(chunks) - 1)
+        np.testing.assert_array_equal(np.concatenate(chunks), data)
+
+    def test_seed(self):
+        t1 = tadasets.eyeglasses(n=300, noise=0.1, ambient=4, seed=2)
+        t2 = tadasets.eyeglasses(n=300, noise=0.1, ambient=4, seed=2)
+        np.testing.assert_array_equal(t1, t2)
+
+    def test_unknown(self):
+        with pytest.raises(AssertionError):
+            next(tadasets.stream("cube", n=10, chunk=5))
+
+
+class TestOut:
+    @pytest.mark.parametrize(
+        "shape, params, width",
+        [
+            ("dsphere", dict(d=3, noise=0.1), 4),
+            ("sphere", dict(ambient=5), 5),
+            ("torus", dict(uniform=True), 3),
+            ("swiss_roll", dict(noise=0.1, ambient=4), 4),
+            ("infty_sign", dict(angle=1.0), 2),
+            ("eyeglasses", dict(noise=0.1), 2),
+        ],
+    )
+    def test_out(self, shape, params, width):
+        out = np.empty((300, width))
+        data = getattr(tadasets, shape)(n=300, seed=3, out=out, **params)
+        assert data is out
+        np.testing.assert_array_equal(
+            out, getattr(tadasets, shape)(n=300, seed=3, **params)
+        )
+
+    def test_memmap(self, tmp_path):
+        out = np.lib.format.open_memmap(
+            tmp_path / "torus.npy", mode="w+", shape=(5000, 20)
+        )
+        tadasets.torus(n=5000, noise=0.1, ambient=20, seed=4, out=out)
+        out.flush()
+        np.testing.assert_array_equal(
+            np.load(tmp_path / "torus.npy"),
+            tadasets.torus(n=5000, noise=0.1, ambient=20, seed=4),
+        )
+
+    def test_shape(self):
+        with pytest.raises(AssertionError):
+            tadasets.torus(n=100, out=np.empty((100, 4)))
+
+
+class TestShape:
+    def test_registry(self):
+        assert set(tadasets.SHAPES) >= {
+            "dsphere",
+            "sphere",
+            "torus",
+            "swiss_roll",
+            "infty_sign",
+            "eyeglasses",
+        }
+        torus = tadasets.get_shape("torus", c=3, a=1)
+        assert isinstance(torus, tadasets.Torus)
+        assert repr(torus) == "Torus(c=3, a=1, uniform=False, flat=False)"
+
+    def test_generate(self):
+        np.testing.assert_array_equal(
+            tadasets.Torus(c=3).generate(200, noise=0.1, ambient=5, seed=1),
+            tadasets.torus(n=200, c=3, noise=0.1, ambient=5, seed=1),
+        )
+
+    def test_custom_shape(self):
+        @tadasets.register_shape
+        class Circle(tadasets.Shape):
+            name = "test_circle"
+            dim = 2
+
+            def sample_params(self, rng, start, stop, n):
+                return 2 * np.pi * rng.random((stop - start, 1))
+
+            def evaluate(self, params):
+                return np.column_stack((np.cos(params[:, 0]), np.sin(params[:, 0])))
+
+        try:
+            chunks = list(tadasets.stream("test_circle", n=100, chunk=30, seed=0))
+            data = np.concatenate(chunks)
+            np.testing.assert_array_equal(data, Circle().generate(100, seed=0))
+            np.testing.assert_allclose(np.linalg.norm(data, axis=1), 1)
+            assert Circle().generate(100, ambient=4).shape == (100, 4)
+        finally:
+            del tadasets.SHAPES["test_circle"]
+
+    def test_infty_sign_ambient(self):
+        s = tadasets.infty_sign(n=200, angle=1.0, ambient=15)
+        assert s.shape == (200, 15)
+
+
+class TestBatch:
+    @pytest.mark.parametrize(
+        "shape, params",
+        [
+            ("dsphere", dict(d=2, noise=0.1, ambient=6)),
+            ("torus", dict(uniform=True, noise=0.1)),
+            ("infty_sign", dict(angle=0.5, ambient=3)),
+            ("eyeglasses", dict(r1=1, r2=2, neck_size=0.8)),
+        ],
+    )
+    def test_replicates(self, shape, params):
+        data = tadasets.batch(shape, n=300, replicates=4, seed=8, **params)
+        assert data.shape[:2] == (4, 300)
+        seeds = np.random.SeedSequence(8).spawn(4)
+        for b in range(4):
+            np.testing.assert_array_equal(
+                data[b], getattr(tadasets, shape)(n=300, seed=seeds[b], **params)
+            )
+
+    def test_blocks(self):
+        n = tadasets._blocks.BLOCK_SIZE + 10
+        data = tadasets.batch("swiss_roll", n=n, replicates=2, noise=0.2, seed=1)
+        seeds = np.random.SeedSequence(1).spawn(2)
+        np.testing.assert_array_equal(
+            data[1], tadasets.swiss_roll(n=n, noise=0.2, seed=seeds[1])
+        )
+        assert not np.array_equal(data[0], data[1])
+
+
+class TestWorkers:
+    n = 3 * tadasets._blocks.BLOCK_SIZE + 5
+
+    @pytest.mark.parametrize("workers", [2, -1])
+    def test_bit_identical(self, workers):
+        kwargs = dict(n=self.n, noise=0.1, ambient=5, seed=3)
+        np.testing.assert_array_equal(
+            tadasets.torus(workers=workers, **kwargs), tadasets.torus(**kwargs)
+        )
+
+    def test_stream(self):
+        kwargs = dict(n=self.n, noise=0.1, seed=4, angle=1.0)
+        chunks = tadasets.stream("infty_sign", chunk=40000, workers=3, **kwargs)
+        np.testing.assert_array_equal(
+            np.concatenate(list(chunks)), tadasets.infty_sign(**kwargs)
+        )
+
+    def test_batch(self):
+        kwargs = dict(n=1000, replicates=600, noise=0.1, seed=5)
+        np.testing.assert_array_equal(
+            tadasets.batch("swiss_roll", workers=4, **kwargs),
+            tadasets.batch("swiss_roll", **kwargs),
+        )
+
+
+class TestDtype:
+    @pytest.mark.parametrize(
+        "shape, params",
+        [
+            ("dsphere", dict(d=3)),
+            ("sphere", dict(uniform=True)),
+            ("sphere", dict()),
+            ("torus", dict(uniform=True)),
+            ("torus", dict()),
+            ("swiss_roll", dict()),
+            ("infty_sign", dict(angle=0.3)),
+            ("eyeglasses", dict()),
+        ],
+    )
+    def test_float32(self, shape, params):
+        f = getattr(tadasets, shape)
+        data = f(n=500, noise=0.01, ambient=10, seed=0, dtype=np.float32, **params)
+        assert data.dtype == np.float32
+        assert data.shape == (500, 10)
+        assert np.all(np.isfinite(data))
+
+    def test_stream_batch(self):
+        kwargs = dict(n=1000, seed=1, ambient=4, dtype=np.float32)
+        data = tadasets.torus(**kwargs)
+        chunks = list(tadasets.stream("torus", chunk=300, **kwargs))
+        assert all(c.dtype == np.float32 for c in chunks)
+        np.testing.assert_array_equal(np.concatenate(chunks), data)
+        assert tadasets.batch("torus", replicates=2, **kwargs).dtype == np.float32
+
+    @pytest.mark.parametrize("method", ["dense", "fast"])
+    def test_embed(self, method):
+        data = tadasets.dsphere(n=100, d=2, seed=0)
+        emb = tadasets.embed(data, ambient=16, seed=2, method=method, dtype=np.float32)
+        assert emb.dtype == np.float32
+        np.testing.assert_allclose(
+            emb, tadasets.embed(data, ambient=16, seed=2, method=method), atol=1e-5
+        )
+
+
+class TestSampling:
+    n = tadasets._blocks.BLOCK_SIZE + 1000
+
+    @pytest.mark.parametrize("sampling", ["sobol", "halton"])
+    @pytest.mark.parametrize(
+        "shape, params",
+        [
+            ("dsphere", dict(d=3)),
+            ("sphere", dict(uniform=True)),
+            ("torus", dict(uniform=True)),
+            ("swiss_roll", dict()),
+            ("infty_sign", dict(uniform=True, spacing="random")),
+            ("bouquet", dict()),
+        ],
+    )
+    def test_blocks(self, shape, params, sampling):
+        kwargs = dict(n=self.n, seed=2, sampling=sampling, **params)
+        data = getattr(tadasets, shape)(**kwargs)
+        chunks = tadasets.stream(shape, chunk=7000, workers=2, **kwargs)
+        np.testing.assert_array_equal(np.concatenate(list(chunks)), data)
+        assert not np.array_equal(data, getattr(tadasets, shape)(**params, n=self.n))
+
+    def test_stratified(self):
+        # Every dyadic interval of the first 2^k Sobol points holds one point
+        _, params = tadasets.swiss_roll(
+            n=1024, r=1, seed=3, sampling="sobol", return_params=True
+        )
+        u = (params[:, 0] / np.pi - 1.5) / 3
+        assert np.array_equal(np.bincount((u * 1024).astype(int)), np.ones(1024))
+        cells = (u * 32).astype(int) * 32 + (params[:, 1] * 32).astype(int)
+        assert np.array_equal(np.bincount(cells), np.ones(1024))
+
+    @pytest.mark.parametrize("sampling", ["sobol", "halton"])
+    def test_discrepancy(self, sampling):
+        qmc = pytest.importorskip("scipy.stats.qmc")
+        _, params = tadasets.sphere(
+            n=2048, uniform=True, seed=4, sampling=sampling, return_params=True
+        )
+        # Back to the area-preserving (phi, z) parameters
+        phi = np.arctan2(params[:, 1], params[:, 0]) % (2 * np.pi)
+        u = np.column_stack((phi / (2 * np.pi), (params[:, 2] + 1) / 2))
+        rand = np.random.default_rng(4).random((2048, 2))
+        assert qmc.discrepancy(u) < qmc.discrepancy(rand) / 100
+
+    def test_torus_uniform(self):
+        data = tadasets.torus(n=20000, c=2, a=1, uniform=True, seed=5, sampling="sobol")
+        theta = np.arctan2(data[:, 2], np.hypot(data[:, 0], data[:, 1]) - 2)
+        # The density of theta is proportional to 2 + cos(theta)
+        hist, edges = np.histogram(theta, bins=8, range=(-np.pi, np.pi))
+        mid = (edges[:-1] + edges[1:]) / 2
+        expected = 20000 * (2 + np.cos(mid)) / (2 + np.cos(mid)).sum()
+        np.testing.assert_allclose(hist, expected, rtol=0.03)
+
+    def test_errors(self):
+        with pytest.raises(ValueError):
+            tadasets.torus(n=10, sampling="lattice")
+        with pytest.raises(ValueError):
+            tadasets.dsphere(n=10, d=30, sampling="sobol")
+        assert tadasets.dsphere(n=10, d=30, sampling="halton").shape == (10, 31)
+        # Rows past the last Sobol point, through a lazy dataset
+        ds = tadasets.lazy("torus", 2**32 + 10, seed=0, sampling="sobol")
+        assert ds[2**32 - 1].shape == (3,)
+        with pytest.raises(ValueError, match="2\\*\\*32"):
+            ds[2**32]
+
+    def test_sobol_sequence(self):
+        qmc = pytest.importorskip("scipy.stats.qmc")
+        index = np.arange(256, dtype=np.uint64)
+        expected = qmc.Sobol(21, scramble=False).random(256)
+        for j in range(21):
+            v = tadasets._qmc._direction_numbers(j)
+            gray = index ^ (index >> np.uint64(1))
+            x = np.zeros(256, dtype=np.uint64)
+            for b in range(8):
+                x ^= np.where((gray >> np.uint64(b)) & np.uint64(1), v[b], 0)
+            np.testing.assert_array_equal(x * 2.0**-32, expected[:, j])
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from scipy.spatial.distance import cdist
+
+import tadasets
+import tadasets.subsample
+
+
+def naive(data, m, start=0):
+    index = [start]
+    d = np.linalg.norm(data - data[start], axis=1)
+    radii = [d.max()]
+    for _ in range(m - 1):
+        index.append(int(np.argmax(d)))
+        d = np.minimum(d, np.linalg.norm(data - data[index[-1]], axis=1))
+        radii.append(d.max())
+    return np.array(index), np.array(radii)
+
+
+@pytest.fixture
+def chunked(monkeypatch):
+    monkeypatch.setattr(tadasets.subsample, "CHUNK_ELEMENTS", 700)
+    monkeypatch.setattr(tadasets.subsample, "BLOCK_ELEMENTS", 900)
+
+
+class TestFarthestPoints:
+    def test_naive(self, chunked):
+        data = tadasets.torus(n=2000, noise=0.05, seed=0) + 100
+        index, radii = tadasets.farthest_points(data, 50, start=7, return_radii=True)
+        expected, expected_radii = naive(data, 50, start=7)
+        np.testing.assert_array_equal(index, expected)
+        np.testing.assert_allclose(radii, expected_radii)
+        assert np.all(np.diff(radii) <= 0)
+
+    def test_workers(self, chunked):
+        data = tadasets.dsphere(n=3000, d=3, ambient=8, seed=1)
+        np.testing.assert_array_equal(
+            tadasets.farthest_points(data, 40, workers=3),
+            tadasets.farthest_points(data, 40),
+        )
+
+    def test_memmap(self, tmp_path):
+        path = str(tmp_path / "data.npy")
+        out = np.lib.format.open_memmap(
+            path, mode="w+", dtype=np.float32, shape=(1000, 3)
+        )
+        tadasets.swiss_roll(n=1000, seed=2, out=out, dtype=np.float32)
+        data = np.load(path, mmap_mode="r")
+        index = tadasets.farthest_points(data, 20)
+        np.testing.assert_array_equal(index, naive(data.astype(np.float64), 20)[0])
+
+    def test_all_points(self):
+        data = tadasets.sphere(n=30, seed=3)
+        index, radii = tadasets.farthest_points(data, 30, return_radii=True)
+        assert sorted(index) == list(range(30))
+        assert radii[-1] == pytest.approx(0, abs=1e-7)
+
+
+class TestCoverRadius:
+    def test_cdist(self, chunked):
+        data = tadasets.torus(n=1500, noise=0.1, seed=4)
+        landmarks = data[tadasets.farthest_points(data, 25)]
+        radius, nearest = tadasets.cover_radius(
+            data, landmarks, workers=2, return_nearest=True
+        )
+        d = cdist(data, landmarks)
+        np.testing.assert_array_equal(nearest, np.argmin(d, axis=1))
+        assert radius == pytest.approx(d.min(1).max())
+
+    def test_farthest_radii(self):
+        data = tadasets.infty_sign(n=500, seed=5)
+        index, radii = tadasets.farthest_points(data, 10, return_radii=True)
+        assert tadasets.cover_radius(data, data[index]) == pytest.approx(radii[-1])
@@ -0,0 +1,52 @@
+import numpy as np
+
+from tadasets.surface import sample_parameters, sample_surface
+
+
+class TestSampleParameters:
+    def test_n(self):
+        p = sample_parameters(
+            1000,
+            [(0, 1), (0, 2)],
+            area_element=lambda p: p[:, 0],
+            max_area_element=1,
+            seed=0,
+        )
+        assert p.shape == (1000, 2)
+        assert np.all((p[:, 0] >= 0) & (p[:, 0] <= 1))
+        assert np.all((p[:, 1] >= 0) & (p[:, 1] <= 2))
+
+    def test_density(self):
+        # Density proportional to u on [0, 1] has mean 2/3.
+        p = sample_parameters(
+            20000,
+            [(0, 1)],
+            area_element=lambda p: p[:, 0],
+            max_area_element=1,
+            seed=1,
+        )
+        assert abs(p.mean() - 2 / 3) < 0.01
+
+    def test_seed(self):
+        kwargs = dict(area_element=lambda p: p[:, 0], max_area_element=1, seed=3)
+        p1 = sample_parameters(500, [(0, 1), (0, 1)], **kwargs)
+        p2 = sample_parameters(500, [(0, 1), (0, 1)], **kwargs)
+        np.testing.assert_array_equal(p1, p2)
+
+    def test_prefix(self):
+        kwargs = dict(area_element=lambda p: p[:, 0], max_area_element=1, seed=3)
+        p1 = sample_parameters(100, [(0, 1), (0, 1)], **kwargs)
+        p2 = sample_parameters(1000, [(0, 1), (0, 1)], **kwargs)
+        np.testing.assert_array_equal(p1, p2[:100])
+
+
+class TestSampleSurface:
+    def test_cylinder(self):
+        data = sample_surface(
+            200,
+            lambda p: np.column_stack((np.cos(p[:, 0]), np.sin(p[:, 0]), p[:, 1])),
+            [(0, 2 * np.pi), (0, 1)],
+            seed=0,
+        )
+        assert data.shape == (200, 3)
+        np.testing.assert_allclose(np.hypot(data[:, 0], data[:, 1]), 1)
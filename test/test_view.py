@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+import tadasets
+
+
+class TestDownsample:
+    @pytest.mark.parametrize("method", ["voxel", "random"])
+    def test_max_points(self, method):
+        data = tadasets.torus(n=50000, seed=0)
+        index, counts = tadasets.downsample(
+            data, 2000, method=method, seed=1, return_counts=True
+        )
+        assert 1000 <= len(index) <= 2000
+        assert np.all(np.diff(index) > 0)
+        assert len(counts) == len(index) and np.all(counts > 0)
+
+    def test_voxel_covers_curve(self):
+        # Evenly spaced in the parameter, so denser near the crossing
+        data = tadasets.infty_sign(n=200000)
+        kept = data[tadasets.downsample(data, 1000)]
+        steps = np.linalg.norm(np.diff(kept, axis=0), axis=1)
+        assert steps.max() < 5 * np.median(steps)
+
+    def test_large_grid(self):
+        # With k = 2**32 + 1 the linear indices of these cells agree mod 2**64
+        k = 2**32 + 1
+        data = np.array([[1.5, 0, 0], [0, 1.5, 2**32 + 0.5]]) / k
+        keys = tadasets.view._voxel_keys(data, k, np.zeros(3), np.ones(3))
+        assert keys[0] != keys[1]
+        curve = tadasets.embed(tadasets.infty_sign(n=20000), 40, seed=0)
+        assert 500 <= len(tadasets.downsample(curve, 1000)) <= 1000
+
+    def test_small(self):
+        data = tadasets.sphere(n=50, seed=0)
+        assert len(tadasets.downsample(data, 100, method="random")) == 50
+
+    def test_method(self):
+        with pytest.raises(ValueError):
+            tadasets.downsample(np.zeros((10, 2)), 5, method="grid")
+
+
+class TestPlot:
+    def test_plot3d(self):
+        data = tadasets.torus(n=20000, seed=0)
+        ax = tadasets.plot3d(data, max_points=500, density=True)
+        assert len(ax.collections[0].get_offsets()) <= 500
+
+    def test_plot2d(self):
+        data = tadasets.eyeglasses(n=20000, seed=0)
+        ax = tadasets.plot2d(data, max_points=300, method="random")
+        assert len(ax.collections[0].get_offsets()) == 300